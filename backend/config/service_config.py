@@ -3,7 +3,7 @@ Configuration settings for the AI Video Assistant API
 """
 from pydantic_settings import BaseSettings
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     """Application configuration settings loaded from environment variables"""
@@ -24,13 +24,84 @@ class Settings(BaseSettings):
     # Qwen-VL Model Configuration
     QWEN_VL_MODEL_NAME: str = "yangjie-cv/WeThink-Qwen2.5VL-7B"
     QWEN_VL_USE_4BIT: bool = True
+    PREFIX_CACHE_ENABLED: bool = False  # reuse prefilled KV caches of static system prompts
+    PREFIX_CACHE_MAX_ENTRIES: int = 8
+    INFERENCE_BATCHING_ENABLED: bool = False  # route generate_qwen_response through the continuous-batching server
+    INFERENCE_MAX_BATCH_SIZE: int = 8
+    CONSTRAINED_DECODING_ENABLED: bool = True  # router and argument extraction generate schema-valid JSON only
+    EVENT_LOOP_MONITOR_INTERVAL_S: float = 0.5  # how often the event-loop lag is sampled
 
     # Multi-Agent Supervisor Model
     QWEN_CODER_MODEL_NAME: str = "Qwen/Qwen2.5-Coder-7B-Instruct"
+    SINGLE_MODEL_MODE: bool = False  # serve every agent role from the loaded Qwen-VL instead of a second model
+    INTENT_ROUTER_ENABLED: bool = True  # route with rules and exemplar similarity before asking the LLM supervisor
+    INTENT_ROUTER_SIMILARITY_THRESHOLD: float = 0.75  # cosine similarity to the best intent exemplar
+    INTENT_ROUTER_MARGIN: float = 0.05  # lead over the runner-up workflow
 
     # bge Embedding Model Configuration
     BGE_EMBEDDING_MODEL_NAME: str = "BAAI/bge-small-en-v1.5"
 
+    # Model Lifecycle Configuration
+    HF_CACHE_DIR: Optional[str] = None  # Hugging Face download cache (None = HF_HOME / HF_HUB_CACHE or ~/.cache/huggingface)
+    MODEL_USE_SAFETENSORS: bool = True  # require memory-mapped safetensors weights instead of pickled .bin files
+    MODEL_LOAD_CONCURRENCY: int = 3  # models loaded at the same time
+    MODEL_LOAD_IN_BACKGROUND: bool = True  # serve model-free endpoints while the models load
+    MODEL_LAZY_LOAD: List[str] = []  # models loaded on first use: embedding | qwen_vl | chat | reranker
+    MODEL_MEMORY_BUDGET_GB: float = 0.0  # memory the resident models of a process may occupy (0 = unlimited)
+    MODEL_OFFLOAD_TO_CPU: bool = True  # evict to CPU RAM when the model can be moved, instead of unloading it
+    MODEL_EVICTION_MIN_IDLE_S: float = 30.0  # models used more recently are never evicted; idle Whisper is unloaded after it
+    MODEL_PRIORITIES: Dict[str, int] = {"qwen_vl": 3, "embedding": 2, "chat": 1, "reranker": 0, "whisper": 0}  # higher stays resident longer
+
+    # Qdrant Vector Database Configuration
+    QDRANT_MODE: str = "server"  # server | local (embedded, on disk) | memory (embedded, ephemeral)
+    QDRANT_LOCAL_PATH: Path = Path(__file__).parent.parent / "data" / "qdrant"
+    QDRANT_URL: str = "http://localhost:6333"
+    QDRANT_PREFER_GRPC: bool = True
+    QDRANT_API_KEY: Optional[str] = None
+    QDRANT_TIMEOUT: int = 30
+    QDRANT_POOL_SIZE: int = 1
+    QDRANT_HEALTH_CHECK_INTERVAL_S: float = 30.0
+    QDRANT_RECONNECT_MAX_RETRIES: int = 5
+    QDRANT_RECONNECT_BACKOFF_S: float = 0.5
+    QDRANT_UPSERT_BATCH_SIZE: int = 64
+    QDRANT_UPSERT_PARALLEL: int = 1
+    QDRANT_SCROLL_PAGE_SIZE: int = 256
+    QDRANT_COLLECTION_PROFILE: str = "default"  # default | scalar_int8 | binary | on_disk
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_QUANTIZATION_RESCORE: bool = True
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0
+    QDRANT_STORAGE_MODE: str = "per_video"  # per_video | multi_tenant
+    QDRANT_TENANT_COLLECTION: str = "video_chunks"
+    QDRANT_TENANT_SHARDS: int = 1
+
+    # RAG Context Configuration
+    RAG_TOP_K: int = 5
+    RAG_NEIGHBOR_WINDOW: int = 1  # chunks added on each side of a hit (0 disables expansion)
+    RAG_CONTEXT_TOKEN_BUDGET: int = 1536
+    RETRIEVAL_CACHE_SIZE: int = 1024  # cached hybrid-search results (0 disables the cache)
+    RETRIEVAL_CACHE_TTL_S: float = 300.0  # per-process cache: bounds staleness after writes by other processes
+
+    # Semantic Answer Cache Configuration
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # cosine similarity between question embeddings
+    ANSWER_CACHE_TTL_S: float = 3600.0
+    ANSWER_CACHE_MAX_ENTRIES: int = 256  # per collection
+
+    # Reranker Configuration
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL_NAME: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_TOP_K: int = 3  # hits kept after reranking (replaces RAG_TOP_K)
+    RERANK_BATCH_SIZE: int = 32
+    RERANK_MAX_LENGTH: int = 512
+    RERANK_CACHE_SIZE: int = 4096
+    RERANK_LATENCY_BUDGET_MS: float = 150.0  # 0 scores every candidate
+
+    # Temporal Retrieval Configuration
+    TEMPORAL_EDGE_WINDOW_S: float = 120.0  # "at the beginning" / "at the end"
+    TEMPORAL_POINT_WINDOW_S: float = 30.0  # +/- around "at minute 10"
+    TEMPORAL_MAX_CHUNKS: int = 5
+
     # File Upload Configuration
     DATA_FOLDER: Path = Path(__file__).parent.parent / "data"
     ALLOWED_FILE_EXTENSIONS: List[str] = ['.mp3', '.mp4']
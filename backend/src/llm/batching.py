@@ -0,0 +1,373 @@
+"""
+Continuous-Batching Inference Server
+Schedules Qwen2.5-VL generation requests from concurrent callers (chats, agents,
+ingestion jobs) into shared decode steps with iteration-level batching
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import NamedTuple, Optional
+import torch
+import torch.nn.functional as F
+from transformers import DynamicCache
+from config.service_config import settings
+from src.llm.inference import prefix_cache
+
+logger = logging.getLogger(__name__)
+
+class GenerationRequest(NamedTuple):
+    """Generation request queued for the inference server"""
+    messages: list
+    images: Optional[list]
+    max_new_tokens: int
+    temperature: float
+    top_p: float
+    streamer: Optional[object]
+    logits_processor: Optional[object]
+    future: Future
+
+class _ActiveSequence:
+    """Decoding state of one request inside the running batch"""
+
+    def __init__(self, request: GenerationRequest, next_position: int, next_token: int):
+        self.request = request
+        self.next_position = next_position
+        self.next_token = next_token
+        self.generated: list[int] = []
+
+def _pad_kv_left(layers: tuple, length: int) -> tuple:
+    """Left-pad the sequence dimension of legacy (key, value) cache layers to length"""
+    padded = []
+    for keys, values in layers:
+        missing = length - keys.shape[2]
+        padded.append((F.pad(keys, (0, 0, missing, 0)), F.pad(values, (0, 0, missing, 0))) if missing else (keys, values))
+    return tuple(padded)
+
+class BatchingInferenceServer:
+    """
+    In-process generation server with continuous (iteration-level) batching.
+
+    Callers submit requests and get a Future for the response text. A worker thread
+    owns the model: each new request is prefilled on its own (reusing a cached static
+    prompt prefix when one applies) and then joins the running batch, so every decode
+    step advances all active requests by one token. Finished requests leave the batch
+    immediately and waiting ones take their place, without waiting for the whole batch
+    to drain.
+
+    Sequences of different lengths share one left-padded KV cache; the attention mask
+    hides the padding and explicit multimodal RoPE position IDs keep every row at its
+    own positions, so results match unbatched generation.
+
+    Attributes:
+        max_batch_size: Maximum number of requests decoded together
+        processor: Qwen AutoProcessor (set by start())
+        model: Served Qwen2.5-VL model (set by start())
+    """
+
+    def __init__(self, max_batch_size: int = 8):
+        """
+        Initialize a stopped server.
+
+        Args:
+            max_batch_size: Maximum number of requests decoded together
+        """
+        self.max_batch_size = max_batch_size
+        self.processor = None
+        self.model = None
+        self._queue: queue.Queue[GenerationRequest] = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+
+        # Batch state (worker thread only)
+        self._active: list[_ActiveSequence] = []
+        self._kv_cache: Optional[DynamicCache] = None
+        self._attention_mask: Optional[torch.Tensor] = None
+
+        # Metrics
+        self._completed = 0
+        self._failed = 0
+        self._generated_tokens = 0
+        self._decode_steps = 0
+        self._batched_rows = 0
+        self._decode_seconds = 0.0
+
+    def start(self, processor, model) -> None:
+        """
+        Start serving a model from a worker thread.
+
+        Args:
+            processor: Qwen AutoProcessor
+            model: Loaded Qwen2.5-VL model
+        """
+        if self._running:
+            return
+        self.processor = processor
+        self.model = model
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="inference-server", daemon=True)
+        self._worker.start()
+        logger.info(f"Inference server started (max batch size {self.max_batch_size})")
+
+    def stop(self) -> None:
+        """Stop the worker; requests still queued or running fail with RuntimeError"""
+        if not self._running:
+            return
+        self._running = False
+        self._worker.join()
+        self._fail_active(RuntimeError("Inference server stopped"))
+        while not self._queue.empty():
+            self._fail(self._queue.get_nowait(), RuntimeError("Inference server stopped"))
+        self.processor = self.model = None
+        logger.info("Inference server stopped")
+
+    def serves(self, model) -> bool:
+        """Check whether requests for a model can be submitted to this server"""
+        return self._running and model is self.model
+
+    def submit(self, messages: list, images=None, max_new_tokens: int = 512, temperature: float = 0.0, top_p: float = 1.0, streamer=None, logits_processor=None) -> Future:
+        """
+        Queue a generation request.
+
+        Args:
+            messages: List of chat messages in OpenAI format
+            images: Optional list of PIL Images or image paths for vision tasks
+            max_new_tokens: Maximum tokens to generate
+            temperature: Sampling temperature, 0 for greedy
+            top_p: Nucleus sampling parameter
+            streamer: Optional transformers streamer receiving new tokens as they are generated
+            logits_processor: Optional LogitsProcessorList applied to this request's logits before sampling
+
+        Returns:
+            Future: Resolves to the generated response text
+
+        Raises:
+            RuntimeError: If the server is not running
+        """
+        if not self._running:
+            raise RuntimeError("Inference server is not running")
+        future = Future()
+        self._queue.put(GenerationRequest(messages, images, max_new_tokens, temperature, top_p, streamer, logits_processor, future))
+        return future
+
+    def _run(self) -> None:
+        """Worker loop: admit waiting requests, then run one decode step for the batch"""
+        while self._running:
+            try:
+                self._admit(block=not self._active)
+                if self._active:
+                    self._decode_step()
+            except Exception as e:
+                logger.error(f"Inference server step failed: {str(e)}", exc_info=True)
+                self._fail_active(e)
+
+    def _admit(self, block: bool) -> None:
+        """Prefill waiting requests into the free batch slots"""
+        while len(self._active) < self.max_batch_size:
+            try:
+                request = self._queue.get(timeout=0.1) if block else self._queue.get_nowait()
+            except queue.Empty:
+                return
+            block = False
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._prefill(request)
+            except Exception as e:
+                logger.error(f"Prefill failed: {str(e)}", exc_info=True)
+                self._fail(request, e)
+
+    @torch.inference_mode()
+    def _prefill(self, request: GenerationRequest) -> None:
+        """Run the prompt of a request and add it to the batch with its first token"""
+        chat_text = self.processor.apply_chat_template(request.messages, add_generation_prompt=True, tokenize=False)
+        inputs = self.processor(text=[chat_text], images=request.images, return_tensors="pt").to(self.model.device)
+        input_ids = inputs["input_ids"]
+        if request.streamer is not None:
+            request.streamer.put(input_ids.cpu())
+
+        # Multimodal RoPE positions of the prompt and the offset of the tokens after it
+        position_ids, rope_deltas = self.model.model.get_rope_index(
+            input_ids,
+            inputs.get("image_grid_thw"),
+            inputs.get("video_grid_thw"),
+            attention_mask=inputs.get("attention_mask"),
+        )
+
+        # Continue from a cached static prefix when one applies (text-only prompts)
+        kv_cache = None
+        if request.images is None and settings.PREFIX_CACHE_ENABLED:
+            kv_cache = prefix_cache.lookup(self.model, chat_text, input_ids)
+        cached_tokens = kv_cache.get_seq_length() if kv_cache is not None else 0
+
+        model_inputs = {key: value for key, value in inputs.items() if key not in ("input_ids", "attention_mask")}
+        outputs = self.model(
+            **model_inputs,
+            input_ids=input_ids[:, cached_tokens:],
+            attention_mask=inputs["attention_mask"],
+            position_ids=position_ids[..., cached_tokens:],
+            past_key_values=kv_cache if kv_cache is not None else DynamicCache(),
+            use_cache=True,
+            logits_to_keep=1,
+        )
+        sequence = _ActiveSequence(
+            request,
+            next_position=input_ids.shape[-1] + int(rope_deltas[0, 0]),
+            next_token=self._sample(outputs.logits[:, -1], [request], [[]])[0],
+        )
+        self._join(sequence, outputs.past_key_values, inputs["attention_mask"])
+        self._append_token(sequence)
+        self._retire_finished()
+
+    def _join(self, sequence: _ActiveSequence, kv_cache: DynamicCache, attention_mask: torch.Tensor) -> None:
+        """Merge a prefilled request into the batched KV cache, left-padding the shorter side"""
+        if not self._active:
+            self._active = [sequence]
+            self._kv_cache = kv_cache
+            self._attention_mask = attention_mask
+            return
+
+        length = max(self._kv_cache.get_seq_length(), kv_cache.get_seq_length())
+        batch_layers = _pad_kv_left(self._kv_cache.to_legacy_cache(), length)
+        new_layers = _pad_kv_left(kv_cache.to_legacy_cache(), length)
+        self._kv_cache = DynamicCache.from_legacy_cache(tuple(
+            (torch.cat([batch_keys, keys]), torch.cat([batch_values, values]))
+            for (batch_keys, batch_values), (keys, values) in zip(batch_layers, new_layers)
+        ))
+        self._attention_mask = torch.cat([
+            F.pad(self._attention_mask, (length - self._attention_mask.shape[-1], 0)),
+            F.pad(attention_mask, (length - attention_mask.shape[-1], 0)),
+        ])
+        self._active.append(sequence)
+
+    @torch.inference_mode()
+    def _decode_step(self) -> None:
+        """Generate the next token of every active request with one forward pass"""
+        start_time = time.perf_counter()
+        device = self.model.device
+        input_ids = torch.tensor([[sequence.next_token] for sequence in self._active], device=device)
+        positions = torch.tensor([[sequence.next_position] for sequence in self._active], device=device)
+        self._attention_mask = F.pad(self._attention_mask, (0, 1), value=1)
+
+        outputs = self.model(
+            input_ids=input_ids,
+            attention_mask=self._attention_mask,
+            position_ids=positions.unsqueeze(0).expand(3, -1, -1),
+            past_key_values=self._kv_cache,
+            use_cache=True,
+        )
+        self._kv_cache = outputs.past_key_values
+        next_tokens = self._sample(
+            outputs.logits[:, -1],
+            [sequence.request for sequence in self._active],
+            [sequence.generated for sequence in self._active],
+        )
+
+        for sequence, token in zip(self._active, next_tokens):
+            sequence.next_position += 1
+            sequence.next_token = token
+            self._append_token(sequence)
+
+        self._decode_steps += 1
+        self._batched_rows += len(self._active)
+        self._decode_seconds += time.perf_counter() - start_time
+        self._retire_finished()
+
+    def _sample(self, logits: torch.Tensor, requests: list[GenerationRequest], generated: list[list[int]]) -> list[int]:
+        """Pick the next token per row: greedy at temperature 0, nucleus sampling otherwise"""
+        for row, request in enumerate(requests):
+            if request.logits_processor is not None:
+                # Processors see the tokens generated so far, not the prompt
+                row_ids = torch.tensor([generated[row]], dtype=torch.long, device=logits.device)
+                logits[row] = request.logits_processor(row_ids, logits[row:row + 1])[0]
+        tokens = logits.argmax(dim=-1)
+        for row, request in enumerate(requests):
+            if request.temperature > 0:
+                probs = torch.softmax(logits[row].float() / request.temperature, dim=-1)
+                sorted_probs, sorted_ids = probs.sort(descending=True)
+                sorted_probs[(sorted_probs.cumsum(-1) - sorted_probs) > request.top_p] = 0
+                tokens[row] = sorted_ids[torch.multinomial(sorted_probs, 1)]
+        return tokens.tolist()
+
+    def _append_token(self, sequence: _ActiveSequence) -> None:
+        """Record the token a sequence just produced and stream it"""
+        sequence.generated.append(sequence.next_token)
+        self._generated_tokens += 1
+        if sequence.request.streamer is not None and sequence.next_token != self.processor.tokenizer.eos_token_id:
+            sequence.request.streamer.put(torch.tensor([sequence.next_token]))
+
+    def _is_finished(self, sequence: _ActiveSequence) -> bool:
+        return (
+            sequence.next_token == self.processor.tokenizer.eos_token_id
+            or len(sequence.generated) >= sequence.request.max_new_tokens
+        )
+
+    def _retire_finished(self) -> None:
+        """Resolve finished requests and drop their rows from the batch"""
+        keep = []
+        for row, sequence in enumerate(self._active):
+            if not self._is_finished(sequence):
+                keep.append(row)
+                continue
+            response = self.processor.batch_decode([sequence.generated], skip_special_tokens=True)[0].strip()
+            if sequence.request.streamer is not None:
+                sequence.request.streamer.end()
+            sequence.request.future.set_result(response)
+            self._completed += 1
+
+        if len(keep) == len(self._active):
+            return
+        if not keep:
+            self._active, self._kv_cache, self._attention_mask = [], None, None
+            return
+
+        rows = torch.tensor(keep, device=self._attention_mask.device)
+        self._active = [self._active[row] for row in keep]
+        self._kv_cache.batch_select_indices(rows)
+        self._attention_mask = self._attention_mask[rows]
+
+        # Drop padding columns no remaining row attends to
+        first_used = int(self._attention_mask.any(dim=0).nonzero()[0])
+        if first_used:
+            self._attention_mask = self._attention_mask[:, first_used:]
+            self._kv_cache = DynamicCache.from_legacy_cache(tuple(
+                (keys[:, :, first_used:], values[:, :, first_used:])
+                for keys, values in self._kv_cache.to_legacy_cache()
+            ))
+
+    def _fail(self, request: GenerationRequest, error: Exception) -> None:
+        """Resolve a request with an error"""
+        if request.streamer is not None:
+            request.streamer.end()
+        if not request.future.done():
+            request.future.set_exception(error)
+        self._failed += 1
+
+    def _fail_active(self, error: Exception) -> None:
+        """Fail every request in the running batch and reset it"""
+        for sequence in self._active:
+            self._fail(sequence.request, error)
+        self._active, self._kv_cache, self._attention_mask = [], None, None
+
+    def get_metrics(self) -> dict:
+        """
+        Get server metrics.
+
+        Returns:
+            dict: Running flag, active/waiting requests, completed/failed counters,
+                  generated tokens, decode steps, mean batch size and decode throughput
+        """
+        return {
+            "running": self._running,
+            "active": len(self._active),
+            "waiting": self._queue.qsize(),
+            "completed": self._completed,
+            "failed": self._failed,
+            "generated_tokens": self._generated_tokens,
+            "decode_steps": self._decode_steps,
+            "mean_batch_size": self._batched_rows / self._decode_steps if self._decode_steps else 0.0,
+            "decode_tokens_per_s": self._batched_rows / self._decode_seconds if self._decode_seconds else 0.0,
+        }
+
+inference_server = BatchingInferenceServer(settings.INFERENCE_MAX_BATCH_SIZE)
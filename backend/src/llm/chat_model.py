@@ -3,18 +3,16 @@ Qwen Vision-Language Model Loader
 Handles loading and configuration of Qwen2.5-VL models with optional 4-bit quantization
 """
 import torch
-import os
 import logging
-from transformers import AutoProcessor, Qwen2_5_VLForConditionalGeneration, AutoModelForSpeechSeq2Seq, pipeline, AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
+from transformers import AutoProcessor, Qwen2_5_VLForConditionalGeneration, AutoModelForSpeechSeq2Seq, pipeline, AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig, LogitsProcessorList
 from langchain_huggingface import ChatHuggingFace, HuggingFacePipeline
 from config.service_config import settings
+from src.llm.constrained_decoding import JsonSchemaLogitsProcessor, get_schema_token_masks
+from src.llm.model_lifecycle import weight_loading_kwargs
+from src.llm.qwen_chat_adapter import QwenVLChatModel
 
 logger = logging.getLogger(__name__)
 
-# Configure Hugging Face cache directories
-os.environ["HF_HOME"] = "/workspace/hf_cache"
-os.environ["HF_HUB_CACHE"] = "/workspace/hf_cache"
-
 def load_qwen_vl_model(model_name: str, use_4bit: bool = True):
     """
     Load Qwen2.5-VL model with processor with 4-bit quantization
@@ -33,7 +31,7 @@ def load_qwen_vl_model(model_name: str, use_4bit: bool = True):
         # Load processor for handling inputs/outputs
         logger.info("Loading processor...")
         try:
-            processor = AutoProcessor.from_pretrained(model_name, trust_remote_code=True)
+            processor = AutoProcessor.from_pretrained(model_name, trust_remote_code=True, cache_dir=settings.HF_CACHE_DIR)
             logger.info("Processor loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load processor: {e}")
@@ -71,7 +69,7 @@ def load_qwen_vl_model(model_name: str, use_4bit: bool = True):
             model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
                 model_name,
                 trust_remote_code=True,
-                low_cpu_mem_usage=True,
+                **weight_loading_kwargs(),
                 **quant_kwargs,
             )
             logger.info("Vision-language model loaded successfully")
@@ -116,8 +114,7 @@ def load_transcription_pipeline(model_name: str):
             transcribe_model = AutoModelForSpeechSeq2Seq.from_pretrained(
                 model_name,
                 torch_dtype=torch_dtype,
-                low_cpu_mem_usage=True,
-                use_safetensors=True
+                **weight_loading_kwargs()
             )
             logger.info("Transcription model loaded successfully")
         except Exception as e:
@@ -127,7 +124,7 @@ def load_transcription_pipeline(model_name: str):
         # Load processor
         logger.info("Loading audio processor...")
         try:
-            processor = AutoProcessor.from_pretrained(model_name)
+            processor = AutoProcessor.from_pretrained(model_name, cache_dir=settings.HF_CACHE_DIR)
             logger.info("Audio processor loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load audio processor: {e}")
@@ -178,13 +175,13 @@ def build_hf_chat_model(*, deterministic: bool, use_4bit: bool = True) -> ChatHu
 
     try:
         # --- Tokenizer
-        tokenizer = AutoTokenizer.from_pretrained(MODEL_ID, trust_remote_code=True)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_ID, trust_remote_code=True, cache_dir=settings.HF_CACHE_DIR)
         if tokenizer.pad_token is None:
             tokenizer.pad_token = tokenizer.eos_token
             logger.debug("Set pad_token to eos_token")
 
         # --- Model (quantized or full precision)
-        model_kwargs = dict(trust_remote_code=True, device_map="auto")
+        model_kwargs = dict(trust_remote_code=True, device_map="auto", **weight_loading_kwargs())
 
         if use_4bit and torch.cuda.is_available():
             logger.info("Loading 4-bit quantized model")
@@ -246,4 +243,54 @@ def build_hf_chat_model(*, deterministic: bool, use_4bit: bool = True) -> ChatHu
         
     except Exception as e:
         logger.error(f"Failed to build chat model: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
+
+
+def constrain_chat_model(chat_model, response_schema):
+    """
+    Constrain a chat model to answer with JSON matching a Pydantic schema.
+    
+    Decoding masks every token that would break the schema and stops once the
+    object closes, so the answer parses without cleanup. Returns the model
+    unchanged when CONSTRAINED_DECODING_ENABLED is off.
+    
+    Args:
+        chat_model: ChatHuggingFace pipeline model or QwenVLChatModel adapter
+        response_schema: Pydantic model class of the expected answer
+        
+    Returns:
+        Runnable: The chat model bound to the constraint
+    """
+    if not settings.CONSTRAINED_DECODING_ENABLED:
+        return chat_model
+    if isinstance(chat_model, QwenVLChatModel):
+        # The adapter builds a fresh logits processor per call
+        return chat_model.bind(response_schema=response_schema)
+    
+    gen_pipe = chat_model.llm.pipeline
+    logits_processor = JsonSchemaLogitsProcessor(
+        response_schema,
+        gen_pipe.tokenizer,
+        eos_token_id=gen_pipe.model.generation_config.eos_token_id,
+    )
+    return chat_model.bind(pipeline_kwargs={"logits_processor": LogitsProcessorList([logits_processor])})
+
+
+def warm_up_response_schemas(chat_model, response_schemas: list) -> None:
+    """
+    Index the tokenizer vocabulary and compile the schemas of constrained agent calls.
+    
+    Args:
+        chat_model: ChatHuggingFace pipeline model or QwenVLChatModel adapter
+        response_schemas: Pydantic model classes used with constrain_chat_model()
+    """
+    if not settings.CONSTRAINED_DECODING_ENABLED:
+        return
+    if isinstance(chat_model, QwenVLChatModel):
+        tokenizer, eos_token_id = chat_model.processor.tokenizer, None
+    else:
+        gen_pipe = chat_model.llm.pipeline
+        tokenizer, eos_token_id = gen_pipe.tokenizer, gen_pipe.model.generation_config.eos_token_id
+    for response_schema in response_schemas:
+        get_schema_token_masks(response_schema, tokenizer, eos_token_id)
+
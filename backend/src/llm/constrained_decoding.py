@@ -0,0 +1,378 @@
+"""
+Schema-Constrained JSON Decoding
+Logits processor that only lets a model generate JSON matching a Pydantic schema
+and ends the generation as soon as the object closes
+"""
+import json
+import logging
+import threading
+from typing import Optional, Union
+import torch
+from pydantic import BaseModel
+from transformers import LogitsProcessor
+
+logger = logging.getLogger(__name__)
+
+# Results of feeding one character to a grammar segment
+_CONTINUE, _COMPLETE, _ENDED, _REJECT = range(4)
+
+class JsonSchemaGrammar:
+    """
+    Character-level automaton for the JSON text of a Pydantic model.
+
+    The schema is compiled into a fixed sequence of segments: literal structure
+    ('{"key": ', ', "key": ', '}') and typed values (strings, enums/booleans,
+    integers, numbers and arrays of those). Properties are emitted in declaration
+    order with single spaces after ':' and ','. Strings may not contain escapes.
+
+    A state is a hashable (segment index, segment state) pair; the state after the
+    last segment is the accept state.
+
+    Raises:
+        ValueError: If the schema uses a construct outside this subset (nested
+                    objects, unions, optional values)
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        """
+        Compile a Pydantic model.
+
+        Args:
+            schema: Pydantic model class the output must validate against
+        """
+        self.schema = schema
+        json_schema = schema.model_json_schema()
+        self._defs = json_schema.get("$defs", {})
+        self.segments = self._compile_object(json_schema)
+        self.initial_state = (0, self._initial_sub(0))
+        self.accept_state = (len(self.segments), None)
+
+    def _resolve(self, prop: dict) -> dict:
+        if "$ref" in prop:
+            return self._defs[prop["$ref"].split("/")[-1]]
+        return prop
+
+    def _compile_object(self, schema: dict) -> list[tuple]:
+        properties = schema.get("properties", {})
+        if not properties:
+            return [("literal", "{}")]
+        segments = []
+        for index, (name, prop) in enumerate(properties.items()):
+            segments.append(("literal", ("{" if index == 0 else ", ") + json.dumps(name) + ": "))
+            segments.append(self._compile_value(name, self._resolve(prop)))
+        segments.append(("literal", "}"))
+        return segments
+
+    def _compile_value(self, name: str, prop: dict) -> tuple:
+        if "enum" in prop or "const" in prop:
+            return ("choice", tuple(json.dumps(value) for value in prop.get("enum", [prop.get("const")])))
+        value_type = prop.get("type")
+        if value_type == "string":
+            return ("string",)
+        if value_type == "boolean":
+            return ("choice", ("true", "false"))
+        if value_type in ("integer", "number"):
+            return (value_type,)
+        if value_type == "array":
+            item = self._compile_value(name, self._resolve(prop.get("items", {})))
+            if item[0] == "array":
+                raise ValueError(f"Nested arrays are not supported (property '{name}')")
+            return ("array", item)
+        raise ValueError(f"Unsupported schema for property '{name}' of {self.schema.__name__}: {prop}")
+
+    @staticmethod
+    def _initial_value_sub(segment: tuple):
+        kind = segment[0]
+        if kind == "literal":
+            return 0
+        if kind == "choice":
+            return ""
+        if kind == "string":
+            return 0
+        if kind in ("integer", "number"):
+            return "start"
+        return "open"
+
+    def _initial_sub(self, index: int):
+        if index >= len(self.segments):
+            return None
+        return self._initial_value_sub(self.segments[index])
+
+    def _step_value(self, segment: tuple, sub, char: str) -> tuple:
+        """Feed one character to a value segment: (result, new segment state)"""
+        kind = segment[0]
+        if kind == "literal":
+            text = segment[1]
+            if char != text[sub]:
+                return _REJECT, None
+            return (_COMPLETE, None) if sub + 1 == len(text) else (_CONTINUE, sub + 1)
+
+        if kind == "choice":
+            prefix = sub + char
+            options = [option for option in segment[1] if option.startswith(prefix)]
+            if not options:
+                return _REJECT, None
+            if options == [prefix]:
+                return _COMPLETE, None
+            return _CONTINUE, prefix
+
+        if kind == "string":
+            if sub == 0:
+                return (_CONTINUE, 1) if char == '"' else (_REJECT, None)
+            if char == '"':
+                return _COMPLETE, None
+            if char == "\\" or ord(char) < 32:
+                return _REJECT, None
+            return _CONTINUE, 1
+
+        if kind in ("integer", "number"):
+            is_digit = char in "0123456789"
+            if sub in ("start", "sign") and is_digit:
+                return _CONTINUE, "zero" if char == "0" else "int"
+            if sub in ("int", "frac_start", "frac") and is_digit:
+                return _CONTINUE, "int" if sub == "int" else "frac"
+            if sub == "start" and char == "-":
+                return _CONTINUE, "sign"
+            if sub in ("zero", "int") and char == "." and kind == "number":
+                return _CONTINUE, "frac_start"
+            # A complete number ends before the first character that cannot extend it
+            return (_ENDED, None) if sub in ("zero", "int", "frac") else (_REJECT, None)
+
+        # Array: "open" -> '[' -> "first" -> item ("item", sub) -> "after" -> ', ' -> "next" -> item ...
+        item = segment[1]
+        if sub == "open":
+            return (_CONTINUE, "first") if char == "[" else (_REJECT, None)
+        if sub == "after":
+            if char == "]":
+                return _COMPLETE, None
+            return (_CONTINUE, "sep") if char == "," else (_REJECT, None)
+        if sub == "sep":
+            return (_CONTINUE, "next") if char == " " else (_REJECT, None)
+        if sub == "first" and char == "]":
+            return _COMPLETE, None
+        item_sub = self._initial_value_sub(item) if sub in ("first", "next") else sub[1]
+        result, item_sub = self._step_value(item, item_sub, char)
+        if result == _CONTINUE:
+            return _CONTINUE, ("item", item_sub)
+        if result == _COMPLETE:
+            return _CONTINUE, "after"
+        if result == _ENDED:
+            return self._step_value(segment, "after", char)
+        return _REJECT, None
+
+    def step(self, state: tuple, char: str) -> Optional[tuple]:
+        """
+        Feed one character.
+
+        Args:
+            state: Current grammar state
+            char: Next output character
+
+        Returns:
+            tuple: New state, or None if the character is not allowed
+        """
+        index, sub = state
+        if index >= len(self.segments):
+            return None
+        result, sub = self._step_value(self.segments[index], sub, char)
+        if result == _CONTINUE:
+            return (index, sub)
+        if result == _COMPLETE:
+            return (index + 1, self._initial_sub(index + 1))
+        if result == _ENDED:
+            return self.step((index + 1, self._initial_sub(index + 1)), char)
+        return None
+
+    def walk(self, state: tuple, text: str) -> Optional[tuple]:
+        """Feed a string; None if any character is not allowed"""
+        for char in text:
+            state = self.step(state, char)
+            if state is None:
+                return None
+        return state
+
+    def in_free_string(self, state: tuple) -> bool:
+        """Whether the state is inside a string value, where any unescaped character but '"' is allowed"""
+        index, sub = state
+        if index >= len(self.segments):
+            return False
+        segment = self.segments[index]
+        if segment[0] == "string":
+            return sub == 1
+        return segment[0] == "array" and segment[1][0] == "string" and sub == ("item", 1)
+
+class TokenVocabulary:
+    """
+    Decoded vocabulary of a tokenizer, indexed for grammar masking.
+
+    Attributes:
+        strings: Decoded text per token id ('' for special and partial-UTF-8 tokens)
+        string_safe_ids: Tokens that can appear anywhere inside a JSON string
+        quote_ids: Ordinary tokens containing '"' (may close a string)
+        ids_by_first_char: Ordinary token ids grouped by their first character
+    """
+
+    def __init__(self, tokenizer):
+        """
+        Decode every token once.
+
+        Args:
+            tokenizer: Hugging Face tokenizer of the generating model
+        """
+        size = len(tokenizer)
+        special_ids = set(tokenizer.all_special_ids) | set(getattr(tokenizer, "added_tokens_decoder", {}) or {})
+        decoded = tokenizer.batch_decode([[token_id] for token_id in range(size)], skip_special_tokens=False, clean_up_tokenization_spaces=False)
+
+        self.strings: list[str] = []
+        safe_ids, quote_ids = [], []
+        self.ids_by_first_char: dict[str, list[int]] = {}
+        for token_id, text in enumerate(decoded):
+            if token_id in special_ids or not text or "�" in text:
+                self.strings.append("")
+                continue
+            self.strings.append(text)
+            self.ids_by_first_char.setdefault(text[0], []).append(token_id)
+            if '"' in text:
+                quote_ids.append(token_id)
+            elif "\\" not in text and all(ord(char) >= 32 for char in text):
+                safe_ids.append(token_id)
+        self.string_safe_ids = torch.tensor(safe_ids, dtype=torch.long)
+        self.quote_ids = quote_ids
+
+class SchemaTokenMasks:
+    """
+    Allowed next tokens per grammar state of one schema and tokenizer, computed
+    on first use of a state and cached.
+    """
+
+    def __init__(self, grammar: JsonSchemaGrammar, vocabulary: TokenVocabulary, eos_token_ids: list[int]):
+        self.grammar = grammar
+        self.vocabulary = vocabulary
+        self.eos_token_ids = torch.tensor(eos_token_ids, dtype=torch.long)
+        self._allowed: dict[tuple, torch.Tensor] = {}
+        self._lock = threading.Lock()
+
+    def advance(self, state: tuple, token_id: int) -> Optional[tuple]:
+        """State after a generated token; None if the token does not fit the grammar"""
+        text = self.vocabulary.strings[token_id] if token_id < len(self.vocabulary.strings) else ""
+        return self.grammar.walk(state, text) if text else None
+
+    def allowed_token_ids(self, state: tuple, device: torch.device) -> torch.Tensor:
+        """
+        Token ids allowed in a state (only EOS once the object is complete).
+
+        Args:
+            state: Grammar state
+            device: Device of the logits the ids index into
+
+        Returns:
+            torch.Tensor: Allowed token ids
+        """
+        key = (state, str(device))
+        allowed = self._allowed.get(key)
+        if allowed is not None:
+            return allowed
+
+        if state == self.grammar.accept_state:
+            allowed = self.eos_token_ids
+        elif self.grammar.in_free_string(state):
+            closing = [token_id for token_id in self.vocabulary.quote_ids if self.advance(state, token_id) is not None]
+            allowed = torch.cat([self.vocabulary.string_safe_ids, torch.tensor(closing, dtype=torch.long)])
+        else:
+            candidates = [
+                token_id
+                for char, token_ids in self.vocabulary.ids_by_first_char.items()
+                if self.grammar.step(state, char) is not None
+                for token_id in token_ids
+            ]
+            allowed = torch.tensor([token_id for token_id in candidates if self.advance(state, token_id) is not None], dtype=torch.long)
+
+        allowed = allowed.to(device)
+        with self._lock:
+            self._allowed[key] = allowed
+        return allowed
+
+_vocabularies: dict[int, TokenVocabulary] = {}
+_masks: dict[tuple, SchemaTokenMasks] = {}
+_cache_lock = threading.Lock()
+
+def get_schema_token_masks(schema: type[BaseModel], tokenizer, eos_token_id: Union[int, list[int], None] = None) -> SchemaTokenMasks:
+    """
+    Get the (cached) token masks of a schema for a tokenizer.
+
+    Decoding the vocabulary takes a few seconds the first time a tokenizer is
+    used; call this at startup to keep it off the first request.
+
+    Args:
+        schema: Pydantic model class
+        tokenizer: Hugging Face tokenizer of the generating model
+        eos_token_id: Token id(s) that end the generation (default: tokenizer.eos_token_id)
+
+    Returns:
+        SchemaTokenMasks: Grammar and token masks
+    """
+    eos_token_ids = eos_token_id if eos_token_id is not None else tokenizer.eos_token_id
+    eos_token_ids = tuple(eos_token_ids) if isinstance(eos_token_ids, (list, tuple)) else (eos_token_ids,)
+    key = (schema, id(tokenizer), eos_token_ids)
+    with _cache_lock:
+        masks = _masks.get(key)
+        if masks is None:
+            vocabulary = _vocabularies.get(id(tokenizer))
+            if vocabulary is None:
+                vocabulary = _vocabularies[id(tokenizer)] = TokenVocabulary(tokenizer)
+                logger.info(f"Indexed {len(vocabulary.strings)} tokens for constrained decoding")
+            masks = _masks[key] = SchemaTokenMasks(JsonSchemaGrammar(schema), vocabulary, list(eos_token_ids))
+    return masks
+
+class JsonSchemaLogitsProcessor(LogitsProcessor):
+    """
+    Masks every token that would make the output invalid JSON for a schema.
+
+    Tracks the grammar state of each row from the tokens generated since the
+    first call; a call that does not continue the previous one by exactly one
+    token starts a new generation, so one instance can serve successive calls.
+    After the closing brace only EOS is allowed.
+    """
+
+    def __init__(self, schema: type[BaseModel], tokenizer, eos_token_id: Union[int, list[int], None] = None):
+        """
+        Args:
+            schema: Pydantic model class the output must validate against
+            tokenizer: Hugging Face tokenizer of the generating model
+            eos_token_id: Token id(s) that end the generation (default: tokenizer.eos_token_id)
+        """
+        self.masks = get_schema_token_masks(schema, tokenizer, eos_token_id)
+        self._states: Optional[list[Optional[tuple]]] = None
+        self._length: Optional[int] = None
+        self._prompt: Optional[torch.Tensor] = None
+
+    def _continues(self, input_ids: torch.LongTensor) -> bool:
+        return (
+            self._states is not None
+            and input_ids.shape[0] == len(self._states)
+            and input_ids.shape[-1] == self._length + 1
+            and torch.equal(input_ids[:, :self._prompt.shape[-1]], self._prompt)
+        )
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if self._continues(input_ids):
+            for row, state in enumerate(self._states):
+                if state is None:
+                    continue
+                self._states[row] = self.masks.advance(state, int(input_ids[row, -1]))
+                if self._states[row] is None:
+                    logger.warning("Generated token left the JSON grammar; row is no longer constrained")
+        else:
+            self._states = [self.masks.grammar.initial_state] * input_ids.shape[0]
+            self._prompt = input_ids.clone()
+        self._length = input_ids.shape[-1]
+
+        constrained = torch.full_like(scores, float("-inf"))
+        for row, state in enumerate(self._states):
+            if state is None:
+                constrained[row] = scores[row]
+                continue
+            allowed = self.masks.allowed_token_ids(state, scores.device)
+            allowed = allowed[allowed < scores.shape[-1]]
+            constrained[row, allowed] = scores[row, allowed]
+        return constrained
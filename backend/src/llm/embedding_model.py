@@ -2,6 +2,8 @@
 Load hugging face embedding models
 """
 from transformers import AutoModel, AutoTokenizer
+from config.service_config import settings
+from src.llm.model_lifecycle import weight_loading_kwargs
 
 def load_embedding_model(model_name: str):
     """
@@ -13,8 +15,8 @@ def load_embedding_model(model_name: str):
     Returns:
         tuple: (model, tokenizer) - Loaded embedding model and tokenizer
     """
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModel.from_pretrained(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=settings.HF_CACHE_DIR)
+    model = AutoModel.from_pretrained(model_name, **weight_loading_kwargs())
 
     return model, tokenizer
     
\ No newline at end of file
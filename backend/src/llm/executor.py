@@ -0,0 +1,245 @@
+"""
+Inference Executor
+Runs blocking model calls (generation, embeddings, reranking) on dedicated worker
+threads so the asyncio event loop keeps serving requests while models run
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+import numpy as np
+from config.service_config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANE = "default"
+
+class _Lane:
+    """Worker threads and counters of one lane"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"inference-{name}")
+        self.threads: set[int] = set()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+class InferenceExecutor:
+    """
+    Per-model worker lanes for blocking model calls.
+
+    Every model is assigned to a lane; calls for models of the same lane run on
+    that lane's threads, so a single-worker lane serializes access to its model
+    (transformers models keep per-call state and are not safe to drive from
+    several threads at once). Models without a lane use the 'default' lane.
+
+    Calls keep the caller's context variables, so LangChain callbacks and LangGraph
+    stream writers work inside them. A call made from a thread of the target lane
+    runs inline instead of queueing behind itself.
+    """
+
+    def __init__(self):
+        """Initialize with only the default lane"""
+        self._lanes: dict[str, _Lane] = {DEFAULT_LANE: _Lane(DEFAULT_LANE, 1)}
+        self._model_lanes: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add_lane(self, name: str, max_workers: int = 1) -> None:
+        """
+        Create a lane, or resize it if it exists.
+
+        Args:
+            name: Lane name
+            max_workers: Calls the lane runs at once (1 serializes its models)
+        """
+        with self._lock:
+            lane = self._lanes.get(name)
+            if lane and lane.max_workers == max_workers:
+                return
+            if lane:
+                lane.pool.shutdown(wait=False)
+            self._lanes[name] = _Lane(name, max_workers)
+        logger.info(f"Inference lane '{name}' ready ({max_workers} worker(s))")
+
+    def assign(self, model, lane: str) -> None:
+        """
+        Route calls for a model to a lane.
+
+        Args:
+            model: Model (or model wrapper) instance
+            lane: Name of an existing lane
+
+        Raises:
+            ValueError: If the lane does not exist
+        """
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown inference lane '{lane}'. Available: {', '.join(self._lanes)}")
+        self._model_lanes[id(model)] = lane
+
+    def unassign(self, model) -> None:
+        """Forget the lane of a model that was unloaded"""
+        self._model_lanes.pop(id(model), None)
+
+    def is_busy(self, model) -> bool:
+        """Check whether the lane of an assigned model has queued or running calls"""
+        lane = self._model_lanes.get(id(model))
+        if lane is None:
+            return False
+        with self._lock:
+            return self._lanes[lane].queued + self._lanes[lane].running > 0
+
+    def lane_of(self, model) -> str:
+        """Name of the lane serving a model"""
+        return self._model_lanes.get(id(model), DEFAULT_LANE)
+
+    def submit(self, model, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a call on the lane of a model.
+
+        Args:
+            model: Model the call uses (selects the lane)
+            fn: Blocking function to run
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Future: Resolves to the return value of fn
+        """
+        lane = self._lanes[self.lane_of(model)]
+        context = contextvars.copy_context()
+        queued_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            with self._lock:
+                lane.threads.add(threading.get_ident())
+                lane.queued -= 1
+                lane.running += 1
+                lane.wait_seconds += started_at - queued_at
+            succeeded = False
+            try:
+                result = context.run(fn, *args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                with self._lock:
+                    lane.running -= 1
+                    lane.run_seconds += time.perf_counter() - started_at
+                    if succeeded:
+                        lane.completed += 1
+                    else:
+                        lane.failed += 1
+
+        with self._lock:
+            lane.queued += 1
+        return lane.pool.submit(run)
+
+    def call(self, model, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a call on the lane of a model and wait for it (for code already off the event loop).
+
+        Args:
+            model: Model the call uses (selects the lane)
+            fn: Blocking function to run
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Any: Return value of fn
+        """
+        if threading.get_ident() in self._lanes[self.lane_of(model)].threads:
+            return fn(*args, **kwargs)
+        return self.submit(model, fn, *args, **kwargs).result()
+
+    async def run(self, model, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Await a call on the lane of a model without blocking the event loop.
+
+        Args:
+            model: Model the call uses (selects the lane)
+            fn: Blocking function to run
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Any: Return value of fn
+        """
+        return await asyncio.wrap_future(self.submit(model, fn, *args, **kwargs))
+
+    def get_metrics(self) -> dict:
+        """
+        Get per-lane metrics.
+
+        Returns:
+            dict: Per lane: workers, queued/running calls, completed/failed counters,
+                  mean queue wait and mean run time in milliseconds
+        """
+        metrics = {}
+        with self._lock:
+            for name, lane in self._lanes.items():
+                finished = lane.completed + lane.failed
+                metrics[name] = {
+                    "workers": lane.max_workers,
+                    "queued": lane.queued,
+                    "running": lane.running,
+                    "completed": lane.completed,
+                    "failed": lane.failed,
+                    "mean_wait_ms": lane.wait_seconds / finished * 1000 if finished else 0.0,
+                    "mean_run_ms": lane.run_seconds / finished * 1000 if finished else 0.0,
+                }
+        return metrics
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a timed sleep.
+
+    A healthy loop wakes up within a millisecond or two; a blocking call on the
+    loop shows up as lag of the same length.
+    """
+
+    def __init__(self, interval_s: float, window: int = 600):
+        """
+        Initialize the monitor
+
+        Args:
+            interval_s: Seconds between samples
+            window: Number of recent samples the percentiles are computed over
+        """
+        self.interval_s = interval_s
+        self._samples: deque[float] = deque(maxlen=window)
+        self._max_lag_ms = 0.0
+
+    async def run(self) -> None:
+        """Background task that samples the event-loop lag every interval_s"""
+        logger.info(f"Starting event-loop lag monitor every {self.interval_s}s")
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval_s)
+            lag_ms = max(0.0, (time.perf_counter() - started_at - self.interval_s) * 1000)
+            self._samples.append(lag_ms)
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+
+    def get_metrics(self) -> dict:
+        """
+        Get event-loop lag metrics.
+
+        Returns:
+            dict: Sample count, last and all-time max lag, and p50/p99 lag over the window in milliseconds
+        """
+        samples = list(self._samples)
+        return {
+            "samples": len(samples),
+            "last_lag_ms": samples[-1] if samples else 0.0,
+            "max_lag_ms": self._max_lag_ms,
+            "p50_lag_ms": float(np.percentile(samples, 50)) if samples else 0.0,
+            "p99_lag_ms": float(np.percentile(samples, 99)) if samples else 0.0,
+        }
+
+inference_executor = InferenceExecutor()
+event_loop_monitor = EventLoopLagMonitor(settings.EVENT_LOOP_MONITOR_INTERVAL_S)
@@ -2,10 +2,226 @@
 Qwen Vision-Language Model Inference
 Handles text generation with Qwen2.5-VL models for chat and vision tasks
 """
+import copy
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
 import torch
+from transformers import DynamicCache, TextStreamer
+from config.service_config import settings
+from src.llm.executor import inference_executor
+
+logger = logging.getLogger(__name__)
+
+# Marks where the static part of a system prompt ends when rendering its chat-template prefix
+_PREFIX_END = "<<<PREFIX_END>>>"
+
+class PrefixEntry(NamedTuple):
+    """Precomputed KV cache of a rendered static prompt prefix"""
+    prefix_text: str
+    prefix_ids: torch.Tensor
+    kv_cache: DynamicCache
+
+def render_system_prefix(processor, system_prompt: str) -> str:
+    """
+    Render the chat-template text that every call with this system prompt starts with.
+
+    Args:
+        processor: Qwen AutoProcessor
+        system_prompt: Static system prompt, or the static head of a templated one
+                       (e.g. RAG_QA_PROMPT up to '{doc_context}')
+
+    Returns:
+        str: Rendered prefix text
+    """
+    rendered = processor.apply_chat_template(
+        [{"role": "system", "content": [{"type": "text", "text": system_prompt + _PREFIX_END}]}],
+        add_generation_prompt=False,
+        tokenize=False,
+    )
+    return rendered.split(_PREFIX_END, 1)[0]
+
+class PrefixCache:
+    """
+    Bounded LRU of past_key_values for static prompt prefixes, keyed by model and prompt hash.
+
+    Prefixes are prefilled once at warm-up. A text-only generation whose chat text
+    starts with a cached prefix continues from a copy of its KV cache, so only the
+    variable suffix (user turn, retrieved context) is prefilled.
+
+    Attributes:
+        max_entries: Maximum cached prefixes
+        min_prefix_tokens: Shortest shared prefix worth reusing
+    """
+
+    def __init__(self, max_entries: int = 8, min_prefix_tokens: int = 32):
+        self.max_entries = max_entries
+        self.min_prefix_tokens = min_prefix_tokens
+        self._entries: OrderedDict[tuple, PrefixEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._reused_tokens = 0
+
+    @staticmethod
+    def _model_key(model) -> tuple:
+        return (id(model), getattr(getattr(model, "config", None), "_name_or_path", ""))
+
+    @staticmethod
+    def _prefix_hash(prefix_text: str) -> str:
+        return hashlib.sha256(prefix_text.encode("utf-8")).hexdigest()[:16]
+
+    @torch.inference_mode()
+    def add(self, processor, model, system_prompt: str) -> int:
+        """
+        Prefill a static system prompt and cache its KV state.
+
+        Args:
+            processor: Qwen AutoProcessor
+            model: Loaded Qwen2.5-VL model
+            system_prompt: Static system prompt (or its static head)
+
+        Returns:
+            int: Cached prefix length in tokens
+        """
+        prefix_text = render_system_prefix(processor, system_prompt)
+        key = (self._model_key(model), self._prefix_hash(prefix_text))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key].prefix_ids.shape[-1]
+
+        prefix_ids = processor(text=[prefix_text], return_tensors="pt")["input_ids"].to(model.device)
+        kv_cache = DynamicCache()
+        model(input_ids=prefix_ids, past_key_values=kv_cache, use_cache=True)
+
+        with self._lock:
+            self._entries[key] = PrefixEntry(prefix_text, prefix_ids, kv_cache)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prefix_ids.shape[-1]
+
+    def warm_up(self, processor, model, system_prompts: list[str]) -> None:
+        """
+        Precompute the prefixes of the static system prompts.
+
+        Args:
+            processor: Qwen AutoProcessor
+            model: Loaded Qwen2.5-VL model
+            system_prompts: Static system prompts (or static heads of templated prompts)
+        """
+        for system_prompt in system_prompts:
+            try:
+                prefix_tokens = self.add(processor, model, system_prompt)
+                logger.info(f"Cached prompt prefix of {prefix_tokens} tokens")
+            except Exception as e:
+                logger.warning(f"Failed to cache prompt prefix: {e}")
+
+    def lookup(self, model, chat_text: str, input_ids: torch.Tensor) -> Optional[DynamicCache]:
+        """
+        Get a private KV cache covering the longest cached prefix of a prompt.
+
+        Args:
+            model: Model the prompt is generated with
+            chat_text: Rendered chat text of the prompt
+            input_ids: Token IDs of the prompt, shape (1, seq_len)
+
+        Returns:
+            DynamicCache: Copy of the prefix KV cache cropped to the tokens shared with
+                          input_ids, or None if no prefix applies
+        """
+        model_key = self._model_key(model)
+        with self._lock:
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if key[0] == model_key and chat_text.startswith(entry.prefix_text)
+            ]
+            if not candidates:
+                self._misses += 1
+                return None
+            key, entry = max(candidates, key=lambda item: len(item[1].prefix_text))
+            self._entries.move_to_end(key)
+
+        # Token boundaries can differ where the prefix meets the variable text, so only
+        # the tokens both sequences share are reused; keep at least one token to prefill
+        prefix_ids = entry.prefix_ids[0]
+        length = min(prefix_ids.shape[-1], input_ids.shape[-1] - 1)
+        mismatch = (prefix_ids[:length] != input_ids[0, :length].to(prefix_ids.device)).nonzero()
+        shared_tokens = int(mismatch[0]) if len(mismatch) else length
+        if shared_tokens < self.min_prefix_tokens:
+            self._misses += 1
+            return None
+
+        kv_cache = copy.deepcopy(entry.kv_cache)
+        if shared_tokens < kv_cache.get_seq_length():
+            kv_cache.crop(shared_tokens)
+        self._hits += 1
+        self._reused_tokens += shared_tokens
+        return kv_cache
+
+    def clear(self) -> None:
+        """Drop every cached prefix"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            dict: Cached prefix count, hit/miss counters and prefill tokens saved
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "reused_tokens": self._reused_tokens,
+            }
+
+prefix_cache = PrefixCache(settings.PREFIX_CACHE_MAX_ENTRIES)
+
+def _reset_text_rope_deltas(model) -> None:
+    """
+    Prepare Qwen2.5-VL multimodal RoPE for a generation that starts from a cached prefix.
+
+    The model computes position IDs from the whole prompt only when generation starts at
+    position 0; past that it offsets positions by its stored rope_deltas. Text-only
+    prompts have a delta of 0, which must be set explicitly because the stored value
+    belongs to whatever the previous call generated (possibly an image prompt).
+    """
+    inner_model = getattr(model, "model", None)
+    if inner_model is not None and hasattr(inner_model, "rope_deltas"):
+        inner_model.rope_deltas = torch.zeros((1, 1), dtype=torch.long, device=model.device)
+
+class CallbackTextStreamer(TextStreamer):
+    """
+    Streamer that hands each decoded text fragment of a generation to a callback.
+
+    Fragments are cut at word boundaries by TextStreamer; the callback runs on the
+    generating thread.
+    """
+
+    def __init__(self, tokenizer, on_text: Callable[[str], None]):
+        """
+        Args:
+            tokenizer: Tokenizer of the generating model
+            on_text: Called with every new text fragment
+        """
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.on_text = on_text
+
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        if text:
+            self.on_text(text)
 
 @torch.inference_mode()
-def generate_qwen_response(processor, model, messages: list, images=None, max_new_tokens: int = 512, temperature: float = 0.0, top_p: float = 1.0) -> str:
+def generate_qwen_response(processor, model, messages: list, images=None, max_new_tokens: int = 512, temperature: float = 0.0, top_p: float = 1.0, streamer=None, logits_processor=None) -> str:
     """
     Generate response using Qwen2.5-VL model
     
@@ -17,6 +233,8 @@ def generate_qwen_response(processor, model, messages: list, images=None, max_ne
         max_new_tokens: Maximum tokens to generate (default: 512)
         temperature: Sampling temperature, 0 for greedy (default: 0.0)
         top_p: Nucleus sampling parameter (default: 1.0)
+        streamer: Optional transformers streamer receiving new tokens as they are generated
+        logits_processor: Optional LogitsProcessorList applied before sampling (e.g. JSON schema constraints)
         
     Returns:
         str: Generated response text
@@ -25,6 +243,11 @@ def generate_qwen_response(processor, model, messages: list, images=None, max_ne
         >>> messages = [{"role": "user", "content": "Describe this image"}]
         >>> response = generate_qwen_response(processor, model, messages, images=[img])
     """
+    # Hand the request to the continuous-batching server when it serves this model
+    from src.llm.batching import inference_server
+    if inference_server.serves(model):
+        return inference_server.submit(messages, images, max_new_tokens, temperature, top_p, streamer, logits_processor).result()
+
     # Build chat input with template
     chat_text = processor.apply_chat_template(
         messages, add_generation_prompt=True, tokenize=False
@@ -37,13 +260,24 @@ def generate_qwen_response(processor, model, messages: list, images=None, max_ne
         return_tensors="pt"
     ).to(model.device)
 
+    # Continue from a cached static prefix when one applies (text-only prompts)
+    generate_kwargs = {}
+    if images is None and settings.PREFIX_CACHE_ENABLED:
+        kv_cache = prefix_cache.lookup(model, chat_text, inputs["input_ids"])
+        if kv_cache is not None:
+            _reset_text_rope_deltas(model)
+            generate_kwargs["past_key_values"] = kv_cache
+
     # Generate response
     generated_ids = model.generate(
         **inputs,
+        **generate_kwargs,
         max_new_tokens=max_new_tokens,
         temperature=temperature,
         top_p=top_p,
         do_sample=temperature > 0,
+        streamer=streamer,
+        logits_processor=logits_processor,
         pad_token_id=getattr(processor.tokenizer, "pad_token_id", None),
         eos_token_id=getattr(processor.tokenizer, "eos_token_id", None),
     )
@@ -56,4 +290,10 @@ def generate_qwen_response(processor, model, messages: list, images=None, max_ne
         skip_special_tokens=True
     )[0].strip()
     
-    return response
\ No newline at end of file
+    return response
+
+async def agenerate_qwen_response(processor, model, messages: list, images=None, max_new_tokens: int = 512, temperature: float = 0.0, top_p: float = 1.0, streamer=None, logits_processor=None) -> str:
+    """Async variant of generate_qwen_response() that runs on the model's inference lane"""
+    return await inference_executor.run(
+        model, generate_qwen_response, processor, model, messages, images, max_new_tokens, temperature, top_p, streamer, logits_processor
+    )
@@ -0,0 +1,254 @@
+"""
+Model Lifecycle
+Registry that loads independent models concurrently, tracks the readiness of each
+model on its own and loads lazy models on first use
+"""
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+from config.service_config import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_PENDING = "pending"
+MODEL_LOADING = "loading"
+MODEL_READY = "ready"
+MODEL_FAILED = "failed"
+MODEL_OFFLOADED = "offloaded"
+MODEL_UNLOADED = "unloaded"
+
+def weight_loading_kwargs() -> dict:
+    """
+    from_pretrained kwargs for model weights.
+
+    Safetensors checkpoints are memory-mapped and copied straight into the parameters,
+    without first building a randomly initialised model in CPU memory.
+
+    Returns:
+        dict: cache_dir, use_safetensors and low_cpu_mem_usage
+    """
+    return dict(
+        cache_dir=settings.HF_CACHE_DIR,
+        use_safetensors=True if settings.MODEL_USE_SAFETENSORS else None,
+        low_cpu_mem_usage=True,
+    )
+
+class ModelSlot:
+    """
+    One loadable model and its lifecycle state.
+
+    Attributes:
+        name: Model name in the registry
+        loader: Callable returning the loaded model
+        depends_on: Names of the models that must be loaded first
+        lazy: Load on first use instead of at startup
+        state: 'pending', 'loading', 'ready', 'failed', or 'offloaded' / 'unloaded' once evicted
+        value: Loader result once ready
+        error: Error message of the last failed load
+        load_time_s: Seconds the last successful load took
+        lock: Held while the model is loaded, moved or evicted
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], depends_on: tuple[str, ...] = (), lazy: bool = False):
+        self.name = name
+        self.loader = loader
+        self.depends_on = depends_on
+        self.lazy = lazy
+        self.state = MODEL_PENDING
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.load_time_s: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def load(self) -> Any:
+        """
+        Run the loader once; concurrent callers wait for the same load.
+
+        Returns:
+            Any: The loaded model
+
+        Raises:
+            Exception: Whatever the loader raised (the slot is marked failed and retried on the next call)
+        """
+        with self.lock:
+            if self.state == MODEL_READY:
+                return self.value
+            self.state = MODEL_LOADING
+            logger.info(f"Loading model '{self.name}'")
+            start_time = time.perf_counter()
+            try:
+                self.value = self.loader()
+            except Exception as e:
+                self.state, self.error = MODEL_FAILED, str(e)
+                logger.error(f"Failed to load model '{self.name}': {str(e)}", exc_info=True)
+                raise
+            self.load_time_s = time.perf_counter() - start_time
+            self.state, self.error = MODEL_READY, None
+            logger.info(f"Model '{self.name}' ready in {self.load_time_s:.1f}s")
+            return self.value
+
+class ModelRegistry:
+    """
+    Loads registered models, concurrently where they do not depend on each other.
+
+    Loads run in worker threads so the event loop keeps serving requests that need
+    no model. At most max_concurrent_loads models load at once. With a residency
+    manager, evicted models are restored or reloaded on their next use, and a
+    request keeps the models it holds resident with lease().
+    """
+
+    def __init__(self, max_concurrent_loads: int = 3, residency=None):
+        """
+        Initialize the registry.
+
+        Args:
+            max_concurrent_loads: Models loaded at the same time
+            residency: Optional ModelResidencyManager keeping the models within a memory budget
+        """
+        self.max_concurrent_loads = max_concurrent_loads
+        self.residency = residency
+        self._slots: dict[str, ModelSlot] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_loads)
+
+    def register(self, name: str, loader: Callable[[], Any], depends_on: tuple[str, ...] = (), lazy: bool = False) -> None:
+        """
+        Register a model.
+
+        Args:
+            name: Model name
+            loader: Callable returning the loaded model; runs in a worker thread
+            depends_on: Names of models that must be loaded first
+            lazy: Load on first use instead of at startup
+        """
+        self._slots[name] = ModelSlot(name, loader, depends_on, lazy)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots
+
+    def _slot(self, name: str) -> ModelSlot:
+        if name not in self._slots:
+            raise KeyError(f"Unknown model '{name}'. Registered: {', '.join(self._slots)}")
+        return self._slots[name]
+
+    def is_ready(self, name: str) -> bool:
+        """Check whether a model is loaded"""
+        return self._slot(name).state == MODEL_READY
+
+    def get(self, name: str) -> Any:
+        """
+        Get a model, loading it and its dependencies in the calling thread if needed.
+
+        Args:
+            name: Model name
+
+        Returns:
+            Any: The loaded model
+        """
+        slot = self._slot(name)
+        if slot.state != MODEL_READY:
+            for dependency in slot.depends_on:
+                self.get(dependency)
+        return self._ensure(slot)
+
+    async def aget(self, name: str) -> Any:
+        """
+        Get a model, loading it in a worker thread after its dependencies.
+
+        Args:
+            name: Model name
+
+        Returns:
+            Any: The loaded model
+        """
+        slot = self._slot(name)
+        # Restores, reloads and evictions move or free weights: keep them off the event loop
+        if slot.state == MODEL_READY and (not self.residency or self.residency.mark_used(slot, self._slots)):
+            return slot.value
+        if slot.depends_on:
+            await asyncio.gather(*(self.aget(dependency) for dependency in slot.depends_on))
+        async with self._semaphore:
+            return await asyncio.to_thread(self._ensure, slot)
+
+    def _ensure(self, slot: ModelSlot) -> Any:
+        """Load, restore or reload a model as needed and mark it used"""
+        if slot.state != MODEL_READY:
+            if self.residency:
+                self.residency.prepare(slot, self._slots)
+            if slot.state != MODEL_READY:
+                slot.load()
+        if self.residency:
+            self.residency.touch(slot, self._slots)
+        return slot.value
+
+    @contextlib.contextmanager
+    def lease(self, *names: str) -> Iterator[None]:
+        """
+        Keep models resident while a request holds references to them.
+
+        A model handed out by get()/aget() may be kept in a local variable across
+        long awaits. Evicting it meanwhile would leave the request running on a CPU
+        copy (offload) or keep a second copy alive next to a reload (unload), so
+        leased models are never evicted. Leases nest; names that are not
+        registered are ignored.
+
+        Args:
+            names: Names of the models the request uses
+        """
+        pinned = [name for name in names if name in self._slots] if self.residency else []
+        for name in pinned:
+            self.residency.pin(name)
+        try:
+            yield
+        finally:
+            for name in pinned:
+                self.residency.unpin(name)
+
+    async def load_all(self) -> None:
+        """
+        Load every eager model, independent ones concurrently.
+
+        Raises:
+            RuntimeError: If any model failed; the others are still loaded
+        """
+        names = [name for name, slot in self._slots.items() if not slot.lazy]
+        results = await asyncio.gather(*(self.aget(name) for name in names), return_exceptions=True)
+        failed = [name for name, result in zip(names, results) if isinstance(result, Exception)]
+        if failed:
+            raise RuntimeError(f"Failed to load model(s): {', '.join(failed)}")
+
+    @property
+    def all_eager_ready(self) -> bool:
+        """Check whether every eager model is loaded"""
+        return all(slot.state == MODEL_READY for slot in self._slots.values() if not slot.lazy)
+
+    def get_status(self) -> dict:
+        """
+        Get the lifecycle state of every model.
+
+        Returns:
+            dict: State, lazy flag, load time and last error per model
+        """
+        return {
+            name: {
+                "state": slot.state,
+                "lazy": slot.lazy,
+                "load_time_s": round(slot.load_time_s, 3) if slot.load_time_s is not None else None,
+                "error": slot.error,
+            }
+            for name, slot in self._slots.items()
+        }
+
+    def evict_idle(self) -> list[str]:
+        """Evict every idle model regardless of the memory budget (none without a residency manager)"""
+        if not self.residency:
+            return []
+        return self.residency.evict_idle(self._slots)
+
+    def get_residency_status(self) -> Optional[dict]:
+        """Residency state and eviction counts (None without a residency manager)"""
+        if not self.residency:
+            return None
+        return self.residency.get_status(self._slots)
@@ -2,19 +2,33 @@
 Model Manager
 Loads and manages AI models across the application
 """
+import asyncio
+import contextlib
 import logging
+import time
 from typing import Optional, Tuple
 from config.service_config import settings
 from src.llm.embedding_model import load_embedding_model
-from src.llm.chat_model import load_qwen_vl_model, build_hf_chat_model
-from src.vector_database.qdrant_client import get_qdrant_client
+from src.llm.chat_model import load_qwen_vl_model, build_hf_chat_model, warm_up_response_schemas
+from src.llm.qwen_chat_adapter import QwenVLChatModel
+from src.llm.inference import prefix_cache
+from src.llm.batching import inference_server
+from src.llm.executor import inference_executor
+from src.llm.model_lifecycle import ModelRegistry, MODEL_UNLOADED
+from src.llm.model_residency import ModelResidencyManager
+from src.prompt_engineering.templates import STATIC_AGENT_SYSTEM_PROMPTS, STATIC_SYSTEM_PROMPTS
+from src.prompt_engineering.schemas import AgentSupervisorRouter, ExtractVideoFileSchema
+from src.vector_database.client_pool import QdrantClientPool
+from src.vector_database.reranker import CrossEncoderReranker
 
 logger = logging.getLogger(__name__)
 
 class ModelManager:
     """
     Singleton class to manage global AI models.
-    Loads models once at startup and provides access throughout the application.
+    Registers every model with a lifecycle registry that loads independent models
+    concurrently at startup (or on first use for lazy ones), keeps them within the
+    memory budget and provides access throughout the application.
     """
     
     def __init__(self):
@@ -25,17 +39,154 @@ class ModelManager:
         self.qwen_processor: Optional[any] = None
         self.qwen_chat_model: Optional[any] = None
         self.chat_model: Optional[any] = None
-        self.qdrant_client: Optional[any] = None
+        self.qdrant_pool: Optional[QdrantClientPool] = None
+        self.reranker: Optional[CrossEncoderReranker] = None
+        self._role_chat_models: dict[str, QwenVLChatModel] = {}
+        self._qdrant_connect_lock = asyncio.Lock()
+        
+        # Seconds spent in the warm-up steps run after a model loads
+        self.load_times: dict[str, float] = {}
         
         # Loading state flag
         self._models_loaded: bool = False
         
+        self._residency = ModelResidencyManager.from_settings(on_evict=self._on_evict, on_restore=self._on_restore)
+        self._registry = ModelRegistry(max_concurrent_loads=settings.MODEL_LOAD_CONCURRENCY, residency=self._residency)
+        self._register_models()
+        
         logger.info("ModelManager initialized")
     
+    def _register_models(self):
+        """Register the models enabled by the settings with the lifecycle registry"""
+        lazy = set(settings.MODEL_LAZY_LOAD)
+        self._registry.register("embedding", self._load_embedding, lazy="embedding" in lazy)
+        self._registry.register("qwen_vl", self._load_qwen_vl, lazy="qwen_vl" in lazy)
+        if not settings.SINGLE_MODEL_MODE:
+            self._registry.register("chat", self._load_chat, lazy="chat" in lazy)
+        if settings.RERANK_ENABLED:
+            self._registry.register("reranker", self._load_reranker, lazy="reranker" in lazy)
+    
+    def _load_embedding(self) -> Tuple:
+        """Load the dense embedding model and give it an inference lane"""
+        self.dense_embedding_model, self.dense_embedding_tokenizer = load_embedding_model(
+            settings.BGE_EMBEDDING_MODEL_NAME
+        )
+        inference_executor.add_lane("embedding")
+        inference_executor.assign(self.dense_embedding_model, "embedding")
+        return self.dense_embedding_model, self.dense_embedding_tokenizer
+    
+    def _load_qwen_vl(self) -> Tuple:
+        """Load Qwen VL, warm up its caches and give it an inference lane"""
+        processor, model = load_qwen_vl_model(settings.QWEN_VL_MODEL_NAME, settings.QWEN_VL_USE_4BIT)
+        
+        # Prefill the static system prompts once so generations start after them
+        if settings.PREFIX_CACHE_ENABLED:
+            logger.info("Warming up prompt prefix cache")
+            start_time = time.perf_counter()
+            prefix_cache.warm_up(processor, model, self._qwen_vl_static_prompts())
+            self.load_times["prefix_cache"] = time.perf_counter() - start_time
+        
+        # Serve Qwen VL generations from one batching worker
+        if settings.INFERENCE_BATCHING_ENABLED:
+            inference_server.start(processor, model)
+        
+        # Calls stay off the event loop; the lane is widened to the batch size when the
+        # batching server coordinates access
+        qwen_vl_workers = settings.INFERENCE_MAX_BATCH_SIZE if settings.INFERENCE_BATCHING_ENABLED else 1
+        inference_executor.add_lane("qwen_vl", qwen_vl_workers)
+        inference_executor.assign(model, "qwen_vl")
+        
+        self.qwen_vision_processor, self.qwen_vision_chat_model = processor, model
+        
+        # Single-model mode: agent roles are served by the Qwen VL model
+        if settings.SINGLE_MODEL_MODE:
+            self._warm_up_response_schemas(QwenVLChatModel.for_role(processor, model, "router"))
+        return processor, model
+    
+    def _load_chat(self):
+        """Load the HuggingFace chat model and give it an inference lane"""
+        chat_model = build_hf_chat_model(deterministic=True)
+        inference_executor.add_lane("chat")
+        inference_executor.assign(chat_model, "chat")
+        self._warm_up_response_schemas(chat_model)
+        self.qwen_chat_model = chat_model
+        return chat_model
+    
+    def _load_reranker(self) -> CrossEncoderReranker:
+        """Load the cross-encoder reranker and give it an inference lane"""
+        reranker = CrossEncoderReranker.from_settings()
+        inference_executor.add_lane("reranker")
+        inference_executor.assign(reranker, "reranker")
+        self.reranker = reranker
+        return reranker
+    
+    def _on_evict(self, name: str, value, mode: str):
+        """Drop the references the manager and the shared caches hold to an evicted model"""
+        if name == "qwen_vl":
+            # Cached prefixes live on the model's device
+            prefix_cache.clear()
+            # Role adapters are rebuilt on the restored or reloaded model
+            for adapter in self._role_chat_models.values():
+                inference_executor.unassign(adapter)
+            self._role_chat_models.clear()
+        if mode != MODEL_UNLOADED:
+            return
+        items = value if isinstance(value, tuple) else (value,)
+        for item in items:
+            inference_executor.unassign(item)
+        if name == "embedding":
+            self.dense_embedding_model = self.dense_embedding_tokenizer = None
+        elif name == "qwen_vl":
+            inference_server.stop()
+            self.qwen_vision_processor = self.qwen_vision_chat_model = None
+        elif name == "chat":
+            self.qwen_chat_model = None
+        elif name == "reranker":
+            self.reranker = None
+    
+    def _on_restore(self, name: str, value):
+        """Rebuild the device-bound caches of a model moved back from CPU RAM"""
+        if name == "qwen_vl" and settings.PREFIX_CACHE_ENABLED:
+            prefix_cache.warm_up(*value, self._qwen_vl_static_prompts())
+    
+    @staticmethod
+    def _qwen_vl_static_prompts() -> list:
+        """Static system prompts generated on Qwen VL (agent prompts go to the chat model unless in single-model mode)"""
+        if settings.SINGLE_MODEL_MODE:
+            return STATIC_SYSTEM_PROMPTS + STATIC_AGENT_SYSTEM_PROMPTS
+        return STATIC_SYSTEM_PROMPTS
+    
+    def _warm_up_response_schemas(self, chat_model):
+        """Index the vocabulary for the JSON-constrained router and argument-extraction calls"""
+        start_time = time.perf_counter()
+        warm_up_response_schemas(chat_model, [AgentSupervisorRouter, ExtractVideoFileSchema])
+        self.load_times["constrained_decoding"] = time.perf_counter() - start_time
+    
+    def connect_qdrant(self):
+        """Initialize the Qdrant client pool (no-op if already connected)"""
+        if self.qdrant_pool is not None:
+            return
+        logger.info(f"Initializing Qdrant client pool ({settings.QDRANT_MODE} backend)")
+        pool = QdrantClientPool.from_settings()
+        pool.connect()
+        self.qdrant_pool = pool
+        logger.info("Qdrant client pool initialized")
+    
+    async def aconnect_qdrant(self):
+        """Async variant of connect_qdrant() that retries without blocking the event loop"""
+        async with self._qdrant_connect_lock:
+            if self.qdrant_pool is not None:
+                return
+            logger.info(f"Initializing Qdrant client pool ({settings.QDRANT_MODE} backend)")
+            pool = QdrantClientPool.from_settings()
+            await pool.aconnect()
+            self.qdrant_pool = pool
+            logger.info("Qdrant client pool initialized")
+    
     async def load_models(self):
         """
-        Load all required models at application startup.
-        This is called once during FastAPI startup event.
+        Load all eager models, independent ones concurrently.
+        Called during FastAPI startup; concurrent and later calls wait for the same loads.
         """
         if self._models_loaded:
             logger.info("Models already loaded, skipping...")
@@ -46,32 +197,14 @@ class ModelManager:
         logger.info("=" * 80)
         
         try:
-            # Load embedding model
-            logger.info(f"Loading dense embedding model: {settings.BGE_EMBEDDING_MODEL_NAME}")
-            self.dense_embedding_model, self.dense_embedding_tokenizer = load_embedding_model(
-                settings.BGE_EMBEDDING_MODEL_NAME
-            )
-            logger.info("Dense embedding model loaded")
+            await self.aconnect_qdrant()
             
-            # Load Qwen VL model
-            logger.info(f"Loading Qwen VL model: {settings.QWEN_VL_MODEL_NAME}")
-            self.qwen_vision_processor, self.qwen_vision_chat_model = load_qwen_vl_model(
-                settings.QWEN_VL_MODEL_NAME, 
-                settings.QWEN_VL_USE_4BIT
-            )
-            logger.info("Qwen VL model loaded")
-            
-            # Load chat model
-            logger.info("Loading HuggingFace chat model")
-            self.qwen_chat_model = build_hf_chat_model(deterministic=True)
-            logger.info("Chat model loaded")
-            
-            # Initialize Qdrant client
-            logger.info("Initializing Qdrant vector database client")
-            self.qdrant_client = get_qdrant_client()
-            logger.info("Qdrant client initialized")
+            start_time = time.perf_counter()
+            await self._registry.load_all()
+            wall_time = time.perf_counter() - start_time
             
             self._models_loaded = True
+            self._log_load_times(wall_time)
             logger.info("=" * 80)
             logger.info("ALL MODELS LOADED SUCCESSFULLY")
             logger.info("=" * 80)
@@ -80,33 +213,144 @@ class ModelManager:
             logger.error(f"Failed to load models: {str(e)}", exc_info=True)
             raise RuntimeError(f"Model loading failed: {str(e)}")
     
+    def _log_load_times(self, wall_time: float):
+        """Log the load time of each model against the wall-clock startup time"""
+        status = self._registry.get_status()
+        for name, model_status in status.items():
+            load_time = f"{model_status['load_time_s']:.1f}s" if model_status["load_time_s"] is not None else "-"
+            logger.info(f"  {name:<12} {model_status['state']:<8} {load_time:>8}{' (lazy)' if model_status['lazy'] else ''}")
+        for step, seconds in self.load_times.items():
+            logger.info(f"  {step:<21} {seconds:>8.1f}s (warm-up)")
+        summed = sum(model_status["load_time_s"] or 0.0 for model_status in status.values())
+        logger.info(f"Models loaded in {wall_time:.1f}s ({summed:.1f}s if loaded one after another)")
+    
     def get_embedding_model(self) -> Tuple:
-        """Get the loaded embedding model and tokenizer"""
-        if not self._models_loaded:
-            raise RuntimeError("Models not loaded. Call load_models() first.")
-        return self.dense_embedding_model, self.dense_embedding_tokenizer
+        """Get the embedding model and tokenizer (loaded on first use if lazy)"""
+        return self._registry.get("embedding")
+    
+    async def aget_embedding_model(self) -> Tuple:
+        """Async variant of get_embedding_model() that loads in a worker thread"""
+        return await self._registry.aget("embedding")
     
     def get_qwen_vision_model(self) -> Tuple:
-        """Get the loaded Qwen VL model and processor"""
-        if not self._models_loaded:
-            raise RuntimeError("Models not loaded. Call load_models() first.")
-        return self.qwen_vision_processor, self.qwen_vision_chat_model
+        """Get the Qwen VL model and processor (loaded on first use if lazy)"""
+        return self._registry.get("qwen_vl")
+    
+    async def aget_qwen_vision_model(self) -> Tuple:
+        """Async variant of get_qwen_vision_model() that loads in a worker thread"""
+        return await self._registry.aget("qwen_vl")
+    
+    def get_reranker(self) -> Optional[CrossEncoderReranker]:
+        """Get the cross-encoder reranker (None when RERANK_ENABLED is off)"""
+        if "reranker" not in self._registry:
+            return None
+        return self._registry.get("reranker")
+    
+    async def aget_reranker(self) -> Optional[CrossEncoderReranker]:
+        """Get the cross-encoder reranker, loading it in a worker thread on first use"""
+        if "reranker" not in self._registry:
+            return None
+        return await self._registry.aget("reranker")
+    
+    def get_qdrant_pool(self) -> QdrantClientPool:
+        """Get the Qdrant client pool"""
+        self.connect_qdrant()
+        return self.qdrant_pool
     
     def get_qdrant_client(self):
-        """Get the Qdrant client"""
-        if not self._models_loaded:
-            raise RuntimeError("Models not loaded. Call load_models() first.")
-        return self.qdrant_client
+        """Get a pooled Qdrant client"""
+        return self.get_qdrant_pool().get_client()
+    
+    def get_async_qdrant_client(self):
+        """
+        Get a pooled async Qdrant client once the pool is connected
+        
+        Raises:
+            RuntimeError: If the pool is not connected; connecting from here would block
+                          the event loop, use aget_async_qdrant_client() instead
+        """
+        if self.qdrant_pool is None:
+            raise RuntimeError("Qdrant client pool is not connected. Await aget_async_qdrant_client() or aconnect_qdrant() first.")
+        return self.qdrant_pool.get_async_client()
+    
+    async def aget_async_qdrant_client(self):
+        """Get a pooled async Qdrant client, connecting the pool without blocking the event loop"""
+        await self.aconnect_qdrant()
+        return self.qdrant_pool.get_async_client()
+    
+    def get_qwen_chat_model(self, role: str = "general"):
+        """
+        Get the chat model for an agent role
+        
+        Args:
+            role: Agent role ('router', 'argument_extraction', 'summary', 'report' or 'general');
+                  selects the generation parameters in single-model mode
+        
+        Returns:
+            Chat model (the shared HuggingFace chat model, or a Qwen VL adapter in single-model mode)
+        """
+        if not settings.SINGLE_MODEL_MODE:
+            return self._registry.get("chat")
+        # Resolve Qwen VL first: it restores or reloads an evicted model, which drops stale adapters
+        qwen_vision_processor, qwen_vision_chat_model = self.get_qwen_vision_model()
+        return self._role_chat_models.get(role) or self._add_role_chat_model(role, qwen_vision_processor, qwen_vision_chat_model)
+    
+    async def aget_qwen_chat_model(self, role: str = "general"):
+        """Async variant of get_qwen_chat_model() that loads in a worker thread"""
+        if not settings.SINGLE_MODEL_MODE:
+            return await self._registry.aget("chat")
+        qwen_vision_processor, qwen_vision_chat_model = await self.aget_qwen_vision_model()
+        return self._role_chat_models.get(role) or self._add_role_chat_model(role, qwen_vision_processor, qwen_vision_chat_model)
     
-    def get_qwen_chat_model(self):
-        """Get the chat model"""
-        if not self._models_loaded:
-            raise RuntimeError("Models not loaded. Call load_models() first.")
-        return self.qwen_chat_model
+    def _add_role_chat_model(self, role: str, qwen_vision_processor, qwen_vision_chat_model) -> QwenVLChatModel:
+        """Cache the Qwen VL adapter of an agent role and route its calls to the Qwen VL lane"""
+        adapter = QwenVLChatModel.for_role(qwen_vision_processor, qwen_vision_chat_model, role)
+        inference_executor.assign(adapter, "qwen_vl")
+        self._role_chat_models[role] = adapter
+        return adapter
+    
+    def lease(self, *names: str) -> contextlib.AbstractContextManager:
+        """
+        Keep models resident while a request holds references to them
+        
+        Args:
+            names: Registry names ('embedding', 'qwen_vl', 'chat', 'reranker'); 'chat' pins
+                   Qwen VL in single-model mode, where it serves the agent roles, and models
+                   disabled by the settings are ignored
+        
+        Returns:
+            Context manager pinning the models until it exits
+        """
+        if settings.SINGLE_MODEL_MODE:
+            names = tuple("qwen_vl" if name == "chat" else name for name in names)
+        return self._registry.lease(*names)
     
     @property
     def is_loaded(self) -> bool:
-        """Check if models are loaded"""
+        """Check if every eager model is loaded"""
         return self._models_loaded
+    
+    def get_residency_status(self) -> dict:
+        """
+        Get the memory residency of the models.
+        
+        Returns:
+            dict: Budget and resident memory, eviction count, and per-model state, footprint,
+                  device, priority, idle time, loads, restores and evictions
+        """
+        return self._registry.get_residency_status()
+    
+    def get_status(self) -> dict:
+        """
+        Get the lifecycle state of the models.
+        
+        Returns:
+            dict: Whether every eager model is loaded, per-model state and load time, and warm-up times
+        """
+        return {
+            "loaded": self._models_loaded,
+            "models": self._registry.get_status(),
+            "warm_up_s": {step: round(seconds, 3) for step, seconds in self.load_times.items()},
+        }
 
 model_manager = ModelManager()
@@ -0,0 +1,354 @@
+"""
+Model Residency
+Keeps the loaded models within a memory budget: cold models are offloaded to CPU
+RAM or unloaded (lowest priority first, then least recently used) and are brought
+back transparently on their next use
+"""
+import gc
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+import torch
+from config.service_config import settings
+from src.llm.executor import inference_executor
+from src.llm.model_lifecycle import ModelSlot, MODEL_READY, MODEL_OFFLOADED, MODEL_UNLOADED
+
+logger = logging.getLogger(__name__)
+
+def iter_torch_modules(value: Any, depth: int = 0) -> Iterator[torch.nn.Module]:
+    """
+    Find the torch modules held by a loaded model value.
+
+    Follows tuples (model, tokenizer) and the model / llm / pipeline attributes of
+    wrappers such as ChatHuggingFace, transformers pipelines and the reranker.
+
+    Args:
+        value: Loader result
+        depth: Recursion depth (internal)
+
+    Yields:
+        torch.nn.Module: Each module found
+    """
+    if isinstance(value, torch.nn.Module):
+        yield value
+        return
+    if value is None or depth >= 4:
+        return
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            yield from iter_torch_modules(item, depth + 1)
+        return
+    for attribute in ("model", "llm", "pipeline"):
+        child = getattr(value, attribute, None)
+        if child is not None and child is not value:
+            yield from iter_torch_modules(child, depth + 1)
+
+def _unique_modules(value: Any) -> list[torch.nn.Module]:
+    modules = {}
+    for module in iter_torch_modules(value):
+        modules.setdefault(id(module), module)
+    return list(modules.values())
+
+def _footprint_bytes(modules: list[torch.nn.Module]) -> int:
+    """Bytes of the parameters and buffers of the modules"""
+    tensors = {}
+    for module in modules:
+        for tensor in [*module.parameters(), *module.buffers()]:
+            tensors.setdefault(id(tensor), tensor)
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors.values())
+
+def _device_of(modules: list[torch.nn.Module]) -> Optional[torch.device]:
+    for module in modules:
+        for parameter in module.parameters():
+            return parameter.device
+    return None
+
+def _can_offload(modules: list[torch.nn.Module]) -> bool:
+    """Quantized models and models dispatched across several devices cannot be moved as a whole"""
+    for module in modules:
+        if getattr(module, "is_loaded_in_4bit", False) or getattr(module, "is_loaded_in_8bit", False):
+            return False
+        if len(set(getattr(module, "hf_device_map", {}).values())) > 1:
+            return False
+    return True
+
+class _Residency:
+    """Footprint, placement and counters of one model"""
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.footprint_bytes = 0
+        self.device: Optional[torch.device] = None
+        self.value_id: Optional[int] = None
+        self.last_used = 0.0
+        self.pins = 0
+        self.loads = 0
+        self.restores = 0
+        self.evictions = {MODEL_OFFLOADED: 0, MODEL_UNLOADED: 0}
+
+class ModelResidencyManager:
+    """
+    Evicts cold models when the resident models exceed a memory budget.
+
+    The footprint of a model is the size of its parameters and buffers, measured
+    when it loads. When a load or restore would exceed the budget, idle models are
+    evicted lowest priority first, then least recently used. An evicted model is
+    offloaded to CPU RAM when it sits on an accelerator and can be moved as a whole
+    (not quantized, not split across devices); otherwise it is unloaded. Offloaded
+    models move back on their next use, unloaded ones are loaded again.
+
+    A model is idle when no request has it pinned (see ModelRegistry.lease), its
+    inference lane has no queued or running call and it has not been handed out
+    for min_idle_s seconds.
+
+    Attributes:
+        budget_bytes: Memory the resident models may occupy (0 = unlimited)
+        offload_to_cpu: Prefer offloading to CPU RAM over unloading
+        min_idle_s: Models used more recently are never evicted
+        priorities: Priority per model name (higher stays resident longer)
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 0,
+        offload_to_cpu: bool = True,
+        min_idle_s: float = 30.0,
+        priorities: Optional[dict[str, int]] = None,
+        on_evict: Optional[Callable[[str, Any, str], None]] = None,
+        on_restore: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Initialize the residency manager.
+
+        Args:
+            budget_bytes: Memory the resident models may occupy (0 = unlimited)
+            offload_to_cpu: Prefer offloading to CPU RAM over unloading
+            min_idle_s: Models used more recently are never evicted
+            priorities: Priority per model name (higher stays resident longer, default 0)
+            on_evict: Called with (name, value, 'offloaded' | 'unloaded') after an eviction,
+                      to drop references held outside the registry
+            on_restore: Called with (name, value) after an offloaded model moved back
+        """
+        self.budget_bytes = budget_bytes
+        self.offload_to_cpu = offload_to_cpu
+        self.min_idle_s = min_idle_s
+        self.priorities = priorities or {}
+        self.on_evict = on_evict
+        self.on_restore = on_restore
+        self._models: dict[str, _Residency] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, on_evict=None, on_restore=None) -> "ModelResidencyManager":
+        """Build a residency manager from the MODEL_* settings"""
+        return cls(
+            budget_bytes=int(settings.MODEL_MEMORY_BUDGET_GB * 1024 ** 3),
+            offload_to_cpu=settings.MODEL_OFFLOAD_TO_CPU,
+            min_idle_s=settings.MODEL_EVICTION_MIN_IDLE_S,
+            priorities=settings.MODEL_PRIORITIES,
+            on_evict=on_evict,
+            on_restore=on_restore,
+        )
+
+    def _record(self, name: str) -> _Residency:
+        if name not in self._models:
+            self._models[name] = _Residency(self.priorities.get(name, 0))
+        return self._models[name]
+
+    def prepare(self, slot: ModelSlot, slots: dict[str, ModelSlot]) -> None:
+        """
+        Make room for a model about to be loaded or restored, and restore it if offloaded.
+
+        Args:
+            slot: Slot of the model about to be used
+            slots: Every slot of the registry
+        """
+        with self._lock:
+            record = self._record(slot.name)
+            # The footprint is unknown before the first load
+            self._enforce(slots, keep=slot.name, incoming=record.footprint_bytes)
+
+        with slot.lock:
+            if slot.state != MODEL_OFFLOADED:
+                return
+            start_time = time.perf_counter()
+            for module in _unique_modules(slot.value):
+                module.to(record.device)
+            slot.state = MODEL_READY
+            record.restores += 1
+            logger.info(f"Model '{slot.name}' restored to {record.device} in {time.perf_counter() - start_time:.1f}s")
+        if self.on_restore:
+            self.on_restore(slot.name, slot.value)
+
+    def pin(self, name: str) -> None:
+        """Keep a model resident until the matching unpin(); pins nest"""
+        with self._lock:
+            self._record(name).pins += 1
+
+    def unpin(self, name: str) -> None:
+        """Release a pin taken with pin()"""
+        with self._lock:
+            record = self._record(name)
+            record.pins = max(0, record.pins - 1)
+
+    def mark_used(self, slot: ModelSlot, slots: dict[str, ModelSlot]) -> bool:
+        """
+        Mark a ready model as used when that needs no measuring and no eviction.
+
+        Cheap enough for the event loop; touch() may move or free models.
+
+        Args:
+            slot: Slot of the model handed out
+            slots: Every slot of the registry
+
+        Returns:
+            bool: False if the model must go through touch() instead
+        """
+        with self._lock:
+            record = self._record(slot.name)
+            if slot.state != MODEL_READY or record.value_id != id(slot.value):
+                return False
+            if self.budget_bytes and self._resident_bytes(slots) > self.budget_bytes:
+                return False
+            record.last_used = time.monotonic()
+            return True
+
+    def touch(self, slot: ModelSlot, slots: dict[str, ModelSlot]) -> None:
+        """
+        Mark a ready model as used, measure it after a (re)load and enforce the budget.
+
+        Args:
+            slot: Slot of the model handed out
+            slots: Every slot of the registry
+        """
+        with self._lock:
+            record = self._record(slot.name)
+            record.last_used = time.monotonic()
+            if record.value_id != id(slot.value):
+                modules = _unique_modules(slot.value)
+                record.value_id = id(slot.value)
+                record.footprint_bytes = _footprint_bytes(modules)
+                record.device = _device_of(modules)
+                record.loads += 1
+                logger.info(f"Model '{slot.name}' resident: {record.footprint_bytes / 1024 ** 2:.0f} MB on {record.device}")
+            self._enforce(slots, keep=slot.name)
+
+    def _resident_bytes(self, slots: dict[str, ModelSlot]) -> int:
+        return sum(
+            self._models[name].footprint_bytes
+            for name, slot in slots.items()
+            if slot.state == MODEL_READY and name in self._models
+        )
+
+    def _is_idle(self, name: str, slot: ModelSlot) -> bool:
+        record = self._models[name]
+        if record.pins or time.monotonic() - record.last_used < self.min_idle_s:
+            return False
+        items = slot.value if isinstance(slot.value, tuple) else (slot.value,)
+        return not any(inference_executor.is_busy(item) for item in items)
+
+    def _enforce(self, slots: dict[str, ModelSlot], keep: str, incoming: int = 0) -> None:
+        """Evict idle models until the resident models and the incoming one fit the budget"""
+        if not self.budget_bytes:
+            return
+        while self._resident_bytes(slots) + incoming > self.budget_bytes:
+            candidates = [
+                (self._models[name].priority, self._models[name].last_used, name)
+                for name, slot in slots.items()
+                if name != keep and slot.state == MODEL_READY and name in self._models and self._is_idle(name, slot)
+            ]
+            if not candidates:
+                logger.warning(
+                    f"Resident models use {(self._resident_bytes(slots) + incoming) / 1024 ** 2:.0f} MB, over the "
+                    f"{self.budget_bytes / 1024 ** 2:.0f} MB budget, and none is idle enough to evict"
+                )
+                return
+            _, _, victim = min(candidates)
+            if not self._evict(slots[victim]):
+                return
+
+    def evict_idle(self, slots: dict[str, ModelSlot]) -> list[str]:
+        """
+        Evict every idle model, whatever the budget.
+
+        For processes that use their models only now and then and should not hold
+        them in between (the transcription MCP server).
+
+        Args:
+            slots: Every slot of the registry
+
+        Returns:
+            list[str]: Names of the evicted models
+        """
+        evicted = []
+        with self._lock:
+            for name, slot in slots.items():
+                if slot.state == MODEL_READY and name in self._models and self._is_idle(name, slot) and self._evict(slot):
+                    evicted.append(name)
+        return evicted
+
+    def _evict(self, slot: ModelSlot) -> bool:
+        """Offload or unload a model; False if it is being loaded by another thread"""
+        if not slot.lock.acquire(blocking=False):
+            return False
+        try:
+            record = self._models[slot.name]
+            value = slot.value
+            modules = _unique_modules(value)
+            device = record.device
+            if self.offload_to_cpu and device is not None and device.type != "cpu" and _can_offload(modules):
+                for module in modules:
+                    module.to("cpu")
+                slot.state = MODEL_OFFLOADED
+            else:
+                slot.value, slot.state = None, MODEL_UNLOADED
+                record.value_id = None
+            record.evictions[slot.state] += 1
+            mode = slot.state
+        finally:
+            slot.lock.release()
+
+        logger.info(f"Model '{slot.name}' {mode} ({record.footprint_bytes / 1024 ** 2:.0f} MB, priority {record.priority})")
+        if self.on_evict:
+            self.on_evict(slot.name, value, mode)
+        del value, modules
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return True
+
+    def get_status(self, slots: dict[str, ModelSlot]) -> dict:
+        """
+        Get the residency state of every model.
+
+        Args:
+            slots: Every slot of the registry
+
+        Returns:
+            dict: Budget and resident memory, and per model: state, footprint, device,
+                  priority, seconds since last use, pins, loads, restores and evictions
+        """
+        with self._lock:
+            now = time.monotonic()
+            models = {}
+            for name, slot in slots.items():
+                record = self._models.get(name)
+                models[name] = {
+                    "state": slot.state,
+                    "footprint_mb": round(record.footprint_bytes / 1024 ** 2, 1) if record else None,
+                    "device": str(record.device) if record and record.device is not None else None,
+                    "priority": record.priority if record else self.priorities.get(name, 0),
+                    "idle_s": round(now - record.last_used, 1) if record and record.last_used else None,
+                    "pins": record.pins if record else 0,
+                    "loads": record.loads if record else 0,
+                    "restores": record.restores if record else 0,
+                    "evictions": dict(record.evictions) if record else {MODEL_OFFLOADED: 0, MODEL_UNLOADED: 0},
+                }
+            return {
+                "budget_mb": round(self.budget_bytes / 1024 ** 2, 1) if self.budget_bytes else None,
+                "resident_mb": round(self._resident_bytes(slots) / 1024 ** 2, 1),
+                "offload_to_cpu": self.offload_to_cpu,
+                "evictions": sum(sum(record.evictions.values()) for record in self._models.values()),
+                "models": models,
+            }
@@ -0,0 +1,169 @@
+"""
+Qwen-VL Chat Adapter
+LangChain chat model over the loaded Qwen2.5-VL, so text-only agent roles can
+share its weights instead of loading a second model
+"""
+import logging
+import threading
+from typing import Any, Iterator, Optional
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from transformers import LogitsProcessorList, TextIteratorStreamer
+from src.llm.constrained_decoding import JsonSchemaLogitsProcessor
+from src.llm.inference import generate_qwen_response
+
+logger = logging.getLogger(__name__)
+
+# Generation parameters per agent role in single-model mode
+#   router / argument_extraction: short, greedy structured output
+#   summary / report:             long, greedy output over the whole video
+#   general:                      free-form answers
+ROLE_GENERATION_PARAMS = {
+    "router": dict(max_new_tokens=256, temperature=0.0, top_p=1.0),
+    "argument_extraction": dict(max_new_tokens=256, temperature=0.0, top_p=1.0),
+    "summary": dict(max_new_tokens=2048, temperature=0.0, top_p=1.0),
+    "report": dict(max_new_tokens=4096, temperature=0.0, top_p=1.0),
+    "general": dict(max_new_tokens=1024, temperature=0.0, top_p=1.0),
+}
+
+_ROLE_NAMES = {"human": "user", "ai": "assistant", "system": "system", "tool": "tool"}
+
+def to_qwen_messages(messages: list[BaseMessage]) -> list[dict]:
+    """
+    Convert LangChain messages to the chat format of the Qwen processor.
+
+    Args:
+        messages: LangChain messages
+
+    Returns:
+        list[dict]: Messages with 'role' and 'content' keys
+    """
+    return [
+        {"role": _ROLE_NAMES.get(message.type, "user"), "content": message.content}
+        for message in messages
+    ]
+
+class QwenVLChatModel(BaseChatModel):
+    """
+    Chat model that generates with an already loaded Qwen2.5-VL.
+
+    Attributes:
+        processor: Qwen AutoProcessor
+        model: Loaded Qwen2.5-VL model
+        role: Agent role the generation parameters were taken from
+        max_new_tokens: Maximum tokens to generate
+        temperature: Sampling temperature, 0 for greedy
+        top_p: Nucleus sampling parameter
+    """
+
+    processor: Any
+    model: Any
+    role: str = "general"
+    max_new_tokens: int = 1024
+    temperature: float = 0.0
+    top_p: float = 1.0
+
+    @classmethod
+    def for_role(cls, processor, model, role: str) -> "QwenVLChatModel":
+        """
+        Build an adapter with the generation parameters of an agent role.
+
+        Args:
+            processor: Qwen AutoProcessor
+            model: Loaded Qwen2.5-VL model
+            role: Key in ROLE_GENERATION_PARAMS
+
+        Returns:
+            QwenVLChatModel: Adapter sharing the given model weights
+
+        Raises:
+            ValueError: If the role is unknown
+        """
+        if role not in ROLE_GENERATION_PARAMS:
+            raise ValueError(f"Unknown agent role '{role}'. Available: {', '.join(ROLE_GENERATION_PARAMS)}")
+        return cls(processor=processor, model=model, role=role, **ROLE_GENERATION_PARAMS[role])
+
+    @property
+    def _llm_type(self) -> str:
+        return "qwen-vl-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"role": self.role, "max_new_tokens": self.max_new_tokens, "temperature": self.temperature, "top_p": self.top_p}
+
+    def _logits_processor(self, kwargs: dict) -> Optional[LogitsProcessorList]:
+        """JSON constraint for a call bound with response_schema=<Pydantic model>"""
+        response_schema = kwargs.get("response_schema")
+        if response_schema is None:
+            return None
+        return LogitsProcessorList([JsonSchemaLogitsProcessor(response_schema, self.processor.tokenizer)])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        response = generate_qwen_response(
+            self.processor,
+            self.model,
+            to_qwen_messages(messages),
+            max_new_tokens=kwargs.get("max_new_tokens", self.max_new_tokens),
+            temperature=kwargs.get("temperature", self.temperature),
+            top_p=kwargs.get("top_p", self.top_p),
+            logits_processor=self._logits_processor(kwargs),
+        )
+        for stop_sequence in stop or []:
+            response = response.split(stop_sequence, 1)[0]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        streamer = TextIteratorStreamer(self.processor.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        logits_processor = self._logits_processor(kwargs)
+        errors = []
+
+        def generate():
+            try:
+                generate_qwen_response(
+                    self.processor,
+                    self.model,
+                    to_qwen_messages(messages),
+                    max_new_tokens=kwargs.get("max_new_tokens", self.max_new_tokens),
+                    temperature=kwargs.get("temperature", self.temperature),
+                    top_p=kwargs.get("top_p", self.top_p),
+                    streamer=streamer,
+                    logits_processor=logits_processor,
+                )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        threading.Thread(target=generate, daemon=True).start()
+
+        # Emit text up to the first stop sequence; the rest of the generation is drained
+        text, emitted, stopped = "", 0, False
+        for fragment in streamer:
+            if stopped:
+                continue
+            text = (text + fragment).lstrip()
+            for stop_sequence in stop or []:
+                if stop_sequence in text:
+                    text, stopped = text.split(stop_sequence, 1)[0], True
+            if len(text) > emitted:
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=text[emitted:]))
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+                emitted = len(text)
+
+        if errors:
+            raise errors[0]
@@ -38,3 +38,18 @@ class ExtractVideoFileSchema(BaseModel):
         ..., 
         description="The path to the input video file (e.g., '../data/weekly_meeting.mp4')."
     )
+
+class VideoIngestionJob(BaseModel):
+    """
+    Structured video ingestion request, resolved once and shared by the frame and audio workflows.
+    
+    Attributes:
+        video_file: The path to the input video file (e.g., 'data/weekly_meeting.mp4').
+        frame_rate: Frames to extract per second.
+        frame_group_seconds: Duration in seconds of each frame group.
+        transcript_chunk_seconds: Length in seconds of each transcript chunk.
+    """
+    video_file: str = Field(..., description="The path to the input video file (e.g., 'data/weekly_meeting.mp4').")
+    frame_rate: float = Field(0.25, gt=0, description="Frames to extract per second.")
+    frame_group_seconds: int = Field(5, gt=0, description="Duration in seconds of each frame group.")
+    transcript_chunk_seconds: int = Field(5, gt=0, description="Length in seconds of each transcript chunk.")
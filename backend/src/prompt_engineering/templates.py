@@ -409,3 +409,20 @@ This meeting covered project status updates, technical architecture decisions, a
 ## OUTPUT FORMAT:
 Return ONLY the markdown content - no preamble, no code fences around the entire document, just the pure markdown report.
 """
+
+# System prompts whose chat-template prefix is identical on every call (for RAG, the
+# instructions before the retrieved context); their KV caches are prefilled at warm-up.
+# These are always generated on Qwen VL
+STATIC_SYSTEM_PROMPTS = [
+    RAG_QA_PROMPT.split("{doc_context}")[0],
+    TRANSCRIPT_TEXT_SUMMARIZER_PROMPT,
+    TRANSCRIPT_IMG_SUMMARIZER_PROMPT,
+]
+
+# Agent system prompts; Qwen VL serves them only in single-model mode
+STATIC_AGENT_SYSTEM_PROMPTS = [
+    AGENT_SUPERVISOR_PROMPT,
+    ARGUMENT_EXTRACTION_PROMPT,
+    SUMMARY_PROMPT,
+    REPORT_GENERATION_PROMPT,
+]
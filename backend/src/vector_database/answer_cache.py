@@ -0,0 +1,156 @@
+"""
+Semantic Answer Cache
+Reuses generated answers for near-duplicate questions about the same video
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+import numpy as np
+from config.service_config import settings
+from src.vector_database.retrieval_cache import retrieval_cache
+
+logger = logging.getLogger(__name__)
+
+class CachedAnswer(NamedTuple):
+    """Answer stored for a previously asked question"""
+    question: str
+    answer: str
+    collection_version: int
+    expires_at: float
+
+class SemanticAnswerCache:
+    """
+    Per-collection cache of answered questions matched by embedding similarity.
+
+    A lookup embeds nothing itself: callers pass the normalized dense embedding
+    of the question, which is compared by cosine similarity with every cached
+    question of the collection. Entries expire after a TTL and are ignored once
+    the collection version in the retrieval cache changes (re-indexing or
+    deletion).
+
+    Attributes:
+        similarity_threshold: Minimum cosine similarity for a hit
+        ttl_s: Entry lifetime in seconds
+        max_entries_per_collection: Cached questions kept per collection (LRU)
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl_s: float = 3600.0, max_entries_per_collection: int = 256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_s: Entry lifetime in seconds
+            max_entries_per_collection: Cached questions kept per collection
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_s = ttl_s
+        self.max_entries_per_collection = max_entries_per_collection
+        # collection -> OrderedDict[normalized question -> (embedding, CachedAnswer)]
+        self._collections: dict[str, OrderedDict[str, tuple[np.ndarray, CachedAnswer]]] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+
+    def _prune(self, collection_name: str, entries: OrderedDict) -> None:
+        """Drop expired entries and entries of an outdated collection version"""
+        now = time.time()
+        version = retrieval_cache.get_version(collection_name)
+        stale = [key for key, (_, cached) in entries.items() if cached.expires_at <= now or cached.collection_version != version]
+        for key in stale:
+            del entries[key]
+
+    def lookup(self, collection_name: str, question_embedding: list[float]) -> Optional[CachedAnswer]:
+        """
+        Find a cached answer to a near-duplicate question.
+
+        Args:
+            collection_name: Video collection name
+            question_embedding: L2-normalized dense embedding of the question
+
+        Returns:
+            CachedAnswer: Best match above the similarity threshold, or None
+        """
+        with self._lock:
+            entries = self._collections.get(collection_name)
+            if entries:
+                self._prune(collection_name, entries)
+            if not entries:
+                self._misses += 1
+                return None
+
+            keys = list(entries)
+            matrix = np.stack([entries[key][0] for key in keys])
+            similarities = matrix @ np.asarray(question_embedding, dtype=np.float32)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self._misses += 1
+                return None
+
+            entries.move_to_end(keys[best])
+            self._hits += 1
+            cached = entries[keys[best]][1]
+        logger.info(f"Semantic answer cache hit for '{collection_name}' (similarity {similarities[best]:.3f} to '{cached.question}')")
+        return cached
+
+    def store(self, collection_name: str, question: str, question_embedding: list[float], answer: str, collection_version: int) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            collection_name: Video collection name
+            question: The user question
+            question_embedding: L2-normalized dense embedding of the question
+            answer: Generated answer
+            collection_version: retrieval_cache.get_version() read before retrieval; the
+                                answer is not cached if the collection changed since
+        """
+        if collection_version != retrieval_cache.get_version(collection_name):
+            logger.debug(f"'{collection_name}' changed while answering, not caching the answer")
+            return
+        cached = CachedAnswer(
+            question=question,
+            answer=answer,
+            collection_version=collection_version,
+            expires_at=time.time() + self.ttl_s,
+        )
+        with self._lock:
+            entries = self._collections.setdefault(collection_name, OrderedDict())
+            key = retrieval_cache.normalize_query(question)
+            entries[key] = (np.asarray(question_embedding, dtype=np.float32), cached)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries_per_collection:
+                entries.popitem(last=False)
+
+    def invalidate(self, collection_name: str) -> None:
+        """Drop every cached answer of a collection"""
+        with self._lock:
+            self._collections.pop(collection_name, None)
+
+    def get_metrics(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            dict: Cached question count, collections, hit/miss counters and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": sum(len(entries) for entries in self._collections.values()),
+                "collections": len(self._collections),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "similarity_threshold": self.similarity_threshold,
+            }
+
+answer_cache = SemanticAnswerCache(
+    similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    ttl_s=settings.ANSWER_CACHE_TTL_S,
+    max_entries_per_collection=settings.ANSWER_CACHE_MAX_ENTRIES,
+)
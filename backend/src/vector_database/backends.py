@@ -0,0 +1,111 @@
+"""
+Vector Store Backends
+Selects where the Qdrant collections live: a Qdrant server, or an embedded
+in-process store for single-node and offline deployments
+"""
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional
+from config.service_config import settings
+
+logger = logging.getLogger(__name__)
+
+class BackendCapabilities(NamedTuple):
+    """
+    What a vector-store backend supports beyond the common client API.
+
+    Attributes:
+        remote: Requests cross the network (health checks and reconnects apply)
+        payload_indexes: Payload indexes are built (embedded mode scans payloads instead)
+        parallel_upload: upload_points() can fan out over worker processes
+        shared_sync_async: Sync and async clients can be open on the same data at once
+        multi_process: Several processes (API, MCP servers, CLI scripts) can open the store
+    """
+    remote: bool
+    payload_indexes: bool
+    parallel_upload: bool
+    shared_sync_async: bool
+    multi_process: bool
+
+# Every backend is driven through the qdrant-client API, so retrieval, summaries
+# and indexing run unchanged; embedded modes (local path / in-memory) execute the
+# same hybrid queries, RRF fusion and filters in-process.
+BACKENDS = {
+    "server": BackendCapabilities(remote=True, payload_indexes=True, parallel_upload=True, shared_sync_async=True, multi_process=True),
+    "local": BackendCapabilities(remote=False, payload_indexes=False, parallel_upload=False, shared_sync_async=False, multi_process=False),
+    "memory": BackendCapabilities(remote=False, payload_indexes=False, parallel_upload=False, shared_sync_async=False, multi_process=False),
+}
+
+def get_backend_mode(mode: Optional[str] = None) -> str:
+    """
+    Validate a backend mode.
+
+    Args:
+        mode: 'server', 'local' or 'memory' (default: settings.QDRANT_MODE)
+
+    Returns:
+        str: The backend mode
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = mode or settings.QDRANT_MODE
+    if mode not in BACKENDS:
+        raise ValueError(f"Unknown Qdrant mode '{mode}'. Available: {', '.join(BACKENDS)}")
+    return mode
+
+def get_backend_capabilities(mode: Optional[str] = None) -> BackendCapabilities:
+    """
+    Get the capabilities of a backend.
+
+    Args:
+        mode: Backend mode (default: settings.QDRANT_MODE)
+
+    Returns:
+        BackendCapabilities: Capability flags of the backend
+    """
+    return BACKENDS[get_backend_mode(mode)]
+
+def build_client_kwargs(
+    mode: Optional[str] = None,
+    url: Optional[str] = None,
+    prefer_grpc: Optional[bool] = None,
+    api_key: Optional[str] = None,
+    timeout: Optional[int] = None,
+    path: Optional[str] = None,
+) -> dict:
+    """
+    Build QdrantClient/AsyncQdrantClient constructor arguments for a backend.
+
+    Args:
+        mode: Backend mode (default: settings.QDRANT_MODE)
+        url: Server URL, 'server' mode only (default: settings.QDRANT_URL)
+        prefer_grpc: Use gRPC, 'server' mode only (default: settings.QDRANT_PREFER_GRPC)
+        api_key: Server API key, 'server' mode only (default: settings.QDRANT_API_KEY)
+        timeout: Request timeout, 'server' mode only (default: settings.QDRANT_TIMEOUT)
+        path: Storage folder, 'local' mode only (default: settings.QDRANT_LOCAL_PATH)
+
+    Returns:
+        dict: Keyword arguments for the client constructor
+    """
+    mode = get_backend_mode(mode)
+    if mode == "server":
+        return dict(
+            url=url or settings.QDRANT_URL,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+            api_key=api_key if api_key is not None else settings.QDRANT_API_KEY,
+            timeout=timeout or settings.QDRANT_TIMEOUT,
+        )
+    if mode == "local":
+        path = Path(path or settings.QDRANT_LOCAL_PATH)
+        path.mkdir(parents=True, exist_ok=True)
+        return dict(path=str(path))
+    return dict(location=":memory:")
+
+def describe_backend(client_kwargs: dict) -> str:
+    """Human-readable location of a backend for logs"""
+    if "url" in client_kwargs:
+        return client_kwargs["url"]
+    if "path" in client_kwargs:
+        return f"local storage at {client_kwargs['path']}"
+    return "in-memory storage"
@@ -0,0 +1,301 @@
+"""
+Qdrant Client Pool
+Shares long-lived Qdrant clients (and their gRPC channels) across requests,
+with health checking and reconnect with backoff
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Optional
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from config.service_config import settings
+from src.vector_database.backends import build_client_kwargs, describe_backend, get_backend_capabilities
+
+logger = logging.getLogger(__name__)
+
+class QdrantClientPool:
+    """
+    Fixed-size pool of sync and async Qdrant clients handed out round-robin.
+
+    Clients are created once and reused, so steady-state requests pay no
+    connection setup. gRPC channels multiplex concurrent calls, so a small pool
+    is enough; more than one client only spreads load over several channels.
+
+    Embedded backends ('local', 'memory') hold the store in-process and lock it
+    to a single client, so the pool keeps exactly one async client and skips
+    health checks; get_client() is unavailable there.
+
+    Attributes:
+        url: Qdrant server URL
+        mode: Backend mode ('server', 'local' or 'memory')
+        pool_size: Number of sync and async clients kept open
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefer_grpc: bool = True,
+        api_key: Optional[str] = None,
+        timeout: Optional[int] = None,
+        pool_size: int = 1,
+        health_check_interval_s: float = 30.0,
+        reconnect_max_retries: int = 5,
+        reconnect_backoff_s: float = 0.5,
+        mode: str = "server",
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize the pool without connecting.
+
+        Args:
+            url: Qdrant server URL
+            prefer_grpc: Use gRPC instead of REST where supported
+            api_key: Qdrant API key (None for unsecured servers)
+            timeout: Request timeout in seconds
+            pool_size: Number of sync and async clients to keep open
+            health_check_interval_s: Seconds between background health checks
+            reconnect_max_retries: Connection attempts before giving up
+            reconnect_backoff_s: Initial backoff between attempts, doubled each retry
+            mode: Backend mode ('server', 'local' or 'memory')
+            path: Storage folder for the 'local' backend
+        """
+        self.url = url
+        self.mode = mode
+        self.path = path
+        self.capabilities = get_backend_capabilities(mode)
+        self.prefer_grpc = prefer_grpc
+        self.api_key = api_key
+        self.timeout = timeout
+        self.pool_size = max(1, pool_size) if self.capabilities.shared_sync_async else 1
+        self.health_check_interval_s = health_check_interval_s
+        self.reconnect_max_retries = max(1, reconnect_max_retries)
+        self.reconnect_backoff_s = reconnect_backoff_s
+
+        self._clients: list[QdrantClient] = []
+        self._async_clients: list[AsyncQdrantClient] = []
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._connections_opened = 0
+        self._reconnects = 0
+        self._health_check_failures = 0
+        self._healthy = False
+        self._last_health_check: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "QdrantClientPool":
+        """Build a pool from the QDRANT_* settings"""
+        return cls(
+            url=settings.QDRANT_URL,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            api_key=settings.QDRANT_API_KEY,
+            timeout=settings.QDRANT_TIMEOUT,
+            pool_size=settings.QDRANT_POOL_SIZE,
+            health_check_interval_s=settings.QDRANT_HEALTH_CHECK_INTERVAL_S,
+            reconnect_max_retries=settings.QDRANT_RECONNECT_MAX_RETRIES,
+            reconnect_backoff_s=settings.QDRANT_RECONNECT_BACKOFF_S,
+            mode=settings.QDRANT_MODE,
+            path=str(settings.QDRANT_LOCAL_PATH),
+        )
+
+    def _client_kwargs(self) -> dict:
+        return build_client_kwargs(self.mode, self.url, self.prefer_grpc, self.api_key, self.timeout, self.path)
+
+    def _open_clients(self) -> tuple[list[QdrantClient], list[AsyncQdrantClient]]:
+        """Create a full set of clients and verify the server answers"""
+        if not self.capabilities.shared_sync_async:
+            # Opening the embedded store takes its lock, which is the only check needed
+            return [], [AsyncQdrantClient(**self._client_kwargs())]
+        clients = [QdrantClient(**self._client_kwargs()) for _ in range(self.pool_size)]
+        try:
+            clients[0].info()
+        except Exception:
+            self._close_clients(clients)
+            raise
+        async_clients = [AsyncQdrantClient(**self._client_kwargs()) for _ in range(self.pool_size)]
+        return clients, async_clients
+
+    def _connect_once(self) -> None:
+        """Open a full set of clients and swap them in for the current ones"""
+        clients, async_clients = self._open_clients()
+        with self._lock:
+            old_clients, old_async_clients = self._clients, self._async_clients
+            self._clients, self._async_clients = clients, async_clients
+            self._connections_opened += len(clients) + len(async_clients)
+            self._healthy = True
+            self._last_health_check = time.time()
+        self._close_clients(old_clients)
+        self._schedule_async_close(old_async_clients)
+        logger.info(f"Qdrant client pool connected to {describe_backend(self._client_kwargs())} (mode={self.mode}, pool_size={self.pool_size}, prefer_grpc={self.prefer_grpc})")
+
+    def _connect_failed(self, attempt: int, error: Exception) -> Optional[float]:
+        """Log a failed attempt; returns the backoff before the next one, None after the last"""
+        logger.warning(f"Qdrant connection attempt {attempt + 1}/{self.reconnect_max_retries} to {self.url} failed: {error}")
+        if attempt < self.reconnect_max_retries - 1:
+            return self.reconnect_backoff_s * (2 ** attempt)
+        self._healthy = False
+        logger.error(f"Failed to connect to Qdrant at {self.url}: {error}")
+        return None
+
+    def connect(self) -> None:
+        """
+        Open the pool, retrying with exponential backoff.
+
+        Blocks the calling thread while connecting and between retries; use
+        aconnect() on the event loop.
+
+        Raises:
+            ConnectionError: If Qdrant is unreachable after all retries
+        """
+        for attempt in range(self.reconnect_max_retries):
+            try:
+                self._connect_once()
+                return
+            except Exception as e:
+                backoff_s = self._connect_failed(attempt, e)
+                if backoff_s is None:
+                    raise ConnectionError(f"Failed to connect to Qdrant: {e}")
+                time.sleep(backoff_s)
+
+    async def aconnect(self) -> None:
+        """
+        Async variant of connect() that keeps the event loop free.
+
+        Each attempt runs in a worker thread (creating the clients and pinging the
+        server block) and the backoff between attempts is awaited.
+
+        Raises:
+            ConnectionError: If Qdrant is unreachable after all retries
+        """
+        self._loop = asyncio.get_running_loop()
+        for attempt in range(self.reconnect_max_retries):
+            try:
+                await asyncio.to_thread(self._connect_once)
+                return
+            except Exception as e:
+                backoff_s = self._connect_failed(attempt, e)
+                if backoff_s is None:
+                    raise ConnectionError(f"Failed to connect to Qdrant: {e}")
+                await asyncio.sleep(backoff_s)
+
+    def reconnect(self) -> None:
+        """Replace every pooled client with a fresh connection"""
+        logger.warning(f"Reconnecting Qdrant client pool to {self.url}")
+        self._reconnects += 1
+        self.connect()
+
+    def get_client(self) -> QdrantClient:
+        """
+        Get a pooled sync client.
+
+        Returns:
+            QdrantClient: Shared client (do not close it)
+        """
+        if not self.capabilities.shared_sync_async:
+            raise RuntimeError(f"The '{self.mode}' Qdrant backend is served by a single async client. Use get_async_client().")
+        with self._lock:
+            if not self._clients:
+                raise RuntimeError("Qdrant client pool is not connected. Call connect() first.")
+            return self._clients[next(self._round_robin) % len(self._clients)]
+
+    def get_async_client(self) -> AsyncQdrantClient:
+        """
+        Get a pooled async client.
+
+        Returns:
+            AsyncQdrantClient: Shared client (do not close it)
+        """
+        with self._lock:
+            if not self._async_clients:
+                raise RuntimeError("Qdrant client pool is not connected. Call connect() first.")
+            return self._async_clients[next(self._round_robin) % len(self._async_clients)]
+
+    def health_check(self) -> bool:
+        """
+        Ping Qdrant through the pool and reconnect if it does not answer.
+
+        Returns:
+            bool: True if Qdrant is reachable (possibly after reconnecting)
+        """
+        self._last_health_check = time.time()
+        if not self.capabilities.remote:
+            return self._healthy
+        try:
+            self.get_client().info()
+            self._healthy = True
+            return True
+        except Exception as e:
+            self._health_check_failures += 1
+            self._healthy = False
+            logger.warning(f"Qdrant health check failed: {e}")
+
+        try:
+            self.reconnect()
+            return True
+        except ConnectionError:
+            return False
+
+    async def run_health_checks(self) -> None:
+        """Background task that health-checks the pool every health_check_interval_s"""
+        if not self.capabilities.remote:
+            logger.info(f"Skipping Qdrant health checks for the embedded '{self.mode}' backend")
+            return
+        logger.info(f"Starting Qdrant health checks every {self.health_check_interval_s}s")
+        self._loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.health_check_interval_s)
+            # Runs in a thread because reconnecting sleeps between retries
+            await asyncio.to_thread(self.health_check)
+
+    def _close_clients(self, clients: list[QdrantClient]) -> None:
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug(f"Error closing Qdrant client: {e}")
+
+    def _schedule_async_close(self, async_clients: list[AsyncQdrantClient]) -> None:
+        """Close replaced async clients on the event loop that uses them"""
+        if not async_clients or self._loop is None or self._loop.is_closed():
+            return
+        for client in async_clients:
+            asyncio.run_coroutine_threadsafe(client.close(), self._loop)
+
+    async def aclose(self) -> None:
+        """Close every pooled client"""
+        with self._lock:
+            clients, async_clients = self._clients, self._async_clients
+            self._clients, self._async_clients = [], []
+            self._healthy = False
+        self._close_clients(clients)
+        for client in async_clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Error closing async Qdrant client: {e}")
+        logger.info("Qdrant client pool closed")
+
+    def get_metrics(self) -> dict:
+        """
+        Get pool connection metrics.
+
+        Returns:
+            dict: Open connection count, totals and health state
+        """
+        with self._lock:
+            active_connections = len(self._clients) + len(self._async_clients)
+        return {
+            "url": self.url,
+            "mode": self.mode,
+            "pool_size": self.pool_size,
+            "active_connections": active_connections,
+            "connections_opened": self._connections_opened,
+            "reconnects": self._reconnects,
+            "health_check_failures": self._health_check_failures,
+            "healthy": self._healthy,
+            "last_health_check": self._last_health_check,
+        }
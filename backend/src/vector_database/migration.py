@@ -0,0 +1,140 @@
+"""
+Per-Video to Multi-Tenant Collection Migration
+Copies existing per-video Qdrant collections into the shared tenant collections
+
+Usage:
+    python -m src.vector_database.migration [--delete-source] [--dry-run]
+"""
+import argparse
+import logging
+from typing import Optional
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+from config.service_config import settings
+from src.vector_database.qdrant_client import get_qdrant_client, get_or_create_collection, resolve_collection_name, get_collection_registry
+
+logger = logging.getLogger(__name__)
+
+def list_per_video_collections(qdrant_client: QdrantClient) -> list[str]:
+    """
+    List collections that hold a single video (everything except the tenant collections)
+
+    Args:
+        qdrant_client: Active Qdrant client instance
+
+    Returns:
+        list[str]: Names of per-video collections
+    """
+    tenant_prefix = settings.QDRANT_TENANT_COLLECTION
+    return sorted(
+        c.name for c in qdrant_client.get_collections().collections
+        if c.name != tenant_prefix and not c.name.startswith(f"{tenant_prefix}_")
+    )
+
+def migrate_collection(qdrant_client: QdrantClient, source_collection: str, session_id: Optional[str] = None, page_size: int = 256, delete_source: bool = False) -> int:
+    """
+    Copy one per-video collection into its tenant collection
+
+    Points keep their IDs, vectors and payload; 'video_id' is set to the source
+    collection name so tenant-filtered retrieval finds them. Re-running is safe
+    because the copy overwrites points with the same IDs.
+
+    Args:
+        qdrant_client: Active Qdrant client instance
+        source_collection: Per-video collection to migrate (becomes the video_id)
+        session_id: Session to record on points that do not carry one yet
+        page_size: Points per scroll page and upsert batch (default: 256)
+        delete_source: Delete the per-video collection after a successful copy
+
+    Returns:
+        int: Number of migrated points
+    """
+    target_collection = resolve_collection_name(source_collection)
+    registry = get_collection_registry(qdrant_client)
+    dense_vector_size = registry.get_schema(source_collection)["dense_vector_size"]
+    get_or_create_collection(qdrant_client, target_collection, dense_vector_size)
+
+    logger.info(f"Migrating '{source_collection}' -> '{target_collection}'")
+
+    migrated = 0
+    offset = None
+    while True:
+        records, offset = qdrant_client.scroll(
+            collection_name=source_collection,
+            limit=page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if records:
+            points = []
+            for record in records:
+                payload = dict(record.payload or {})
+                payload["video_id"] = source_collection
+                payload.setdefault("session_id", session_id)
+                points.append(PointStruct(id=record.id, vector=record.vector, payload=payload))
+            # The final page waits so the copy is complete before the source can be deleted
+            qdrant_client.upsert(collection_name=target_collection, points=points, wait=offset is None)
+            migrated += len(points)
+        if offset is None:
+            break
+
+    logger.info(f"Migrated {migrated} points from '{source_collection}'")
+
+    if delete_source:
+        qdrant_client.delete_collection(collection_name=source_collection)
+        registry.invalidate(source_collection)
+        logger.info(f"Deleted source collection '{source_collection}'")
+
+    return migrated
+
+def migrate_all_collections(qdrant_client: QdrantClient, delete_source: bool = False, dry_run: bool = False) -> dict:
+    """
+    Migrate every per-video collection into the tenant collections
+
+    Args:
+        qdrant_client: Active Qdrant client instance
+        delete_source: Delete each per-video collection after it has been copied
+        dry_run: Only list what would be migrated
+
+    Returns:
+        dict: Mapping of source collection name to migrated point count (-1 on failure)
+    """
+    if settings.QDRANT_STORAGE_MODE != "multi_tenant":
+        raise RuntimeError("Set QDRANT_STORAGE_MODE=multi_tenant before migrating collections")
+
+    results = {}
+    sources = list_per_video_collections(qdrant_client)
+    logger.info(f"Found {len(sources)} per-video collections to migrate")
+
+    for source in sources:
+        if dry_run:
+            logger.info(f"[dry-run] '{source}' -> '{resolve_collection_name(source)}'")
+            results[source] = 0
+            continue
+        try:
+            results[source] = migrate_collection(qdrant_client, source, delete_source=delete_source)
+        except Exception as e:
+            logger.error(f"Failed to migrate collection '{source}': {e}", exc_info=True)
+            results[source] = -1
+
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Migrate per-video Qdrant collections to multi-tenant collections")
+    parser.add_argument("--delete-source", action="store_true", help="Delete each per-video collection after migrating it")
+    parser.add_argument("--dry-run", action="store_true", help="List collections without migrating")
+    args = parser.parse_args()
+
+    migration_results = migrate_all_collections(get_qdrant_client(), delete_source=args.delete_source, dry_run=args.dry_run)
+    failed = [name for name, count in migration_results.items() if count < 0]
+    logger.info(f"Migration finished: {len(migration_results) - len(failed)} succeeded, {len(failed)} failed")
+    if failed:
+        logger.error(f"Failed collections: {', '.join(failed)}")
+        exit(1)
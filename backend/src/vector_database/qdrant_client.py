@@ -2,32 +2,369 @@
 Qdrant Client Initialization and Collection Management
 Handles connection to Qdrant vector database and collection operations
 """
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, SparseVectorParams, SparseIndexParams
+from typing import Optional
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    VectorParams, Distance, SparseVectorParams, SparseIndexParams, PayloadSchemaType, HnswConfigDiff,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, BinaryQuantization, BinaryQuantizationConfig,
+    SearchParams, QuantizationSearchParams, KeywordIndexParams, KeywordIndexType,
+    Filter, FieldCondition, MatchValue, FilterSelector
+)
+from config.service_config import settings
+from src.vector_database.retrieval_cache import retrieval_cache
+from src.vector_database.backends import build_client_kwargs, describe_backend, get_backend_capabilities
+import grpc
 import logging
+import threading
+import weakref
+import zlib
 
 logger = logging.getLogger(__name__)
 
-def get_qdrant_client(url: str = "http://localhost:6333", prefer_grpc: bool = True) -> QdrantClient:
+# Payload fields used in retrieval/summary filters, indexed when a collection is created or first used
+PAYLOAD_INDEXES = {
+    "type": PayloadSchemaType.KEYWORD,
+    "sequence_index": PayloadSchemaType.INTEGER,
+    "start_s": PayloadSchemaType.FLOAT,
+    "end_s": PayloadSchemaType.FLOAT,
+}
+
+# Tenant keys carried by every point; indexed as tenant indexes in multi-tenant mode
+TENANT_PAYLOAD_INDEXES = {
+    "video_id": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    "session_id": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+}
+
+# Collection storage profiles selectable via settings.QDRANT_COLLECTION_PROFILE
+#   quantization:    None, "scalar" (int8) or "binary"; quantized vectors stay in RAM
+#   on_disk_vectors: keep original fp32 dense vectors on disk (used for rescoring when quantized)
+#   on_disk_payload: keep payload on disk instead of in RAM
+#   on_disk_sparse:  keep the sparse inverted index on disk
+COLLECTION_PROFILES = {
+    "default": dict(quantization=None, on_disk_vectors=False, on_disk_payload=False, on_disk_sparse=False),
+    "scalar_int8": dict(quantization="scalar", on_disk_vectors=True, on_disk_payload=True, on_disk_sparse=False),
+    "binary": dict(quantization="binary", on_disk_vectors=True, on_disk_payload=True, on_disk_sparse=False),
+    "on_disk": dict(quantization=None, on_disk_vectors=True, on_disk_payload=True, on_disk_sparse=True),
+}
+
+def get_collection_profile(profile_name: Optional[str] = None) -> dict:
+    """
+    Look up a collection storage profile
+    
+    Args:
+        profile_name: Profile key in COLLECTION_PROFILES (default: settings.QDRANT_COLLECTION_PROFILE)
+    
+    Returns:
+        dict: Profile options
+    
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    profile_name = profile_name or settings.QDRANT_COLLECTION_PROFILE
+    if profile_name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown Qdrant collection profile '{profile_name}'. Available: {', '.join(COLLECTION_PROFILES)}")
+    return COLLECTION_PROFILES[profile_name]
+
+def build_collection_config(dense_vector_size: int, profile_name: Optional[str] = None) -> dict:
+    """
+    Build create_collection keyword arguments for a storage profile
+    
+    Args:
+        dense_vector_size: Size of dense embedding vectors
+        profile_name: Profile key in COLLECTION_PROFILES (default: settings.QDRANT_COLLECTION_PROFILE)
+    
+    Returns:
+        dict: vectors_config, sparse_vectors_config, hnsw_config, quantization_config and on_disk_payload
+    """
+    profile = get_collection_profile(profile_name)
+    
+    quantization_config = None
+    if profile["quantization"] == "scalar":
+        quantization_config = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    elif profile["quantization"] == "binary":
+        quantization_config = BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=True)
+        )
+    
+    return dict(
+        vectors_config={
+            "dense_embedding": VectorParams(
+                size=dense_vector_size, 
+                distance=Distance.COSINE,
+                on_disk=profile["on_disk_vectors"]
+            )
+        },
+        sparse_vectors_config={
+            "sparse_embedding": SparseVectorParams(
+                index=SparseIndexParams(on_disk=profile["on_disk_sparse"])
+            )
+        },
+        hnsw_config=HnswConfigDiff(
+            m=settings.QDRANT_HNSW_M,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT
+        ),
+        quantization_config=quantization_config,
+        on_disk_payload=profile["on_disk_payload"],
+    )
+
+def get_dense_search_params(profile_name: Optional[str] = None) -> Optional[SearchParams]:
+    """
+    Build dense search parameters matching a storage profile
+    
+    Quantized profiles search the compressed vectors first, oversample the
+    candidates and rescore them with the original vectors.
+    
+    Args:
+        profile_name: Profile key in COLLECTION_PROFILES (default: settings.QDRANT_COLLECTION_PROFILE)
+    
+    Returns:
+        SearchParams: Search parameters, or None for unquantized profiles
+    """
+    profile = get_collection_profile(profile_name)
+    if profile["quantization"] is None:
+        return None
+    return SearchParams(
+        quantization=QuantizationSearchParams(
+            rescore=settings.QDRANT_QUANTIZATION_RESCORE,
+            oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING
+        )
+    )
+
+def is_multi_tenant() -> bool:
+    """Check whether videos share tenant collections instead of one collection each"""
+    return settings.QDRANT_STORAGE_MODE == "multi_tenant"
+
+def resolve_collection_name(collection_name: str) -> str:
+    """
+    Map a video collection name to the physical Qdrant collection that stores it
+    
+    In 'per_video' mode every video has its own collection. In 'multi_tenant' mode
+    videos are spread over QDRANT_TENANT_SHARDS shared collections by a stable hash.
+    
+    Args:
+        collection_name: Video collection name (e.g., '20251020_154727_weekly_meeting')
+    
+    Returns:
+        str: Physical Qdrant collection name
+    
+    Example:
+        >>> resolve_collection_name("20251020_154727_weekly_meeting")  # per_video mode
+        '20251020_154727_weekly_meeting'
+    """
+    if not is_multi_tenant():
+        return collection_name
+    if settings.QDRANT_TENANT_SHARDS <= 1:
+        return settings.QDRANT_TENANT_COLLECTION
+    shard = zlib.crc32(collection_name.encode("utf-8")) % settings.QDRANT_TENANT_SHARDS
+    return f"{settings.QDRANT_TENANT_COLLECTION}_{shard}"
+
+def get_tenant_conditions(collection_name: str) -> list[FieldCondition]:
+    """
+    Build the filter conditions that scope a query to one video
+    
+    Args:
+        collection_name: Video collection name
+    
+    Returns:
+        list[FieldCondition]: Tenant conditions (empty in 'per_video' mode)
+    """
+    if not is_multi_tenant():
+        return []
+    return [FieldCondition(key="video_id", match=MatchValue(value=collection_name))]
+
+def build_tenant_filter(collection_name: str, conditions: Optional[list] = None) -> Optional[Filter]:
+    """
+    Combine tenant scoping with additional filter conditions
+    
+    Args:
+        collection_name: Video collection name
+        conditions: Extra conditions that must also match
+    
+    Returns:
+        Filter: Combined filter, or None when there is nothing to filter on
+    """
+    must = get_tenant_conditions(collection_name) + list(conditions or [])
+    return Filter(must=must) if must else None
+
+class CollectionRegistry:
+    """
+    In-process cache of the collections known to exist on one Qdrant client
+    
+    Lookups are a dictionary hit; on a miss a single collection_exists call is made
+    instead of listing every collection, so the cost does not grow with the number
+    of videos. Only positive results are cached because another process may create
+    a collection at any time; creates and deletes made through this module update
+    the registry. A collection deleted by another process stays cached until a
+    request fails with is_collection_not_found() and the caller invalidates it.
+    The registry also remembers which collections had their payload indexes
+    ensured, so existing collections are indexed once per process.
+    """
+    
+    def __init__(self, qdrant_client: QdrantClient | AsyncQdrantClient):
+        self._qdrant_client = qdrant_client
+        self._schemas: dict[str, dict] = {}
+        self._indexed: set[str] = set()
+        self._lock = threading.Lock()
+    
+    def exists(self, collection_name: str) -> bool:
+        """
+        Check whether a physical collection exists
+        
+        Args:
+            collection_name: Physical Qdrant collection name
+        
+        Returns:
+            bool: True if the collection exists
+        """
+        with self._lock:
+            if collection_name in self._schemas:
+                return True
+        
+        if not self._qdrant_client.collection_exists(collection_name):
+            return False
+        
+        with self._lock:
+            self._schemas.setdefault(collection_name, {})
+        return True
+    
+    async def aexists(self, collection_name: str) -> bool:
+        """Async variant of exists() for registries bound to an AsyncQdrantClient"""
+        with self._lock:
+            if collection_name in self._schemas:
+                return True
+        
+        if not await self._qdrant_client.collection_exists(collection_name):
+            return False
+        
+        with self._lock:
+            self._schemas.setdefault(collection_name, {})
+        return True
+    
+    def get_schema(self, collection_name: str) -> dict:
+        """
+        Get the cached schema of an existing collection, fetching it once on first use
+        
+        Args:
+            collection_name: Physical Qdrant collection name
+        
+        Returns:
+            dict: {'dense_vector_size': int, 'profile': str | None}
+        """
+        with self._lock:
+            schema = self._schemas.get(collection_name)
+        if schema:
+            return schema
+        
+        params = self._qdrant_client.get_collection(collection_name).config.params
+        schema = {"dense_vector_size": params.vectors["dense_embedding"].size, "profile": None}
+        with self._lock:
+            self._schemas[collection_name] = schema
+        return schema
+    
+    def register(self, collection_name: str, dense_vector_size: int, profile_name: Optional[str] = None) -> None:
+        """Record a collection that was just created"""
+        with self._lock:
+            self._schemas[collection_name] = {"dense_vector_size": dense_vector_size, "profile": profile_name}
+    
+    def invalidate(self, collection_name: str) -> None:
+        """Forget a collection after it was deleted (or may have been)"""
+        with self._lock:
+            self._schemas.pop(collection_name, None)
+            self._indexed.discard(collection_name)
+    
+    def needs_indexes(self, collection_name: str) -> bool:
+        """Check whether the payload indexes of a collection still have to be ensured"""
+        with self._lock:
+            return collection_name not in self._indexed
+    
+    def mark_indexed(self, collection_name: str) -> None:
+        """Record that the payload indexes of a collection exist"""
+        with self._lock:
+            self._indexed.add(collection_name)
+
+
+def is_collection_not_found(error: Exception) -> bool:
+    """
+    Check whether a Qdrant error means the collection does not exist
+    
+    Args:
+        error: Exception raised by a Qdrant client call
+    
+    Returns:
+        bool: True for HTTP 404, gRPC NOT_FOUND and the local client's 'not found' error
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return isinstance(error, ValueError) and "not found" in str(error).lower()
+
+
+# One registry per client instance; entries disappear with their client
+_registries: "weakref.WeakKeyDictionary[QdrantClient | AsyncQdrantClient, CollectionRegistry]" = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+def get_collection_registry(qdrant_client: QdrantClient | AsyncQdrantClient) -> CollectionRegistry:
+    """
+    Get the collection registry bound to a Qdrant client
+    
+    Args:
+        qdrant_client: Active Qdrant client instance (sync or async)
+    
+    Returns:
+        CollectionRegistry: Registry shared by every caller using this client
+    """
+    with _registries_lock:
+        registry = _registries.get(qdrant_client)
+        if registry is None:
+            registry = CollectionRegistry(qdrant_client)
+            _registries[qdrant_client] = registry
+        return registry
+
+def get_qdrant_client(url: Optional[str] = None, prefer_grpc: Optional[bool] = None) -> QdrantClient:
     """
-    Initialize and return a Qdrant client
+    Initialize and return a Qdrant client for the configured backend (settings.QDRANT_MODE)
     
     Args:
-        url: URL of the Qdrant service (default: "http://localhost:6333")
-        prefer_grpc: Whether to use gRPC for faster communication (default: True)
+        url: URL of the Qdrant service, 'server' mode only (default: settings.QDRANT_URL)
+        prefer_grpc: Whether to use gRPC for faster communication (default: settings.QDRANT_PREFER_GRPC)
     
     Returns:
         QdrantClient: Initialized Qdrant client instance
     """
+    client_kwargs = build_client_kwargs(url=url, prefer_grpc=prefer_grpc)
     try:
-        qdrant_client = QdrantClient(url=url, prefer_grpc=prefer_grpc)
-        logger.info(f"Connected to Qdrant successfully at {url}")
+        qdrant_client = QdrantClient(**client_kwargs)
+        logger.info(f"Connected to Qdrant successfully at {describe_backend(client_kwargs)}")
         return qdrant_client
     except Exception as e:
-        logger.error(f"Failed to connect to Qdrant at {url}: {e}")
+        logger.error(f"Failed to connect to Qdrant at {describe_backend(client_kwargs)}: {e}")
         raise ConnectionError(f"Failed to connect to Qdrant: {e}")
 
-def get_or_create_collection(qdrant_client: QdrantClient, collection_name: str, dense_vector_size: int = 384) -> bool:
+def get_async_qdrant_client(url: Optional[str] = None, prefer_grpc: Optional[bool] = None) -> AsyncQdrantClient:
+    """
+    Initialize and return an async Qdrant client for use inside the event loop
+    
+    Args:
+        url: URL of the Qdrant service, 'server' mode only (default: settings.QDRANT_URL)
+        prefer_grpc: Whether to use gRPC for faster communication (default: settings.QDRANT_PREFER_GRPC)
+    
+    Returns:
+        AsyncQdrantClient: Initialized async Qdrant client instance
+    """
+    client_kwargs = build_client_kwargs(url=url, prefer_grpc=prefer_grpc)
+    try:
+        async_qdrant_client = AsyncQdrantClient(**client_kwargs)
+        logger.info(f"Created async Qdrant client for {describe_backend(client_kwargs)}")
+        return async_qdrant_client
+    except Exception as e:
+        logger.error(f"Failed to create async Qdrant client for {describe_backend(client_kwargs)}: {e}")
+        raise ConnectionError(f"Failed to connect to Qdrant: {e}")
+
+def get_or_create_collection(qdrant_client: QdrantClient, collection_name: str, dense_vector_size: int, profile_name: Optional[str] = None) -> bool:
     """
     Ensure that a Qdrant collection exists; create if not found
     
@@ -36,53 +373,145 @@ def get_or_create_collection(qdrant_client: QdrantClient, collection_name: str,
     Args:
         qdrant_client: Active Qdrant client instance
         collection_name: Name of the collection to check or create
-        dense_vector_size: Size of dense embedding vectors (default: 384)
+        dense_vector_size: Size of dense embedding vectors (taken from the loaded embedding model)
+        profile_name: Storage profile for new collections (default: settings.QDRANT_COLLECTION_PROFILE)
     
     Returns:
         bool: True if collection exists or was created successfully
     """
     try:
-        # Retrieve all existing collections
-        existing = [c.name for c in qdrant_client.get_collections().collections]
+        registry = get_collection_registry(qdrant_client)
 
         # Create collection if it doesn't exist
-        if collection_name not in existing:
+        if not registry.exists(collection_name):
             qdrant_client.create_collection(
                 collection_name=collection_name,
-                vectors_config={
-                    "dense_embedding": VectorParams(
-                        size=dense_vector_size, 
-                        distance=Distance.COSINE
-                    )
-                },
-                sparse_vectors_config={
-                    "sparse_embedding": SparseVectorParams(
-                        index=SparseIndexParams(on_disk=False)
-                    )
-                },
+                **build_collection_config(dense_vector_size, profile_name),
+            )
+            create_payload_indexes(qdrant_client, collection_name)
+            registry.register(collection_name, dense_vector_size, profile_name or settings.QDRANT_COLLECTION_PROFILE)
+            registry.mark_indexed(collection_name)
+            logger.info(
+                f"Collection '{collection_name}' created successfully "
+                f"(profile='{profile_name or settings.QDRANT_COLLECTION_PROFILE}', dense_vector_size={dense_vector_size})"
+            )
+        else:
+            logger.info(f"Collection '{collection_name}' already exists")
+            # Collections created before the indexes were introduced need them too
+            if registry.needs_indexes(collection_name):
+                create_payload_indexes(qdrant_client, collection_name)
+                registry.mark_indexed(collection_name)
+
+        return True
+    except Exception as e:
+        logger.error(f"Error ensuring collection '{collection_name}': {e}")
+        raise
+
+async def aget_or_create_collection(async_qdrant_client: AsyncQdrantClient, collection_name: str, dense_vector_size: int, profile_name: Optional[str] = None) -> bool:
+    """
+    Async variant of get_or_create_collection()
+    
+    Args:
+        async_qdrant_client: Active async Qdrant client instance
+        collection_name: Name of the collection to check or create
+        dense_vector_size: Size of dense embedding vectors (taken from the loaded embedding model)
+        profile_name: Storage profile for new collections (default: settings.QDRANT_COLLECTION_PROFILE)
+    
+    Returns:
+        bool: True if collection exists or was created successfully
+    """
+    try:
+        registry = get_collection_registry(async_qdrant_client)
+
+        if not await registry.aexists(collection_name):
+            await async_qdrant_client.create_collection(
+                collection_name=collection_name,
+                **build_collection_config(dense_vector_size, profile_name),
+            )
+            await acreate_payload_indexes(async_qdrant_client, collection_name)
+            registry.register(collection_name, dense_vector_size, profile_name or settings.QDRANT_COLLECTION_PROFILE)
+            registry.mark_indexed(collection_name)
+            logger.info(
+                f"Collection '{collection_name}' created successfully "
+                f"(profile='{profile_name or settings.QDRANT_COLLECTION_PROFILE}', dense_vector_size={dense_vector_size})"
             )
-            logger.info(f"Collection '{collection_name}' created successfully")
         else:
             logger.info(f"Collection '{collection_name}' already exists")
+            if registry.needs_indexes(collection_name):
+                await acreate_payload_indexes(async_qdrant_client, collection_name)
+                registry.mark_indexed(collection_name)
 
         return True
     except Exception as e:
         logger.error(f"Error ensuring collection '{collection_name}': {e}")
         raise
 
+def get_payload_indexes() -> dict:
+    """
+    Get the payload indexes to create for the current storage mode
+    
+    Returns:
+        dict: Mapping of payload field name to index schema (empty for embedded
+              backends, which filter by scanning payloads)
+    """
+    if not get_backend_capabilities().payload_indexes:
+        return {}
+    payload_indexes = dict(PAYLOAD_INDEXES)
+    if is_multi_tenant():
+        payload_indexes.update(TENANT_PAYLOAD_INDEXES)
+    return payload_indexes
+
+def create_payload_indexes(qdrant_client: QdrantClient, collection_name: str) -> None:
+    """
+    Create payload indexes for the fields the retrieval stack filters on
+    
+    Safe to repeat: Qdrant keeps an existing index with the same schema.
+    
+    Args:
+        qdrant_client: Active Qdrant client instance
+        collection_name: Name of the collection to index
+    """
+    for field_name, field_schema in get_payload_indexes().items():
+        qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+        logger.info(f"Created {field_schema} payload index on '{field_name}' in '{collection_name}'")
+
+async def acreate_payload_indexes(async_qdrant_client: AsyncQdrantClient, collection_name: str) -> None:
+    """Async variant of create_payload_indexes()"""
+    for field_name, field_schema in get_payload_indexes().items():
+        await async_qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+        logger.info(f"Created {field_schema} payload index on '{field_name}' in '{collection_name}'")
+
 def delete_collection(qdrant_client: QdrantClient, collection_name: str) -> bool:
     """
-    Delete a Qdrant collection
+    Delete a video collection
+    
+    In 'multi_tenant' mode only the video's points are removed from the shared collection.
     
     Args:
         qdrant_client: Active Qdrant client instance
-        collection_name: Name of the collection to delete
+        collection_name: Name of the video collection to delete
     
     Returns:
         bool: True if deletion was successful
     """
     try:
-        qdrant_client.delete_collection(collection_name=collection_name)
+        if is_multi_tenant():
+            qdrant_client.delete(
+                collection_name=resolve_collection_name(collection_name),
+                points_selector=FilterSelector(filter=build_tenant_filter(collection_name)),
+            )
+        else:
+            qdrant_client.delete_collection(collection_name=collection_name)
+            get_collection_registry(qdrant_client).invalidate(collection_name)
+        retrieval_cache.bump_version(collection_name)
         logger.info(f"Collection '{collection_name}' deleted successfully")
         return True
     except Exception as e:
@@ -91,18 +520,29 @@ def delete_collection(qdrant_client: QdrantClient, collection_name: str) -> bool
 
 def collection_exists(qdrant_client: QdrantClient, collection_name: str) -> bool:
     """
-    Check if a collection exists in Qdrant
+    Check if a video collection exists in Qdrant
+    
+    In 'multi_tenant' mode a video exists when the shared collection holds any of its points.
     
     Args:
         qdrant_client: Active Qdrant client instance
-        collection_name: Name of the collection to check
+        collection_name: Name of the video collection to check
     
     Returns:
         bool: True if collection exists
     """
     try:
-        existing = [c.name for c in qdrant_client.get_collections().collections]
-        return collection_name in existing
+        physical_name = resolve_collection_name(collection_name)
+        if not get_collection_registry(qdrant_client).exists(physical_name):
+            return False
+        if is_multi_tenant():
+            count = qdrant_client.count(
+                collection_name=physical_name,
+                count_filter=build_tenant_filter(collection_name),
+                exact=True,
+            ).count
+            return count > 0
+        return True
     except Exception as e:
         logger.error(f"Error checking collection '{collection_name}': {e}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,218 @@
+"""
+Cross-Encoder Reranker
+Rescores hybrid-search hits with a small cross-encoder so fewer, better chunks
+reach the generator
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config.service_config import settings
+from src.llm.executor import inference_executor
+from src.llm.model_lifecycle import weight_loading_kwargs
+
+logger = logging.getLogger(__name__)
+
+class CrossEncoderReranker:
+    """
+    Reranks retrieved points by scoring (query, chunk) pairs with a cross-encoder.
+
+    All uncached pairs of a query are scored in one batched forward pass on CPU.
+    Scores are cached by (query hash, point id), so repeated or follow-up
+    questions over the same video skip the model. A latency budget caps how many
+    uncached pairs are scored per query; the remaining candidates keep their
+    retrieval order after the reranked ones.
+
+    Attributes:
+        model_name: Hugging Face cross-encoder name
+        latency_budget_ms: Target rerank time per query (0 disables the cap)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 32,
+        max_length: int = 512,
+        cache_size: int = 4096,
+        latency_budget_ms: float = 0.0,
+        device: str = "cpu",
+    ):
+        """
+        Load the cross-encoder.
+
+        Args:
+            model_name: Hugging Face cross-encoder (e.g., 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+            batch_size: Pairs per forward batch
+            max_length: Token limit of a (query, chunk) pair
+            cache_size: Maximum cached pair scores
+            latency_budget_ms: Target rerank time per query (0 = score every candidate)
+            device: Torch device for the model
+        """
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.latency_budget_ms = latency_budget_ms
+        model_kwargs = weight_loading_kwargs()
+        self.model = CrossEncoder(
+            model_name,
+            max_length=max_length,
+            device=device,
+            cache_folder=model_kwargs.pop("cache_dir"),
+            model_kwargs=model_kwargs,
+        )
+
+        self._cache: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        # Moving average of the per-pair scoring cost, used to honour the latency budget
+        self._ms_per_pair: Optional[float] = None
+
+        # Metrics
+        self._queries = 0
+        self._pairs_scored = 0
+        self._cache_hits = 0
+        self._budget_truncations = 0
+        self._last_latency_ms: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "CrossEncoderReranker":
+        """Build a reranker from the RERANK_* settings"""
+        return cls(
+            model_name=settings.RERANK_MODEL_NAME,
+            batch_size=settings.RERANK_BATCH_SIZE,
+            max_length=settings.RERANK_MAX_LENGTH,
+            cache_size=settings.RERANK_CACHE_SIZE,
+            latency_budget_ms=settings.RERANK_LATENCY_BUDGET_MS,
+        )
+
+    @staticmethod
+    def _query_key(user_query: str) -> str:
+        return hashlib.sha256(user_query.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+    def _max_uncached_pairs(self) -> Optional[int]:
+        """Number of pairs the latency budget allows (None = unlimited)"""
+        if not self.latency_budget_ms or self._ms_per_pair is None:
+            return None
+        return max(1, int(self.latency_budget_ms / self._ms_per_pair))
+
+    def score_pairs(self, user_query: str, texts: list[str]) -> list[float]:
+        """
+        Score (query, text) pairs in one batched forward pass.
+
+        Args:
+            user_query: The user question
+            texts: Chunk texts
+
+        Returns:
+            list[float]: Relevance score per text
+        """
+        if not texts:
+            return []
+        start_time = time.perf_counter()
+        scores = self.model.predict(
+            [(user_query, text) for text in texts],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        ms_per_pair = elapsed_ms / len(texts)
+        self._ms_per_pair = ms_per_pair if self._ms_per_pair is None else 0.8 * self._ms_per_pair + 0.2 * ms_per_pair
+        self._pairs_scored += len(texts)
+        return [float(score) for score in scores]
+
+    def rerank(self, user_query: str, points: list, top_k: Optional[int] = None) -> list:
+        """
+        Reorder retrieved points by cross-encoder score.
+
+        Args:
+            user_query: The user question
+            points: Retrieved points (ScoredPoint/Record) in retrieval order
+            top_k: Number of points to keep (default: all)
+
+        Returns:
+            list: Points sorted by rerank score, with 'score' replaced by the
+                  cross-encoder score; unscored candidates follow in retrieval order
+        """
+        start_time = time.perf_counter()
+        self._queries += 1
+        query_key = self._query_key(user_query)
+
+        scores: dict[int, float] = {}
+        uncached = []
+        with self._lock:
+            for i, point in enumerate(points):
+                key = (query_key, str(point.id))
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+                    self._cache_hits += 1
+                else:
+                    uncached.append(i)
+
+        max_pairs = self._max_uncached_pairs()
+        if max_pairs is not None and len(uncached) > max_pairs:
+            # Candidates are in retrieval order, so the budget keeps the best-ranked ones
+            logger.info(f"Rerank latency budget ({self.latency_budget_ms}ms) allows {max_pairs}/{len(uncached)} uncached pairs")
+            uncached = uncached[:max_pairs]
+            self._budget_truncations += 1
+
+        if uncached:
+            texts = [(points[i].payload or {}).get("text", "") for i in uncached]
+            new_scores = self.score_pairs(user_query, texts)
+            with self._lock:
+                for i, score in zip(uncached, new_scores):
+                    scores[i] = score
+                    self._cache[(query_key, str(points[i].id))] = score
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        reranked = sorted(scores, key=lambda i: scores[i], reverse=True)
+        unscored = [i for i in range(len(points)) if i not in scores]
+        ordered = [self._with_score(points[i], scores[i]) for i in reranked] + [points[i] for i in unscored]
+
+        self._last_latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"Reranked {len(scores)}/{len(points)} points in {self._last_latency_ms:.1f}ms "
+            f"({len(uncached)} scored, {len(scores) - len(uncached)} cached)"
+        )
+        return ordered[:top_k] if top_k else ordered
+
+    async def arerank(self, user_query: str, points: list, top_k: Optional[int] = None) -> list:
+        """Async variant of rerank() that scores on the reranker's inference lane"""
+        return await inference_executor.run(self, self.rerank, user_query, points, top_k)
+
+    @staticmethod
+    def _with_score(point, score: float):
+        """Copy a point with its score replaced"""
+        if hasattr(point, "model_copy"):
+            return point.model_copy(update={"score": score})
+        return point.copy(update={"score": score})
+
+    def clear_cache(self) -> None:
+        """Drop every cached score"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_metrics(self) -> dict:
+        """
+        Get reranker metrics.
+
+        Returns:
+            dict: Query, scoring and cache counters and latency estimates
+        """
+        with self._lock:
+            cache_entries = len(self._cache)
+        return {
+            "model_name": self.model_name,
+            "queries": self._queries,
+            "pairs_scored": self._pairs_scored,
+            "cache_hits": self._cache_hits,
+            "cache_entries": cache_entries,
+            "budget_truncations": self._budget_truncations,
+            "ms_per_pair": self._ms_per_pair,
+            "last_latency_ms": self._last_latency_ms,
+        }
@@ -0,0 +1,165 @@
+"""
+Retrieval Cache
+Caches hybrid-search results per video so repeated questions skip embedding
+and search until the video's chunks change
+"""
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from config.service_config import settings
+
+logger = logging.getLogger(__name__)
+
+class RetrievalCache:
+    """
+    Size-bounded LRU of retrieval results keyed by
+    (collection, collection version, normalized query, limit).
+
+    Each video collection has an in-process version counter. Writers call
+    bump_version() after changing a collection (indexing, deletion), which makes
+    every cached result of the old version unreachable and evicts it.
+
+    The cache and its versions are per process: writes made by another worker
+    or by the migration tool do not bump them. Entries therefore also expire
+    after ttl_s, which bounds how long such a write can go unnoticed.
+
+    Attributes:
+        max_entries: Maximum cached results (0 disables caching)
+        ttl_s: Entry lifetime in seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum cached results (0 disables caching)
+            ttl_s: Entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # key -> (result, expires_at)
+        self._entries: OrderedDict[tuple, tuple[Any, float]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def normalize_query(user_query: str) -> str:
+        """Lowercase and collapse whitespace so trivially different phrasings share an entry"""
+        return re.sub(r"\s+", " ", user_query.strip().lower())
+
+    def _key(self, collection_name: str, user_query: str, limit: int, version: Optional[int] = None) -> tuple:
+        if version is None:
+            version = self._versions.get(collection_name, 0)
+        return (collection_name, version, self.normalize_query(user_query), limit)
+
+    def get(self, collection_name: str, user_query: str, limit: int) -> Optional[Any]:
+        """
+        Look up a cached retrieval result.
+
+        Args:
+            collection_name: Video collection name
+            user_query: The user question
+            limit: Retrieval limit the result was produced with
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        if not self.max_entries:
+            return None
+        with self._lock:
+            key = self._key(collection_name, user_query, limit)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+            return None
+
+    def put(self, collection_name: str, user_query: str, limit: int, result: Any, version: int) -> None:
+        """
+        Store a retrieval result under the collection version it was searched at.
+
+        A result whose collection changed while the search ran may mix old and new
+        points, so it is dropped instead of being cached under the new version.
+
+        Args:
+            collection_name: Video collection name
+            user_query: The user question
+            limit: Retrieval limit the result was produced with
+            result: Retrieval result (None is not cached)
+            version: get_version() of the collection, read before the search
+        """
+        if not self.max_entries or result is None:
+            return
+        with self._lock:
+            if version != self._versions.get(collection_name, 0):
+                logger.debug(f"'{collection_name}' changed during the search, not caching the result")
+                return
+            key = self._key(collection_name, user_query, limit, version)
+            self._entries[key] = (result, time.time() + self.ttl_s)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, collection_name: str) -> int:
+        """Current version of a collection (0 until it is first changed in this process)"""
+        with self._lock:
+            return self._versions.get(collection_name, 0)
+
+    def bump_version(self, collection_name: str) -> int:
+        """
+        Mark a collection as changed and evict its cached results.
+
+        Args:
+            collection_name: Video collection name
+
+        Returns:
+            int: New collection version
+        """
+        with self._lock:
+            version = self._versions.get(collection_name, 0) + 1
+            self._versions[collection_name] = version
+            stale_keys = [key for key in self._entries if key[0] == collection_name]
+            for key in stale_keys:
+                del self._entries[key]
+            self._invalidations += 1
+        logger.debug(f"Retrieval cache version of '{collection_name}' is now {version} ({len(stale_keys)} entries evicted)")
+        return version
+
+    def clear(self) -> None:
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            dict: Entry count, hit/miss counters, hit rate and invalidations
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+retrieval_cache = RetrievalCache(settings.RETRIEVAL_CACHE_SIZE, settings.RETRIEVAL_CACHE_TTL_S)
@@ -1,14 +1,58 @@
 from qdrant_client import models
+import asyncio
 import logging
+import re
+from typing import AsyncIterator, Iterator, Optional
 from qdrant_client.models import models
+from config.service_config import settings
 from src.prompt_engineering.templates import RAG_QA_PROMPT
 from src.llm.inference import generate_qwen_response
-from src.vector_database.utils import build_dense_embedding, build_sparse_embedding
+from src.vector_database.qdrant_client import get_dense_search_params, resolve_collection_name, build_tenant_filter, get_tenant_conditions, get_collection_registry, is_collection_not_found
+from src.vector_database.utils import build_dense_embedding, abuild_dense_embedding, build_sparse_embedding
+from src.llm.executor import inference_executor
+from src.vector_database.retrieval_cache import retrieval_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
-def query_rag_points(user_query: str, dense_embedding_model, dense_tokenizer, qdrant_client, collection_name: str, limit: int = 10):
+def build_hybrid_query(dense_vector: list[float], sparse_vector, collection_name: str, limit: int = 10) -> dict:
+    """
+    Build the query_points() arguments for hybrid (dense + sparse) RRF retrieval.
+
+    Args:
+        dense_vector (list[float]): Dense query embedding.
+        sparse_vector: Sparse query embedding with 'indices' and 'values' attributes.
+        collection_name (str): Video collection to search (scoped to its tenant in multi-tenant mode).
+        limit (int): Per-branch limit for Prefetch (dense and sparse).
+
+    Returns:
+        dict: Keyword arguments for qdrant_client.query_points().
+    """
+    # Scope both branches to this video (no-op in per-video mode)
+    tenant_filter = build_tenant_filter(collection_name)
+
+    return dict(
+        collection_name=resolve_collection_name(collection_name),
+        prefetch=[
+            models.Prefetch(
+                query=models.SparseVector(indices=sparse_vector.indices, values=sparse_vector.values),
+                using="sparse_embedding",
+                filter=tenant_filter,
+                limit=limit
+            ),
+            models.Prefetch(
+                query=dense_vector,
+                using="dense_embedding",
+                params=get_dense_search_params(),
+                filter=tenant_filter,
+                limit=limit
+            )
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        query_filter=tenant_filter
+    )
+
+def query_rag_points(user_query: str, dense_embedding_model, dense_tokenizer, qdrant_client, collection_name: str, limit: int = 10, dense_vector: Optional[list[float]] = None):
     """
     Run hybrid (dense + sparse) retrieval against Qdrant using RRF fusion.
 
@@ -17,46 +61,262 @@ def query_rag_points(user_query: str, dense_embedding_model, dense_tokenizer, qd
         dense_tokenizer: Tokenizer instance for the dense model.
         dense_embedding_model: Dense embedding model instance.
         qdrant_client: Initialized QdrantClient.
-        collection_name (str): Qdrant collection to search.
+        collection_name (str): Video collection to search (scoped to its tenant in multi-tenant mode).
         limit (int): Per-branch limit for Prefetch (dense and sparse).
+        dense_vector (list[float]): Precomputed dense query embedding (computed if None).
 
     Returns:
-        retrieved_points: Qdrant query result.
+        retrieved_points: Qdrant query result (served from the retrieval cache when
+                          the collection has not changed since the same question).
     """
+    cached_points = retrieval_cache.get(collection_name, user_query, limit)
+    if cached_points is not None:
+        logger.info(f"Retrieval cache hit for '{collection_name}'")
+        return cached_points
+    cache_version = retrieval_cache.get_version(collection_name)
     try:
         # Build embeddings
-        dense_vector = build_dense_embedding(dense_tokenizer, dense_embedding_model, user_query)
+        if dense_vector is None:
+            dense_vector = build_dense_embedding(dense_tokenizer, dense_embedding_model, user_query)
         sparse_vector = build_sparse_embedding(user_query)
     
         # Query Qdrant with RRF fusion
         retrieved_points = qdrant_client.query_points(
-            collection_name=collection_name,
-            prefetch=[
-                models.Prefetch(
-                    query=models.SparseVector(indices=sparse_vector.indices, values=sparse_vector.values),
-                    using="sparse_embedding",
-                    limit=limit
-                ),
-                models.Prefetch(
-                    query=dense_vector,
-                    using="dense_embedding",
-                    limit=limit
-                )
-            ],
-            query=models.FusionQuery(fusion=models.Fusion.RRF)
+            **build_hybrid_query(dense_vector, sparse_vector, collection_name, limit)
+        )
+    
+        logger.info(f"Retrieval Points: \n{retrieved_points}")
+        retrieval_cache.put(collection_name, user_query, limit, retrieved_points, cache_version)
+        return retrieved_points
+    except Exception as e:
+        logger.error(f"Error while retrieving the related documents from Qdrant Vector Store: {e}")
+        if is_collection_not_found(e):
+            # Deleted elsewhere: stop reporting it as existing
+            get_collection_registry(qdrant_client).invalidate(resolve_collection_name(collection_name))
+
+async def aquery_rag_points(user_query: str, dense_embedding_model, dense_tokenizer, async_qdrant_client, collection_name: str, limit: int = 10, dense_vector: Optional[list[float]] = None):
+    """
+    Async variant of query_rag_points() for an AsyncQdrantClient.
+
+    The query embeddings are computed in a worker thread and the Qdrant request is
+    awaited, so concurrent chats do not queue behind each other on the event loop.
+
+    Args:
+        user_query (str): The user question/query.
+        dense_embedding_model: Dense embedding model instance.
+        dense_tokenizer: Tokenizer instance for the dense model.
+        async_qdrant_client: Initialized AsyncQdrantClient.
+        collection_name (str): Video collection to search (scoped to its tenant in multi-tenant mode).
+        limit (int): Per-branch limit for Prefetch (dense and sparse).
+        dense_vector (list[float]): Precomputed dense query embedding (computed if None).
+
+    Returns:
+        retrieved_points: Qdrant query result.
+    """
+    cached_points = retrieval_cache.get(collection_name, user_query, limit)
+    if cached_points is not None:
+        logger.info(f"Retrieval cache hit for '{collection_name}'")
+        return cached_points
+    cache_version = retrieval_cache.get_version(collection_name)
+    try:
+        if dense_vector is None:
+            dense_vector, sparse_vector = await asyncio.gather(
+                abuild_dense_embedding(dense_tokenizer, dense_embedding_model, user_query),
+                asyncio.to_thread(build_sparse_embedding, user_query),
+            )
+        else:
+            sparse_vector = await asyncio.to_thread(build_sparse_embedding, user_query)
+    
+        retrieved_points = await async_qdrant_client.query_points(
+            **build_hybrid_query(dense_vector, sparse_vector, collection_name, limit)
         )
     
         logger.info(f"Retrieval Points: \n{retrieved_points}")
+        retrieval_cache.put(collection_name, user_query, limit, retrieved_points, cache_version)
         return retrieved_points
     except Exception as e:
         logger.error(f"Error while retrieving the related documents from Qdrant Vector Store: {e}")
+        if is_collection_not_found(e):
+            get_collection_registry(async_qdrant_client).invalidate(resolve_collection_name(collection_name))
+
+def merge_sequence_windows(hits: list, window: int) -> dict[str, list[tuple[int, int]]]:
+    """
+    Compute the merged ±window sequence ranges around each hit, per chunk type.
+
+    Overlapping or adjacent ranges are merged so every neighbour is fetched once.
+
+    Args:
+        hits (list): Retrieved points with 'type' and 'sequence_index' payload.
+        window (int): Number of neighbours to include on each side of a hit.
+
+    Returns:
+        dict[str, list[tuple[int, int]]]: Sorted, non-overlapping (first, last) ranges per type.
+
+    Example:
+        >>> merge_sequence_windows([hit(type='txt', seq=4), hit(type='txt', seq=6)], 1)
+        {'txt': [(3, 7)]}
+    """
+    ranges_by_type: dict[str, list[tuple[int, int]]] = {}
+    for hit in hits:
+        payload = hit.payload or {}
+        seq_index = payload.get("sequence_index")
+        if seq_index is None:
+            continue
+        ranges_by_type.setdefault(payload.get("type", ""), []).append((max(1, seq_index - window), seq_index + window))
+
+    merged_by_type = {}
+    for doc_type, ranges in ranges_by_type.items():
+        ranges.sort()
+        merged = [ranges[0]]
+        for first, last in ranges[1:]:
+            if first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        merged_by_type[doc_type] = merged
+    return merged_by_type
+
+def build_neighbor_scroll(collection_name: str, windows: dict[str, list[tuple[int, int]]]) -> dict:
+    """
+    Build the scroll() arguments that fetch every neighbour window in one request.
+
+    Args:
+        collection_name (str): Video collection name (scoped to its tenant in multi-tenant mode).
+        windows (dict): Output of merge_sequence_windows().
+
+    Returns:
+        dict: Keyword arguments for qdrant_client.scroll().
+    """
+    window_filters = [
+        models.Filter(must=[
+            models.FieldCondition(key="type", match=models.MatchValue(value=doc_type)),
+            models.FieldCondition(key="sequence_index", range=models.Range(gte=first, lte=last)),
+        ])
+        for doc_type, ranges in windows.items()
+        for first, last in ranges
+    ]
+    return dict(
+        collection_name=resolve_collection_name(collection_name),
+        scroll_filter=models.Filter(must=get_tenant_conditions(collection_name) or None, should=window_filters),
+        limit=sum(last - first + 1 for ranges in windows.values() for first, last in ranges),
+        with_payload=True,
+        with_vectors=False,
+    )
+
+def order_expanded_points(hits: list, neighbours: list, windows: dict[str, list[tuple[int, int]]]) -> list:
+    """
+    Arrange hits and their neighbours window by window, in reading order.
+
+    Windows are ordered by the rank of their best hit; chunks inside a window by
+    sequence_index. Hits keep their scored point (and relevance score).
+
+    Args:
+        hits (list): Ranked retrieved points.
+        neighbours (list): Records returned by the neighbour scroll.
+        windows (dict): Output of merge_sequence_windows().
+
+    Returns:
+        list: Deduplicated points, grouped by window.
+    """
+    hit_by_id = {hit.id: hit for hit in hits}
+    chunks_by_window: dict[tuple, list] = {}
+    for record in neighbours:
+        payload = record.payload or {}
+        doc_type, seq_index = payload.get("type", ""), payload.get("sequence_index", 0)
+        for first, last in windows.get(doc_type, []):
+            if first <= seq_index <= last:
+                chunks_by_window.setdefault((doc_type, first), []).append(hit_by_id.get(record.id, record))
+                break
+
+    expanded, seen_windows, seen_ids = [], set(), set()
+    for hit in hits:
+        payload = hit.payload or {}
+        doc_type, seq_index = payload.get("type", ""), payload.get("sequence_index")
+        window_key = next(
+            ((doc_type, first) for first, last in windows.get(doc_type, []) if seq_index is not None and first <= seq_index <= last),
+            None,
+        )
+        if window_key is None or window_key not in chunks_by_window:
+            # No sequence information (or the window could not be fetched): keep the hit alone
+            if hit.id not in seen_ids:
+                expanded.append(hit)
+                seen_ids.add(hit.id)
+            continue
+        if window_key in seen_windows:
+            continue
+        seen_windows.add(window_key)
+        for point in sorted(chunks_by_window[window_key], key=lambda p: p.payload.get("sequence_index", 0)):
+            if point.id not in seen_ids:
+                expanded.append(point)
+                seen_ids.add(point.id)
+    return expanded
+
+def expand_neighbor_context(qdrant_client, collection_name: str, hits: list, window: Optional[int] = None) -> list:
+    """
+    Add the ±window neighbouring chunks (same type, by sequence_index) around each hit.
+
+    All windows are fetched with a single filtered scroll on the indexed
+    'type' and 'sequence_index' payload fields, so vector search cost is unchanged.
+
+    Args:
+        qdrant_client: Active Qdrant client instance.
+        collection_name (str): Video collection name.
+        hits (list): Top-ranked retrieved points.
+        window (int): Neighbours per side (default: settings.RAG_NEIGHBOR_WINDOW).
+
+    Returns:
+        list: Hits with their neighbours, merged and deduplicated (the hits alone on failure).
+    """
+    window = settings.RAG_NEIGHBOR_WINDOW if window is None else window
+    windows = merge_sequence_windows(hits, window)
+    if window <= 0 or not windows:
+        return list(hits)
+    try:
+        neighbours, _ = qdrant_client.scroll(**build_neighbor_scroll(collection_name, windows))
+        expanded = order_expanded_points(hits, neighbours, windows)
+        logger.info(f"Expanded {len(hits)} hits to {len(expanded)} chunks with ±{window} neighbours")
+        return expanded
+    except Exception as e:
+        logger.warning(f"Neighbour expansion failed, using the hits only: {e}")
+        return list(hits)
+
+async def aexpand_neighbor_context(async_qdrant_client, collection_name: str, hits: list, window: Optional[int] = None) -> list:
+    """Async variant of expand_neighbor_context()"""
+    window = settings.RAG_NEIGHBOR_WINDOW if window is None else window
+    windows = merge_sequence_windows(hits, window)
+    if window <= 0 or not windows:
+        return list(hits)
+    try:
+        neighbours, _ = await async_qdrant_client.scroll(**build_neighbor_scroll(collection_name, windows))
+        expanded = order_expanded_points(hits, neighbours, windows)
+        logger.info(f"Expanded {len(hits)} hits to {len(expanded)} chunks with ±{window} neighbours")
+        return expanded
+    except Exception as e:
+        logger.warning(f"Neighbour expansion failed, using the hits only: {e}")
+        return list(hits)
+
+def format_timeframe(payload: dict) -> str:
+    """
+    Format the start_s/end_s payload of a chunk for display.
+
+    Args:
+        payload (dict): Point payload.
+
+    Returns:
+        str: e.g. '65.0s - 95.0s', or 'unknown' for chunks indexed without timestamps.
+    """
+    start_s, end_s = payload.get("start_s"), payload.get("end_s")
+    if start_s is None or end_s is None:
+        return "unknown"
+    return f"{start_s:.1f}s - {end_s:.1f}s"
 
 def build_doc_context(retrieved_points, top_k: int = 5) -> str:
     """
     Build a formatted document context string from retrieved Qdrant points for LLM input.
 
     Args:
-        retrieved_points: Result object from qdrant_client.query_points().
+        retrieved_points: Result object from qdrant_client.query_points(), or a list of
+            points/records (e.g. from a time-window lookup, which carry no score).
         top_k (int): Number of top retrieved points to include in the context.
 
     Returns:
@@ -64,18 +324,21 @@ def build_doc_context(retrieved_points, top_k: int = 5) -> str:
     """
     try:
         doc_context = ""
+        points = retrieved_points.points if hasattr(retrieved_points, "points") else retrieved_points
     
-        for point in retrieved_points.points[:top_k]:
+        for point in points[:top_k]:
             payload = point.payload
-            score = point.score
+            score = getattr(point, "score", None)
             summary = payload.get("summary", "")
             text = payload.get("text", "")
             topics = payload.get("topics", "")
-            doc_type = payload.get("store_type", "")
+            doc_type = payload.get("type", "")
+            score_line = f"**Relevance Score:** {score:.4f}\n" if score is not None else ""
     
             context_block = (
                 f"### Document Type: {doc_type}\n"
-                f"**Relevance Score:** {score:.4f}\n\n"
+                f"**Timeframe:** {format_timeframe(payload)}\n"
+                f"{score_line}\n"
                 f"**Summary:** {summary}\n\n"
                 f"**Topics:** {', '.join(topics) if isinstance(topics, list) else topics}\n\n"
                 f"**Transcript Text:**\n{text}\n"
@@ -88,7 +351,119 @@ def build_doc_context(retrieved_points, top_k: int = 5) -> str:
     except Exception as e:
         logger.error(f"Error while building the document context: {e}")
 
-def generate_rag_response(doc_context: str, user_query: str, processor, model):
+def extract_chunk_text(payload: dict) -> str:
+    """
+    Get the raw transcript/frame text of a chunk without the embedded summary header.
+
+    index_chunks_to_qdrant stores 'Summary: ...\\nTopics: ...\\n---\\n<text>' as the
+    'text' payload; summary and topics are separate payload fields already.
+
+    Args:
+        payload (dict): Point payload.
+
+    Returns:
+        str: Chunk text only.
+    """
+    text = payload.get("text", "")
+    if text.startswith("Summary:") and "\n---\n" in text:
+        return text.split("\n---\n", 1)[1].strip()
+    return text.strip()
+
+def count_tokens(tokenizer, text: str) -> int:
+    """Count tokens of a text with the generator's tokenizer (no special tokens)"""
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+def truncate_to_sentences(tokenizer, text: str, max_tokens: int) -> str:
+    """
+    Keep the leading sentences of a text that fit in max_tokens.
+
+    Args:
+        tokenizer: Generator tokenizer.
+        text (str): Text to truncate.
+        max_tokens (int): Token limit.
+
+    Returns:
+        str: Whole sentences that fit ('' if not even the first one does).
+    """
+    kept = []
+    used = 0
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        sentence_tokens = count_tokens(tokenizer, sentence + " ")
+        if used + sentence_tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += sentence_tokens
+    return " ".join(kept)
+
+def format_context_block(payload: dict, score: Optional[float], text: str) -> str:
+    """Render one chunk for the RAG prompt with each field appearing once"""
+    doc_type = payload.get("type", "")
+    topics = payload.get("topics", [])
+    header = f"### [{doc_type}] {format_timeframe(payload)}"
+    if score is not None:
+        header += f" (score {score:.4f})"
+    lines = [header, f"Summary: {payload.get('summary', '')}"]
+    if topics:
+        lines.append(f"Topics: {', '.join(topics) if isinstance(topics, list) else topics}")
+    if text:
+        lines.append(f"Text: {text}")
+    return "\n".join(lines) + "\n"
+
+def pack_doc_context(retrieved_points, tokenizer, token_budget: Optional[int] = None, min_block_tokens: int = 32) -> str:
+    """
+    Pack retrieved chunks into a prompt context that fits a token budget.
+
+    Chunks are admitted greedily: scored hits by descending score first, then
+    unscored chunks (neighbours, time-window results) in retrieval order. A chunk
+    that does not fit whole has its text cut at a sentence boundary; chunks with
+    less than min_block_tokens left are skipped. Admitted chunks are emitted in
+    their retrieval order so neighbour windows read continuously.
+
+    Args:
+        retrieved_points: query_points() result or a list of points/records.
+        tokenizer: Tokenizer of the generator model (e.g. Qwen-VL processor.tokenizer).
+        token_budget (int): Context token limit (default: settings.RAG_CONTEXT_TOKEN_BUDGET).
+        min_block_tokens (int): Smallest truncated block worth including (default: 32).
+
+    Returns:
+        str: Packed document context.
+    """
+    token_budget = token_budget or settings.RAG_CONTEXT_TOKEN_BUDGET
+    points = retrieved_points.points if hasattr(retrieved_points, "points") else (retrieved_points or [])
+
+    order = sorted(
+        range(len(points)),
+        key=lambda i: (getattr(points[i], "score", None) is None, -(getattr(points[i], "score", None) or 0.0), i),
+    )
+
+    blocks: dict[int, str] = {}
+    used = 0
+    for i in order:
+        payload = points[i].payload or {}
+        score = getattr(points[i], "score", None)
+        text = extract_chunk_text(payload)
+        block = format_context_block(payload, score, text)
+        block_tokens = count_tokens(tokenizer, block)
+
+        if used + block_tokens > token_budget:
+            # Keep the header and summary, cut the text to what still fits
+            remaining = token_budget - used - count_tokens(tokenizer, format_context_block(payload, score, ""))
+            if remaining < min_block_tokens:
+                continue
+            block = format_context_block(payload, score, truncate_to_sentences(tokenizer, text, remaining))
+            block_tokens = count_tokens(tokenizer, block)
+            if used + block_tokens > token_budget:
+                continue
+
+        blocks[i] = block
+        used += block_tokens
+
+    doc_context = "\n".join(blocks[i] for i in sorted(blocks))
+    logger.info(f"Packed {len(blocks)}/{len(points)} chunks into {used}/{token_budget} context tokens")
+    logger.debug(f"Document Context for LLM: \n{doc_context}")
+    return doc_context
+
+def generate_rag_response(doc_context: str, user_query: str, processor, model, streamer=None):
     """
     Generate an LLM response using a RAG-style QA prompt and retrieved document context.
 
@@ -97,6 +472,7 @@ def generate_rag_response(doc_context: str, user_query: str, processor, model):
         user_query (str): The user’s question or query.
         processor: The model’s processor/tokenizer for the Qwen model.
         model: The Qwen model instance.
+        streamer: Optional transformers streamer receiving the answer tokens as they are generated.
 
     Returns:
         The generated model response object.
@@ -117,59 +493,188 @@ def generate_rag_response(doc_context: str, user_query: str, processor, model):
     ]
 
     # Generate and return the model response
-    response = generate_qwen_response(processor, model, rag_messages)
+    response = generate_qwen_response(processor, model, rag_messages, streamer=streamer)
     logger.info(f"RAG Response: \n{response}")
     return response
 
-def get_summary_chunks(qdrant_client, collection_name: str, match_type: str) -> str:
+async def agenerate_rag_response(doc_context: str, user_query: str, processor, model, streamer=None):
+    """Async variant of generate_rag_response() that runs on the model's inference lane"""
+    return await inference_executor.run(model, generate_rag_response, doc_context, user_query, processor, model, streamer)
+
+def iter_scroll_points(qdrant_client, collection_name: str, scroll_filter: Optional[models.Filter] = None, payload_fields: Optional[list[str]] = None, page_size: Optional[int] = None) -> Iterator[models.Record]:
     """
-    Retrieve and combine summaries (and topics) from Qdrant based on sequence order.
+    Stream every point matching a filter, following scroll pagination to the end.
+    
+    Only one page is held in memory at a time and vectors are never transferred.
     
     Args:
         qdrant_client: Active Qdrant client instance.
         collection_name (str): Name of the Qdrant collection.
+        scroll_filter (models.Filter): Optional filter applied to the scroll.
+        payload_fields (list[str]): Payload keys to return (default: full payload).
+        page_size (int): Points per scroll request (default: settings.QDRANT_SCROLL_PAGE_SIZE).
+    
+    Yields:
+        models.Record: Matching points, page by page.
+    """
+    page_size = page_size or settings.QDRANT_SCROLL_PAGE_SIZE
+    with_payload = payload_fields if payload_fields is not None else True
+    offset = None
+    
+    while True:
+        points, next_page_offset = qdrant_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=False,
+        )
+        yield from points
+        
+        if next_page_offset is None:
+            break
+        offset = next_page_offset
+
+async def aiter_scroll_points(async_qdrant_client, collection_name: str, scroll_filter: Optional[models.Filter] = None, payload_fields: Optional[list[str]] = None, page_size: Optional[int] = None) -> AsyncIterator[models.Record]:
+    """
+    Async variant of iter_scroll_points() for an AsyncQdrantClient.
+    
+    Args:
+        async_qdrant_client: Active async Qdrant client instance.
+        collection_name (str): Name of the Qdrant collection.
+        scroll_filter (models.Filter): Optional filter applied to the scroll.
+        payload_fields (list[str]): Payload keys to return (default: full payload).
+        page_size (int): Points per scroll request (default: settings.QDRANT_SCROLL_PAGE_SIZE).
+    
+    Yields:
+        models.Record: Matching points, page by page.
+    """
+    page_size = page_size or settings.QDRANT_SCROLL_PAGE_SIZE
+    with_payload = payload_fields if payload_fields is not None else True
+    offset = None
+    
+    while True:
+        points, next_page_offset = await async_qdrant_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=False,
+        )
+        for point in points:
+            yield point
+        
+        if next_page_offset is None:
+            break
+        offset = next_page_offset
+
+def build_summary_filter(collection_name: str, match_type: str) -> Optional[models.Filter]:
+    """
+    Build the scroll filter selecting one chunk type of a video.
+    
+    Args:
+        collection_name (str): Name of the video collection.
         match_type (str): The 'type' value to match (e.g., 'txt', 'img').
     
     Returns:
-        str: Combined summary string in sequence order.
+        models.Filter: Tenant-scoped type filter.
     """
-    # Scroll through collection
-    retrieval_record = qdrant_client.scroll(
-        collection_name=collection_name,
-        scroll_filter=models.Filter(
-            must=[
-                models.FieldCondition(
-                    key="type",
-                    match=models.MatchValue(value=match_type)
-                )
-            ]
-        ),
+    return build_tenant_filter(
+        collection_name,
+        [
+            models.FieldCondition(
+                key="type",
+                match=models.MatchValue(value=match_type)
+            )
+        ]
     )
 
-    logger.info("\nRetrieval Points:")
-    retrieval_points = retrieval_record[0]
-    logger.info(retrieval_points)
+def format_summary_chunk(point: models.Record) -> tuple[int, str]:
+    """
+    Format one scrolled point as a summary line keyed by its sequence index.
+    
+    Args:
+        point (models.Record): Point with 'summary', 'topics' and 'sequence_index' payload.
+    
+    Returns:
+        tuple[int, str]: (sequence_index, formatted summary line)
+    """
+    payload = point.payload
+    summary = payload.get("summary", "").strip()
+    topics = payload.get("topics", [])
+    seq_index = payload.get("sequence_index", 0)
+    return seq_index, f"[Seq {seq_index}] {summary}\nTopics: {', '.join(topics)}"
 
-    # Sort by sequence index
-    sorted_retrieval_points = sorted(
-        retrieval_points, key=lambda p: p.payload.get("sequence_index", 0)
-    )
+def join_summary_chunks(indexed_chunks: list[tuple[int, str]]) -> str:
+    """
+    Sort formatted summary lines by sequence index and join them.
+    
+    Args:
+        indexed_chunks (list[tuple[int, str]]): Output of format_summary_chunk() per point.
+    
+    Returns:
+        str: Combined summary string in sequence order.
+    """
+    indexed_chunks.sort(key=lambda chunk: chunk[0])
 
-    logger.info("\nCheck (sorted by sequence index):")
+    txt_summary_chunks = [formatted for _, formatted in indexed_chunks]
+    for idx, formatted in enumerate(txt_summary_chunks, start=1):
+        logger.debug(f"Chunk {idx}:\n{formatted}\n")
 
-    # Build combined summaries + topics
-    txt_summary_chunks = []
-    for idx, point in enumerate(sorted_retrieval_points, start=1):
-        payload = point.payload
-        summary = payload.get("summary", "").strip()
-        topics = payload.get("topics", [])
-        seq_index = payload.get("sequence_index", idx)
+    return "\n\n".join(txt_summary_chunks)
 
-        formatted = f"[Seq {seq_index}] {summary}\nTopics: {', '.join(topics)}"
-        txt_summary_chunks.append(formatted)
-        logger.info(f" Seq {seq_index} | Chunk {idx}:\n{formatted}\n")
+def get_summary_chunks(qdrant_client, collection_name: str, match_type: str) -> str:
+    """
+    Retrieve and combine summaries (and topics) from Qdrant based on sequence order.
+    
+    Scrolls through every matching point of the collection, so long videos are
+    summarized in full rather than from the first page only.
+    
+    Args:
+        qdrant_client: Active Qdrant client instance.
+        collection_name (str): Name of the video collection.
+        match_type (str): The 'type' value to match (e.g., 'txt', 'img').
+    
+    Returns:
+        str: Combined summary string in sequence order.
+    """
+    # Keep only the formatted lines, not the point objects
+    indexed_chunks = [
+        format_summary_chunk(point)
+        for point in iter_scroll_points(
+            qdrant_client,
+            resolve_collection_name(collection_name),
+            scroll_filter=build_summary_filter(collection_name, match_type),
+            payload_fields=["summary", "topics", "sequence_index"],
+        )
+    ]
 
-    logger.info("\nSummary Chunks (in sequence order):")
-    logger.info(txt_summary_chunks)
+    logger.info(f"Retrieved {len(indexed_chunks)} '{match_type}' chunks from '{collection_name}'")
+    return join_summary_chunks(indexed_chunks)
 
-    return "\n\n".join(txt_summary_chunks)
+async def aget_summary_chunks(async_qdrant_client, collection_name: str, match_type: str) -> str:
+    """
+    Async variant of get_summary_chunks() for an AsyncQdrantClient.
+    
+    Args:
+        async_qdrant_client: Active async Qdrant client instance.
+        collection_name (str): Name of the video collection.
+        match_type (str): The 'type' value to match (e.g., 'txt', 'img').
+    
+    Returns:
+        str: Combined summary string in sequence order.
+    """
+    indexed_chunks = [
+        format_summary_chunk(point)
+        async for point in aiter_scroll_points(
+            async_qdrant_client,
+            resolve_collection_name(collection_name),
+            scroll_filter=build_summary_filter(collection_name, match_type),
+            payload_fields=["summary", "topics", "sequence_index"],
+        )
+    ]
+
+    logger.info(f"Retrieved {len(indexed_chunks)} '{match_type}' chunks from '{collection_name}'")
+    return join_summary_chunks(indexed_chunks)
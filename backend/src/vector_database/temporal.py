@@ -0,0 +1,257 @@
+"""
+Temporal Retrieval
+Parses time references in user questions ("at the beginning", "after minute 10")
+and looks up the chunks of that time window with a filtered scroll
+"""
+import logging
+import re
+from typing import NamedTuple, Optional
+from qdrant_client import models
+from config.service_config import settings
+from src.vector_database.qdrant_client import resolve_collection_name, build_tenant_filter
+
+logger = logging.getLogger(__name__)
+
+class TemporalRange(NamedTuple):
+    """
+    Time range referenced by a question.
+
+    With from_end=False, start_s/end_s are seconds from the start of the video
+    (None = open). With from_end=True they are seconds before the end of the
+    video, so (120, 0) means "the last two minutes".
+    """
+    start_s: Optional[float]
+    end_s: Optional[float]
+    from_end: bool = False
+
+_UNIT_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0}
+
+# Only full unit words count as time units: "10 s" or "2 m" usually name something else
+_UNIT = r"(?:hours?|minutes?|seconds?)"
+
+# A time value: "10:30" (mm:ss or h:mm:ss), "minute 10" or "10 minutes"
+_CLOCK = r"(?P<{name}_clock>\d{{1,2}}:\d{{2}}(?::\d{{2}})?)"
+_UNIT_FIRST = r"(?P<{name}_ufirst>hour|minute|second)\s+(?P<{name}_ufirst_n>\d+(?:\.\d+)?)\b"
+_UNIT_LAST = r"(?P<{name}_ulast_n>\d+(?:\.\d+)?)[\s-]*(?P<{name}_ulast>" + _UNIT + r")\b"
+
+def _time_value(name: str) -> str:
+    return "(?:" + "|".join(p.format(name=name) for p in (_CLOCK, _UNIT_FIRST, _UNIT_LAST)) + ")"
+
+_T = _time_value("t")
+_A = _time_value("a")
+_B = _time_value("b")
+_BETWEEN_B = r"(?P<b_bare>\d+(?:\.\d+)?)\b(?!:)"
+
+# What a question can refer to as a whole ("the end of the video")
+_MEDIA = r"(?:video|meeting|recording|call|talk|session|clip|presentation|webinar|interview)"
+
+# Only explicit anchors: a bare number or a time value elsewhere in the sentence
+# ("the 10 second rule", "a 5 minute break") is not a reference to the video timeline
+_PATTERNS = [
+    ("between", re.compile(rf"\bbetween\s+{_A}\s+and\s+(?:{_B}|{_BETWEEN_B})", re.I)),
+    ("between_bare", re.compile(rf"\bbetween\s+(?P<a_n>\d+(?:\.\d+)?)\s+and\s+(?P<b_n>\d+(?:\.\d+)?)\s*(?P<unit>{_UNIT})\b", re.I)),
+    ("first", re.compile(rf"\b(?:in|during|within)\s+the\s+first\s+{_T}", re.I)),
+    ("last", re.compile(rf"\b(?:in|during|within)\s+the\s+(?:last|final)\s+{_T}", re.I)),
+    ("after", re.compile(rf"\bafter\s+(?:the\s+)?{_T}", re.I)),
+    ("before", re.compile(rf"\bbefore\s+(?:the\s+)?{_T}", re.I)),
+    ("at", re.compile(rf"\b(?:at(?:\s+the)?|around\s+the)\s+{_T}", re.I)),
+    ("at", re.compile(rf"\b{_UNIT_FIRST.format(name='t')}\s+of\b", re.I)),
+    # "at the start" alone may be the start of anything ("... at the start of the project?"):
+    # the bare form only counts when no other "of the <noun>" follows it
+    ("beginning", re.compile(rf"\b(?:beginning|start)\s+of\s+the\s+{_MEDIA}\b|\b(?:at|in|near|towards?)\s+the\s+(?:very\s+)?(?:beginning|start)\b(?!\s+of\b)", re.I)),
+    ("end", re.compile(rf"\bend\s+of\s+the\s+{_MEDIA}\b|\b(?:at|near|towards?|by)\s+the\s+(?:very\s+)?end\b(?!\s+of\b)", re.I)),
+]
+
+def _unit_seconds(unit: Optional[str]) -> float:
+    """Map a unit word ('minute', 'seconds', 'hours', ...) to seconds (default: minutes)"""
+    return _UNIT_SECONDS.get((unit or "m")[0].lower(), 60.0)
+
+def _parse_time_value(match: re.Match, name: str) -> Optional[float]:
+    """Read the time value captured under the given group prefix, in seconds"""
+    groups = match.groupdict()
+    if groups.get(f"{name}_clock"):
+        parts = [int(p) for p in groups[f"{name}_clock"].split(":")]
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + part
+        # "10:30" reads as minutes:seconds, "1:10:30" as hours:minutes:seconds
+        return seconds
+    if groups.get(f"{name}_ufirst_n"):
+        return float(groups[f"{name}_ufirst_n"]) * _unit_seconds(groups[f"{name}_ufirst"])
+    if groups.get(f"{name}_ulast_n"):
+        return float(groups[f"{name}_ulast_n"]) * _unit_seconds(groups[f"{name}_ulast"])
+    return None
+
+def parse_temporal_reference(user_query: str) -> Optional[TemporalRange]:
+    """
+    Extract the time range a question refers to.
+
+    Args:
+        user_query: The user question
+
+    Returns:
+        TemporalRange: Referenced range, or None if the question is not time-anchored
+
+    Example:
+        >>> parse_temporal_reference("What happens after minute 10?")
+        TemporalRange(start_s=600.0, end_s=None, from_end=False)
+        >>> parse_temporal_reference("What did they say at the end?")
+        TemporalRange(start_s=120.0, end_s=0.0, from_end=True)
+    """
+    edge_window = settings.TEMPORAL_EDGE_WINDOW_S
+    point_window = settings.TEMPORAL_POINT_WINDOW_S
+
+    for kind, pattern in _PATTERNS:
+        match = pattern.search(user_query)
+        if not match:
+            continue
+
+        if kind == "between":
+            start = _parse_time_value(match, "a")
+            end = _parse_time_value(match, "b")
+            if end is None and match.group("b_bare"):
+                # "between minute 5 and 10": the second bound takes the unit of the first
+                end = float(match.group("b_bare")) * _unit_seconds(match.group("a_ufirst") or match.group("a_ulast"))
+            if start is None or end is None:
+                continue
+            temporal_range = TemporalRange(min(start, end), max(start, end))
+        elif kind == "between_bare":
+            unit = _unit_seconds(match.group("unit"))
+            start, end = float(match.group("a_n")) * unit, float(match.group("b_n")) * unit
+            temporal_range = TemporalRange(min(start, end), max(start, end))
+        elif kind == "beginning":
+            temporal_range = TemporalRange(0.0, edge_window)
+        elif kind == "end":
+            temporal_range = TemporalRange(edge_window, 0.0, from_end=True)
+        else:
+            value = _parse_time_value(match, "t")
+            if value is None:
+                continue
+            if kind == "first":
+                temporal_range = TemporalRange(0.0, value)
+            elif kind == "last":
+                temporal_range = TemporalRange(value, 0.0, from_end=True)
+            elif kind == "after":
+                temporal_range = TemporalRange(value, None)
+            elif kind == "before":
+                temporal_range = TemporalRange(0.0, value)
+            else:
+                temporal_range = TemporalRange(max(0.0, value - point_window), value + point_window)
+
+        logger.info(f"Parsed temporal reference '{match.group(0)}' -> {temporal_range}")
+        return temporal_range
+
+    return None
+
+def resolve_time_window(temporal_range: TemporalRange, video_duration_s: Optional[float] = None) -> Optional[tuple[float, Optional[float]]]:
+    """
+    Convert a TemporalRange to absolute seconds from the start of the video.
+
+    Args:
+        temporal_range: Parsed range
+        video_duration_s: Video length, required for ranges counted from the end
+
+    Returns:
+        tuple[float, float | None]: (start_s, end_s), or None if the duration is needed but unknown
+    """
+    if not temporal_range.from_end:
+        return temporal_range.start_s or 0.0, temporal_range.end_s
+    if video_duration_s is None:
+        return None
+    start_s = max(0.0, video_duration_s - (temporal_range.start_s or video_duration_s))
+    end_s = video_duration_s - (temporal_range.end_s or 0.0)
+    return start_s, end_s
+
+def build_time_window_filter(collection_name: str, start_s: float, end_s: Optional[float] = None, match_type: Optional[str] = None) -> models.Filter:
+    """
+    Build a filter selecting chunks that overlap a time window.
+
+    Args:
+        collection_name: Video collection name (scoped to its tenant in multi-tenant mode)
+        start_s: Window start in seconds
+        end_s: Window end in seconds (None = until the end of the video)
+        match_type: Restrict to one chunk type (e.g., 'txt'); None for all types
+
+    Returns:
+        models.Filter: Tenant-scoped overlap filter on the start_s/end_s payload
+    """
+    # Strict bounds so chunks that only touch the window edge are excluded
+    conditions = [models.FieldCondition(key="end_s", range=models.Range(gt=start_s))]
+    if end_s is not None:
+        conditions.append(models.FieldCondition(key="start_s", range=models.Range(lt=end_s)))
+    if match_type:
+        conditions.append(models.FieldCondition(key="type", match=models.MatchValue(value=match_type)))
+    return build_tenant_filter(collection_name, conditions)
+
+def _build_duration_scroll(collection_name: str) -> dict:
+    """scroll() arguments returning the chunk with the largest end_s"""
+    return dict(
+        collection_name=resolve_collection_name(collection_name),
+        scroll_filter=build_time_window_filter(collection_name, 0.0),
+        limit=1,
+        order_by=models.OrderBy(key="end_s", direction=models.Direction.DESC),
+        with_payload=["end_s"],
+        with_vectors=False,
+    )
+
+def _build_window_scroll(collection_name: str, window: tuple[float, Optional[float]], limit: int, match_type: Optional[str]) -> dict:
+    """scroll() arguments returning the chunks of a window in time order"""
+    return dict(
+        collection_name=resolve_collection_name(collection_name),
+        scroll_filter=build_time_window_filter(collection_name, window[0], window[1], match_type),
+        limit=limit,
+        order_by=models.OrderBy(key="start_s", direction=models.Direction.ASC),
+        with_payload=True,
+        with_vectors=False,
+    )
+
+def get_video_duration(qdrant_client, collection_name: str) -> Optional[float]:
+    """
+    Get a video's length from the latest chunk end time.
+
+    Args:
+        qdrant_client: Active Qdrant client instance
+        collection_name: Video collection name
+
+    Returns:
+        float: Duration in seconds, or None if no chunk carries timestamps
+    """
+    points, _ = qdrant_client.scroll(**_build_duration_scroll(collection_name))
+    return float(points[0].payload["end_s"]) if points else None
+
+async def aget_video_duration(async_qdrant_client, collection_name: str) -> Optional[float]:
+    """Async variant of get_video_duration()"""
+    points, _ = await async_qdrant_client.scroll(**_build_duration_scroll(collection_name))
+    return float(points[0].payload["end_s"]) if points else None
+
+def get_time_window_points(qdrant_client, collection_name: str, temporal_range: TemporalRange, limit: Optional[int] = None, match_type: Optional[str] = None) -> list[models.Record]:
+    """
+    Fetch the chunks of a time window with a filtered, time-ordered scroll.
+
+    Args:
+        qdrant_client: Active Qdrant client instance
+        collection_name: Video collection name
+        temporal_range: Range parsed from the question
+        limit: Maximum chunks to return (default: settings.TEMPORAL_MAX_CHUNKS)
+        match_type: Restrict to one chunk type; None for transcript and frame chunks
+
+    Returns:
+        list[models.Record]: Chunks overlapping the window, earliest first
+    """
+    duration = get_video_duration(qdrant_client, collection_name) if temporal_range.from_end else None
+    window = resolve_time_window(temporal_range, duration)
+    if window is None:
+        return []
+    points, _ = qdrant_client.scroll(**_build_window_scroll(collection_name, window, limit or settings.TEMPORAL_MAX_CHUNKS, match_type))
+    logger.info(f"Retrieved {len(points)} chunks in window {window} from '{collection_name}'")
+    return points
+
+async def aget_time_window_points(async_qdrant_client, collection_name: str, temporal_range: TemporalRange, limit: Optional[int] = None, match_type: Optional[str] = None) -> list[models.Record]:
+    """Async variant of get_time_window_points()"""
+    duration = await aget_video_duration(async_qdrant_client, collection_name) if temporal_range.from_end else None
+    window = resolve_time_window(temporal_range, duration)
+    if window is None:
+        return []
+    points, _ = await async_qdrant_client.scroll(**_build_window_scroll(collection_name, window, limit or settings.TEMPORAL_MAX_CHUNKS, match_type))
+    logger.info(f"Retrieved {len(points)} chunks in window {window} from '{collection_name}'")
+    return points
@@ -2,15 +2,29 @@
 Vector Store Operations for Qdrant
 Handles point creation, upserting, and semantic search operations
 """
+from typing import AsyncIterable, Iterable, Iterator, Optional
+from qdrant_client import models
 from qdrant_client.models import PointStruct
 from langchain_qdrant import FastEmbedSparse
-from src.vector_database.qdrant_client import get_or_create_collection
-from uuid import uuid4
+from config.service_config import settings
+from src.vector_database.qdrant_client import (
+    get_or_create_collection, aget_or_create_collection, resolve_collection_name, build_tenant_filter,
+    get_collection_registry, is_collection_not_found
+)
+from src.vector_database.retrieval_cache import retrieval_cache
+from src.vector_database.backends import get_backend_capabilities
+from src.llm.executor import inference_executor
+from uuid import UUID, uuid4, uuid5
+import hashlib
 import torch
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# UUIDv5 namespace for content-derived point IDs (must never change, or re-indexing stops being idempotent)
+POINT_ID_NAMESPACE = UUID("6f1c2b0e-5d0a-4a8e-9c39-7f3f2b8f1d44")
+
 def build_dense_embedding(tokenizer, dense_embedding_model, text: str) -> list[float]:
     """
     Generate dense vector embedding using Hugging Face transformer model
@@ -33,6 +47,22 @@ def build_dense_embedding(tokenizer, dense_embedding_model, text: str) -> list[f
     
     return embeddings[0].tolist()
 
+async def abuild_dense_embedding(tokenizer, dense_embedding_model, text: str) -> list[float]:
+    """Async variant of build_dense_embedding() that runs on the embedding model's inference lane"""
+    return await inference_executor.run(dense_embedding_model, build_dense_embedding, tokenizer, dense_embedding_model, text)
+
+def get_dense_vector_size(dense_embedding_model) -> int:
+    """
+    Get the output dimension of a dense embedding model
+    
+    Args:
+        dense_embedding_model: Loaded transformer model (e.g., BGE, E5)
+    
+    Returns:
+        int: Dense embedding size (e.g., 384 for bge-small-en-v1.5)
+    """
+    return dense_embedding_model.config.hidden_size
+
 def build_sparse_embedding(text: str) -> dict:
     """
     Generate sparse BM25 embedding for text
@@ -47,7 +77,41 @@ def build_sparse_embedding(text: str) -> dict:
     embeddings = sparse_embedding_model.embed_query(text)
     return embeddings
 
-def build_qdrant_point(dense_vector: list[float], sparse_vector: dict, payload: dict) -> PointStruct:
+def compute_content_hash(text: str) -> str:
+    """
+    Compute a stable hash of the text that gets embedded for a chunk
+    
+    Args:
+        text: Embedding input text (summary, topics and transcript)
+    
+    Returns:
+        str: SHA-256 hex digest of the text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def build_point_id(collection_name: str, store_type: str, sequence_index: int, content_hash: str) -> str:
+    """
+    Derive a deterministic point ID from the chunk identity and content
+    
+    The same chunk indexed twice into the same collection gets the same ID, so
+    re-indexing overwrites points instead of appending duplicates.
+    
+    Args:
+        collection_name: Target collection name
+        store_type: Payload 'type' value of the chunk (e.g., 'txt', 'img')
+        sequence_index: 1-based position of the chunk in the video
+        content_hash: Hash of the embedded text (see compute_content_hash)
+    
+    Returns:
+        str: UUIDv5 string usable as a Qdrant point ID
+    
+    Example:
+        >>> build_point_id("weekly_meeting", "txt", 1, compute_content_hash("Hello")) == build_point_id("weekly_meeting", "txt", 1, compute_content_hash("Hello"))
+        True
+    """
+    return str(uuid5(POINT_ID_NAMESPACE, f"{collection_name}/{store_type}/{sequence_index}/{content_hash}"))
+
+def build_qdrant_point(dense_vector: list[float], sparse_vector: dict, payload: dict, point_id: Optional[str] = None) -> PointStruct:
     """
     Create Qdrant point with hybrid dense and sparse vectors
     
@@ -55,6 +119,7 @@ def build_qdrant_point(dense_vector: list[float], sparse_vector: dict, payload:
         dense_vector: Dense embedding vector (e.g., 384-dim from BGE)
         sparse_vector: Sparse embedding with 'indices' and 'values' attributes
         payload: Metadata dictionary to store with the point
+        point_id: Point ID to use (default: random UUIDv4)
     
     Returns:
         PointStruct: Qdrant point ready for upload
@@ -64,7 +129,7 @@ def build_qdrant_point(dense_vector: list[float], sparse_vector: dict, payload:
     """
     try:
         point = PointStruct(
-            id=str(uuid4()),
+            id=point_id or str(uuid4()),
             vector={
                 "dense_embedding": dense_vector,
                 "sparse_embedding": {
@@ -79,68 +144,331 @@ def build_qdrant_point(dense_vector: list[float], sparse_vector: dict, payload:
         logger.error(f"Failed to build Qdrant point: {e}")
         raise
 
-def upsert_qdrant_points(qdrant_client, collection_name: str, points: list[PointStruct]) -> None:
+def get_existing_point_ids(qdrant_client, collection_name: str, point_ids: list[str]) -> set[str]:
     """
-    Upload or update points in Qdrant collection
+    Look up which of the given point IDs are already stored in a collection
+    
+    Args:
+        qdrant_client: Initialized Qdrant client instance
+        collection_name: Collection to check
+        point_ids: Candidate point IDs
+    
+    Returns:
+        set[str]: Subset of point_ids that already exist (empty set on lookup failure)
+    """
+    if not point_ids:
+        return set()
+    try:
+        records = qdrant_client.retrieve(
+            collection_name=collection_name,
+            ids=point_ids,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return {str(record.id) for record in records}
+    except Exception as e:
+        logger.warning(f"Could not look up existing points in '{collection_name}', re-embedding all chunks: {e}")
+        return set()
+
+async def aget_existing_point_ids(async_qdrant_client, collection_name: str, point_ids: list[str]) -> set[str]:
+    """Async variant of get_existing_point_ids()"""
+    if not point_ids:
+        return set()
+    try:
+        records = await async_qdrant_client.retrieve(
+            collection_name=collection_name,
+            ids=point_ids,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return {str(record.id) for record in records}
+    except Exception as e:
+        logger.warning(f"Could not look up existing points in '{collection_name}', re-embedding all chunks: {e}")
+        return set()
+
+def build_stale_points_filter(collection_name: str, store_type: str, keep_point_ids: list[str]) -> models.Filter:
+    """
+    Build the filter matching points of a store type that are not in keep_point_ids
+    
+    Args:
+        collection_name: Video collection name (scoped to its tenant in multi-tenant mode)
+        store_type: Payload 'type' value to clean up (e.g., 'txt', 'img')
+        keep_point_ids: IDs produced by the latest indexing run
+    
+    Returns:
+        models.Filter: Filter selecting the stale points
+    """
+    stale_filter = build_tenant_filter(
+        collection_name,
+        [models.FieldCondition(key="type", match=models.MatchValue(value=store_type))]
+    )
+    stale_filter.must_not = [models.HasIdCondition(has_id=keep_point_ids)]
+    return stale_filter
+
+def delete_stale_points(qdrant_client, collection_name: str, store_type: str, keep_point_ids: list[str], wait: bool = True) -> None:
+    """
+    Delete points of a store type that are not part of the latest indexing run
+    
+    Removes chunks whose content changed (their ID changed with the content hash)
+    or that no longer exist because the video now has fewer chunks.
+    
+    Args:
+        qdrant_client: Initialized Qdrant client instance
+        collection_name: Video collection name (scoped to its tenant in multi-tenant mode)
+        store_type: Payload 'type' value to clean up (e.g., 'txt', 'img')
+        keep_point_ids: IDs produced by the latest indexing run
+        wait: Block until the deletion is applied (default: True)
+    """
+    qdrant_client.delete(
+        collection_name=resolve_collection_name(collection_name),
+        points_selector=models.FilterSelector(filter=build_stale_points_filter(collection_name, store_type, keep_point_ids)),
+        wait=wait,
+    )
+
+def build_session_payload_update(collection_name: str, point_ids: set[str], session_id: str, wait: bool = True) -> dict:
+    """
+    Build the set_payload() arguments recording the indexing session on unchanged points
+    
+    Unchanged chunks are not rewritten, so without this their points would keep the
+    tenant key of the session that first indexed them.
+    
+    Args:
+        collection_name: Video collection name (resolved to a shared collection in multi-tenant mode)
+        point_ids: IDs of the points skipped as unchanged
+        session_id: Chat session of the current indexing run
+        wait: Block until the update is applied (default: True)
+    
+    Returns:
+        dict: Keyword arguments for qdrant_client.set_payload()
+    """
+    return dict(
+        collection_name=resolve_collection_name(collection_name),
+        payload={"session_id": session_id},
+        points=list(point_ids),
+        wait=wait,
+    )
+
+async def adelete_stale_points(async_qdrant_client, collection_name: str, store_type: str, keep_point_ids: list[str], wait: bool = True) -> None:
+    """Async variant of delete_stale_points()"""
+    await async_qdrant_client.delete(
+        collection_name=resolve_collection_name(collection_name),
+        points_selector=models.FilterSelector(filter=build_stale_points_filter(collection_name, store_type, keep_point_ids)),
+        wait=wait,
+    )
+
+def iter_point_batches(points: Iterable[PointStruct], batch_size: int) -> Iterator[list[PointStruct]]:
+    """
+    Group a stream of points into fixed-size batches without materialising the stream
+    
+    Args:
+        points: Iterable of PointStruct objects
+        batch_size: Maximum number of points per batch
+    
+    Yields:
+        list[PointStruct]: Next batch of points
+    """
+    batch = []
+    for point in points:
+        batch.append(point)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def upsert_qdrant_points(qdrant_client, collection_name: str, points: Iterable[PointStruct], batch_size: int = None, parallel: int = None, wait: bool = True) -> float:
+    """
+    Upload or update points in Qdrant collection in streamed batches
+    
+    With a single worker, batches are pipelined with wait=False and only the last
+    batch honours `wait`. Qdrant applies updates to a shard in order, so waiting on
+    the last batch also guarantees every earlier batch is visible to searches.
+    With more than one worker, points are handed to `upload_points`, which fans
+    batches out over worker processes.
     
     Args:
         qdrant_client: Initialized Qdrant client instance
         collection_name: Target collection name
-        points: List of PointStruct objects to upsert
+        points: Iterable of PointStruct objects to upsert (list or generator)
+        batch_size: Points per request (default: settings.QDRANT_UPSERT_BATCH_SIZE)
+        parallel: Number of upload workers (default: settings.QDRANT_UPSERT_PARALLEL)
+        wait: True if the caller needs read-your-writes once this returns,
+              False to return as soon as Qdrant has acknowledged the batches
+    
+    Returns:
+        float: Upload throughput in points per second
         
     Raises:
         Exception: If upsert operation fails
     """
+    batch_size = batch_size or settings.QDRANT_UPSERT_BATCH_SIZE
+    parallel = parallel or settings.QDRANT_UPSERT_PARALLEL
+    if parallel > 1 and not get_backend_capabilities().parallel_upload:
+        parallel = 1
+    
+    total_points = 0
+    def counted(stream):
+        nonlocal total_points
+        for point in stream:
+            total_points += 1
+            yield point
+    
     try:
-        qdrant_client.upsert(
-            collection_name=collection_name,
-            points=points,
+        start_time = time.perf_counter()
+        
+        if parallel > 1:
+            qdrant_client.upload_points(
+                collection_name=collection_name,
+                points=counted(points),
+                batch_size=batch_size,
+                parallel=parallel,
+                wait=wait,
+            )
+        else:
+            pending_batch = None
+            for batch in iter_point_batches(counted(points), batch_size):
+                if pending_batch is not None:
+                    qdrant_client.upsert(collection_name=collection_name, points=pending_batch, wait=False)
+                pending_batch = batch
+            if pending_batch is not None:
+                qdrant_client.upsert(collection_name=collection_name, points=pending_batch, wait=wait)
+        
+        elapsed = time.perf_counter() - start_time
+        points_per_second = total_points / elapsed if elapsed > 0 else float(total_points)
+        logger.info(
+            f"Successfully upserted {total_points} points to '{collection_name}' "
+            f"in {elapsed:.2f}s ({points_per_second:.1f} points/s, batch_size={batch_size}, "
+            f"parallel={parallel}, wait={wait})"
         )
-        logger.info(f"Successfully upserted {len(points)} points to '{collection_name}'")
+        return points_per_second
     except Exception as e:
         logger.error(f"Failed to upsert points to '{collection_name}': {e}")
         raise
 
-def index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks: list[dict], dense_tokenizer, dense_embedding_model, store_type: str) -> int:
+async def aiter_point_batches(points: Iterable[PointStruct] | AsyncIterable[PointStruct], batch_size: int):
+    """Async variant of iter_point_batches() that also accepts async iterables"""
+    if not hasattr(points, "__aiter__"):
+        for batch in iter_point_batches(points, batch_size):
+            yield batch
+        return
+    batch = []
+    async for point in points:
+        batch.append(point)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def aupsert_qdrant_points(async_qdrant_client, collection_name: str, points: Iterable[PointStruct] | AsyncIterable[PointStruct], batch_size: int = None, wait: bool = True) -> float:
     """
-    Index transcript/image chunks into Qdrant with hybrid embeddings
+    Async variant of upsert_qdrant_points() for an AsyncQdrantClient
+    
+    Batches are pipelined with wait=False and only the last batch honours `wait`,
+    as in the single-worker sync path. Requests are awaited one after another so
+    Qdrant still receives them in order.
     
     Args:
-        qdrant_client: Initialized Qdrant client
+        async_qdrant_client: Initialized async Qdrant client instance
         collection_name: Target collection name
-        summary_chunks: List of dicts with 'text', 'summary', 'topics' keys
-        dense_tokenizer: Tokenizer for dense embedding model
-        dense_embedding_model: Loaded dense embedding model
+        points: Iterable or async iterable of PointStruct objects
+        batch_size: Points per request (default: settings.QDRANT_UPSERT_BATCH_SIZE)
+        wait: True if the caller needs read-your-writes once this returns
     
     Returns:
-        int: Number of successfully indexed chunks
-        
-    Note:
-        Creates collection if it doesn't exist
+        float: Upload throughput in points per second
         
     Raises:
-        Exception: If collection creation or indexing fails
+        Exception: If upsert operation fails
     """
+    batch_size = batch_size or settings.QDRANT_UPSERT_BATCH_SIZE
+    
     try:
-        get_or_create_collection(qdrant_client, collection_name)
+        start_time = time.perf_counter()
+        total_points = 0
+        pending_batch = None
+        async for batch in aiter_point_batches(points, batch_size):
+            if pending_batch is not None:
+                await async_qdrant_client.upsert(collection_name=collection_name, points=pending_batch, wait=False)
+            pending_batch = batch
+            total_points += len(batch)
+        if pending_batch is not None:
+            await async_qdrant_client.upsert(collection_name=collection_name, points=pending_batch, wait=wait)
+        
+        elapsed = time.perf_counter() - start_time
+        points_per_second = total_points / elapsed if elapsed > 0 else float(total_points)
+        logger.info(
+            f"Successfully upserted {total_points} points to '{collection_name}' "
+            f"in {elapsed:.2f}s ({points_per_second:.1f} points/s, batch_size={batch_size}, wait={wait})"
+        )
+        return points_per_second
     except Exception as e:
-        logger.error(f"Failed to create or get collection '{collection_name}': {e}")
+        logger.error(f"Failed to upsert points to '{collection_name}': {e}")
         raise
+
+def build_chunk_entries(collection_name: str, summary_chunks: list[dict], store_type: str) -> list[dict]:
+    """
+    Derive the embedding text, timeframe, content hash and point ID of every chunk
+    
+    IDs are computed before any embedding so unchanged chunks can skip it entirely.
     
-    logger.info(f"Building Qdrant points for collection '{collection_name}'")
+    Args:
+        collection_name: Video collection name
+        summary_chunks: List of dicts with 'text', 'summary', 'topics' and optional 'start', 'end' keys
+        store_type: Payload 'type' value for the chunks (e.g., 'txt', 'img')
     
+    Returns:
+        list[dict]: One entry per chunk with 'sequence_index', 'summary', 'topics', 'embed_text',
+                    'start_s', 'end_s', 'content_hash' and 'point_id' keys
+    """
+    chunk_entries = []
+    for i, chunk in enumerate(summary_chunks, 1):
+        text = chunk.get("text", "")
+        summary = chunk.get("summary", "")
+        topics = chunk.get("topics", [])
+        start_s = float(chunk["start"]) if chunk.get("start") is not None else None
+        end_s = float(chunk["end"]) if chunk.get("end") is not None else None
+        embed_text = f"Summary: {summary}\nTopics: {', '.join(topics)}\n---\n{text}"
+        # The timeframe is part of the hash so a chunk whose time range changed gets rewritten
+        content_hash = compute_content_hash(f"{embed_text}\n@{start_s}-{end_s}")
+        chunk_entries.append({
+            "sequence_index": i,
+            "summary": summary,
+            "topics": topics,
+            "embed_text": embed_text,
+            "start_s": start_s,
+            "end_s": end_s,
+            "content_hash": content_hash,
+            "point_id": build_point_id(collection_name, store_type, i, content_hash),
+        })
+    return chunk_entries
+
+def build_chunk_points(chunk_entries: list[dict], existing_point_ids: set[str], dense_tokenizer, dense_embedding_model, collection_name: str, store_type: str, session_id: Optional[str] = None) -> tuple[list[PointStruct], int]:
+    """
+    Embed the new or changed chunks and build their Qdrant points
+    
+    Args:
+        chunk_entries: Output of build_chunk_entries()
+        existing_point_ids: Point IDs already stored (skipped)
+        dense_tokenizer: Tokenizer for dense embedding model
+        dense_embedding_model: Loaded dense embedding model
+        collection_name: Video collection name (stored as 'video_id')
+        store_type: Payload 'type' value for the chunks (e.g., 'txt', 'img')
+        session_id: Chat session that uploaded the video
+    
+    Returns:
+        tuple[list[PointStruct], int]: Built points and the number of chunks that failed
+    """
+    total_chunks = len(chunk_entries)
     qdrant_points = []
-    total_chunks = len(summary_chunks)
     failed_chunks = 0
     
-    for i, chunk in enumerate(summary_chunks, 1):
+    for entry in chunk_entries:
+        i, embed_text, topics = entry["sequence_index"], entry["embed_text"], entry["topics"]
+        if entry["point_id"] in existing_point_ids:
+            continue
+        
         try:
-            text = chunk.get("text", "")
-            summary = chunk.get("summary", "")
-            topics = chunk.get("topics", [])
-            
-            embed_text = f"Summary: {summary}\nTopics: {', '.join(topics)}\n---\n{text}"
-            
             # Build embeddings with error handling
             try:
                 dense_vector = build_dense_embedding(dense_tokenizer, dense_embedding_model, embed_text)
@@ -158,14 +486,19 @@ def index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks:
             
             payload = {
                 "text": embed_text,
-                "summary": summary,
+                "summary": entry["summary"],
                 "topics": topics,
                 "type": store_type,
-                "sequence_index": i
+                "sequence_index": i,
+                "start_s": entry["start_s"],
+                "end_s": entry["end_s"],
+                "content_hash": entry["content_hash"],
+                "video_id": collection_name,
+                "session_id": session_id
             }
             
             try:
-                point = build_qdrant_point(dense_vector, sparse_vector, payload)
+                point = build_qdrant_point(dense_vector, sparse_vector, payload, point_id=entry["point_id"])
                 qdrant_points.append(point)
                 logger.debug(f"Built point {i}/{total_chunks} with topics: {topics}")
             except Exception as e:
@@ -178,7 +511,165 @@ def index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks:
             failed_chunks += 1
             continue
     
-    if not qdrant_points:
+    return qdrant_points, failed_chunks
+
+def index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks: list[dict], dense_tokenizer, dense_embedding_model, store_type: str, wait: bool = True, session_id: Optional[str] = None) -> int:
+    """
+    Index transcript/image chunks into Qdrant with hybrid embeddings
+    
+    Args:
+        qdrant_client: Initialized Qdrant client
+        collection_name: Video collection name (resolved to a shared collection in multi-tenant mode)
+        summary_chunks: List of dicts with 'text', 'summary', 'topics' and optional 'start', 'end' keys
+        dense_tokenizer: Tokenizer for dense embedding model
+        dense_embedding_model: Loaded dense embedding model
+        store_type: Payload 'type' value for the chunks (e.g., 'txt', 'img')
+        wait: True if the points must be searchable when this returns (default: True)
+        session_id: Chat session that uploaded the video, stored as a tenant key
+    
+    Returns:
+        int: Number of successfully indexed chunks
+        
+    Note:
+        Creates collection if it doesn't exist. Point IDs are derived from the chunk
+        content, so re-indexing the same video overwrites points, skips embedding for
+        unchanged chunks and removes chunks that are no longer produced (unless some
+        chunks failed, whose previous points are then kept).
+        Cached retrieval results of the collection are invalidated. If the collection
+        was deleted by another process after it was cached as existing, it is
+        recreated and the chunks are indexed again.
+        
+    Raises:
+        Exception: If collection creation or indexing fails
+    """
+    args = (qdrant_client, collection_name, summary_chunks, dense_tokenizer, dense_embedding_model, store_type, wait, session_id)
+    try:
+        return _index_chunks_to_qdrant(*args)
+    except Exception as e:
+        if not is_collection_not_found(e):
+            raise
+        physical_collection_name = resolve_collection_name(collection_name)
+        logger.warning(f"Collection '{physical_collection_name}' no longer exists, recreating it")
+        get_collection_registry(qdrant_client).invalidate(physical_collection_name)
+        return _index_chunks_to_qdrant(*args)
+
+def _index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks: list[dict], dense_tokenizer, dense_embedding_model, store_type: str, wait: bool, session_id: Optional[str]) -> int:
+    """Single attempt of index_chunks_to_qdrant()"""
+    physical_collection_name = resolve_collection_name(collection_name)
+    try:
+        get_or_create_collection(qdrant_client, physical_collection_name, get_dense_vector_size(dense_embedding_model))
+    except Exception as e:
+        logger.error(f"Failed to create or get collection '{physical_collection_name}': {e}")
+        raise
+    
+    logger.info(f"Building Qdrant points for collection '{collection_name}' (stored in '{physical_collection_name}')")
+    
+    total_chunks = len(summary_chunks)
+    
+    # Derive content-based IDs first so unchanged chunks can skip embedding entirely
+    chunk_entries = build_chunk_entries(collection_name, summary_chunks, store_type)
+    all_point_ids = [entry["point_id"] for entry in chunk_entries]
+    existing_point_ids = get_existing_point_ids(qdrant_client, physical_collection_name, all_point_ids)
+    if existing_point_ids:
+        logger.info(f"{len(existing_point_ids)}/{total_chunks} chunks unchanged in '{collection_name}', skipping their embeddings")
+    
+    qdrant_points, failed_chunks = build_chunk_points(
+        chunk_entries, existing_point_ids, dense_tokenizer, dense_embedding_model, collection_name, store_type, session_id
+    )
+    
+    if not qdrant_points and not existing_point_ids:
+        error_msg = f"No valid points created. All {total_chunks} chunks failed to process."
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    
+    if failed_chunks > 0:
+        logger.warning(f"Failed to process {failed_chunks}/{total_chunks} chunks")
+    
+    try:
+        if qdrant_points:
+            logger.info(f"Upserting {len(qdrant_points)} points to '{collection_name}'")
+            upsert_qdrant_points(qdrant_client, physical_collection_name, qdrant_points, wait=wait)
+        if existing_point_ids and session_id:
+            qdrant_client.set_payload(**build_session_payload_update(collection_name, existing_point_ids, session_id, wait=wait))
+        if failed_chunks:
+            # A changed chunk that failed to embed has only its previous point left
+            logger.warning(f"Skipping stale point cleanup in '{collection_name}': {failed_chunks} chunks were not re-indexed")
+        else:
+            delete_stale_points(qdrant_client, collection_name, store_type, all_point_ids, wait=wait)
+    except Exception as e:
+        logger.error(f"Failed to upsert points to '{collection_name}': {e}")
+        raise
+    finally:
+        # Cached answers may predate any part of this write
+        retrieval_cache.bump_version(collection_name)
+    
+    indexed_chunks = len(qdrant_points) + len(existing_point_ids)
+    logger.info(
+        f"Successfully indexed {indexed_chunks}/{total_chunks} chunks to Qdrant "
+        f"({len(qdrant_points)} new or changed, {len(existing_point_ids)} unchanged)"
+    )
+    return indexed_chunks
+
+async def aindex_chunks_to_qdrant(async_qdrant_client, collection_name: str, summary_chunks: list[dict], dense_tokenizer, dense_embedding_model, store_type: str, wait: bool = True, session_id: Optional[str] = None) -> int:
+    """
+    Async variant of index_chunks_to_qdrant() for an AsyncQdrantClient
+    
+    Qdrant round-trips are awaited on the event loop; embedding runs in a worker
+    thread so the loop stays free while the model computes.
+    
+    Args:
+        async_qdrant_client: Initialized async Qdrant client
+        collection_name: Video collection name (resolved to a shared collection in multi-tenant mode)
+        summary_chunks: List of dicts with 'text', 'summary', 'topics' and optional 'start', 'end' keys
+        dense_tokenizer: Tokenizer for dense embedding model
+        dense_embedding_model: Loaded dense embedding model
+        store_type: Payload 'type' value for the chunks (e.g., 'txt', 'img')
+        wait: True if the points must be searchable when this returns (default: True)
+        session_id: Chat session that uploaded the video, stored as a tenant key
+    
+    Returns:
+        int: Number of successfully indexed chunks
+        
+    Raises:
+        Exception: If collection creation or indexing fails
+    """
+    args = (async_qdrant_client, collection_name, summary_chunks, dense_tokenizer, dense_embedding_model, store_type, wait, session_id)
+    try:
+        return await _aindex_chunks_to_qdrant(*args)
+    except Exception as e:
+        if not is_collection_not_found(e):
+            raise
+        physical_collection_name = resolve_collection_name(collection_name)
+        logger.warning(f"Collection '{physical_collection_name}' no longer exists, recreating it")
+        get_collection_registry(async_qdrant_client).invalidate(physical_collection_name)
+        return await _aindex_chunks_to_qdrant(*args)
+
+async def _aindex_chunks_to_qdrant(async_qdrant_client, collection_name: str, summary_chunks: list[dict], dense_tokenizer, dense_embedding_model, store_type: str, wait: bool, session_id: Optional[str]) -> int:
+    """Single attempt of aindex_chunks_to_qdrant()"""
+    physical_collection_name = resolve_collection_name(collection_name)
+    try:
+        await aget_or_create_collection(async_qdrant_client, physical_collection_name, get_dense_vector_size(dense_embedding_model))
+    except Exception as e:
+        logger.error(f"Failed to create or get collection '{physical_collection_name}': {e}")
+        raise
+    
+    logger.info(f"Building Qdrant points for collection '{collection_name}' (stored in '{physical_collection_name}')")
+    
+    total_chunks = len(summary_chunks)
+    
+    chunk_entries = build_chunk_entries(collection_name, summary_chunks, store_type)
+    all_point_ids = [entry["point_id"] for entry in chunk_entries]
+    existing_point_ids = await aget_existing_point_ids(async_qdrant_client, physical_collection_name, all_point_ids)
+    if existing_point_ids:
+        logger.info(f"{len(existing_point_ids)}/{total_chunks} chunks unchanged in '{collection_name}', skipping their embeddings")
+    
+    qdrant_points, failed_chunks = await inference_executor.run(
+        dense_embedding_model,
+        build_chunk_points,
+        chunk_entries, existing_point_ids, dense_tokenizer, dense_embedding_model, collection_name, store_type, session_id
+    )
+    
+    if not qdrant_points and not existing_point_ids:
         error_msg = f"No valid points created. All {total_chunks} chunks failed to process."
         logger.error(error_msg)
         raise Exception(error_msg)
@@ -187,11 +678,26 @@ def index_chunks_to_qdrant(qdrant_client, collection_name: str, summary_chunks:
         logger.warning(f"Failed to process {failed_chunks}/{total_chunks} chunks")
     
     try:
-        logger.info(f"Upserting {len(qdrant_points)} points to '{collection_name}'")
-        upsert_qdrant_points(qdrant_client, collection_name, qdrant_points)
+        if qdrant_points:
+            logger.info(f"Upserting {len(qdrant_points)} points to '{collection_name}'")
+            await aupsert_qdrant_points(async_qdrant_client, physical_collection_name, qdrant_points, wait=wait)
+        if existing_point_ids and session_id:
+            await async_qdrant_client.set_payload(**build_session_payload_update(collection_name, existing_point_ids, session_id, wait=wait))
+        if failed_chunks:
+            # A changed chunk that failed to embed has only its previous point left
+            logger.warning(f"Skipping stale point cleanup in '{collection_name}': {failed_chunks} chunks were not re-indexed")
+        else:
+            await adelete_stale_points(async_qdrant_client, collection_name, store_type, all_point_ids, wait=wait)
     except Exception as e:
         logger.error(f"Failed to upsert points to '{collection_name}': {e}")
         raise
+    finally:
+        # Cached answers may predate any part of this write
+        retrieval_cache.bump_version(collection_name)
     
-    logger.info(f"Successfully indexed {len(qdrant_points)}/{total_chunks} chunks to Qdrant")
-    return len(qdrant_points)
\ No newline at end of file
+    indexed_chunks = len(qdrant_points) + len(existing_point_ids)
+    logger.info(
+        f"Successfully indexed {indexed_chunks}/{total_chunks} chunks to Qdrant "
+        f"({len(qdrant_points)} new or changed, {len(existing_point_ids)} unchanged)"
+    )
+    return indexed_chunks
@@ -0,0 +1,106 @@
+import argparse
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config.service_config import settings
+from src.llm.chat_model import load_qwen_vl_model
+from src.llm.inference import generate_qwen_response
+from src.llm.batching import BatchingInferenceServer
+import src.llm.batching as batching
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTIONS = [
+    "Explain what a vector database is in two sentences.",
+    "List three uses of speech-to-text in meetings.",
+    "What is the difference between a summary and a transcript?",
+    "Give a short definition of retrieval-augmented generation.",
+    "Why do video frames need to be sampled before captioning?",
+    "Describe hybrid search in one paragraph.",
+]
+
+def build_messages(question: str) -> list[dict]:
+    """Chat messages for one benchmark question"""
+    return [
+        {"role": "system", "content": [{"type": "text", "text": "You are a helpful assistant."}]},
+        {"role": "user", "content": [{"type": "text", "text": question}]},
+    ]
+
+def run_concurrent(processor, model, questions: list[str], concurrency: int, max_new_tokens: int, lock=None) -> dict:
+    """
+    Send the questions from concurrent callers and time them
+
+    Args:
+        processor: Qwen AutoProcessor
+        model: Loaded Qwen2.5-VL model
+        questions: Questions to generate answers for
+        concurrency: Number of concurrent callers
+        max_new_tokens: Tokens generated per answer
+        lock: Optional lock serializing the generate calls
+
+    Returns:
+        dict: Wall time, request latency percentiles and requests per second
+    """
+    def timed_request(question: str) -> float:
+        start_time = time.perf_counter()
+        with lock or nullcontext():
+            generate_qwen_response(processor, model, build_messages(question), max_new_tokens=max_new_tokens)
+        return time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_request, questions))
+    wall_seconds = time.perf_counter() - start_time
+    return {
+        "wall_seconds": wall_seconds,
+        "p50_s": float(np.percentile(latencies, 50)),
+        "p95_s": float(np.percentile(latencies, 95)),
+        "requests_per_s": len(questions) / wall_seconds,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare one-at-a-time generation with the continuous-batching inference server")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    parser.add_argument("--max-batch-size", type=int, default=settings.INFERENCE_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    processor, model = load_qwen_vl_model(settings.QWEN_VL_MODEL_NAME, settings.QWEN_VL_USE_4BIT)
+    questions = [DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)] for i in range(args.requests)]
+
+    # Warm up kernels before timing
+    generate_qwen_response(processor, model, build_messages(questions[0]), max_new_tokens=8)
+
+    results = {}
+    for concurrency in args.concurrency:
+        # Unbatched: concurrent callers take turns on the model
+        logger.info(f"Running {args.requests} requests unbatched at concurrency {concurrency}...")
+        results[("direct", concurrency)] = run_concurrent(processor, model, questions, concurrency, args.max_new_tokens, lock=threading.Lock())
+
+        # Batched: the server decodes the concurrent requests together
+        logger.info(f"Running {args.requests} requests through the batching server at concurrency {concurrency}...")
+        batching.inference_server = BatchingInferenceServer(args.max_batch_size)
+        batching.inference_server.start(processor, model)
+        results[("batched", concurrency)] = run_concurrent(processor, model, questions, concurrency, args.max_new_tokens)
+        results[("batched", concurrency)]["mean_batch_size"] = batching.inference_server.get_metrics()["mean_batch_size"]
+        batching.inference_server.stop()
+
+    logger.info("=" * 80)
+    logger.info(f"BATCHING BENCHMARK ({settings.QWEN_VL_MODEL_NAME}, {args.requests} requests x {args.max_new_tokens} tokens)")
+    logger.info("=" * 80)
+    logger.info(f"{'mode':<8} {'callers':>8} {'wall s':>8} {'p50 s':>8} {'p95 s':>8} {'req/s':>8} {'batch':>6}")
+    for (mode, concurrency), metrics in results.items():
+        logger.info(
+            f"{mode:<8} {concurrency:>8} {metrics['wall_seconds']:>8.1f} {metrics['p50_s']:>8.2f} "
+            f"{metrics['p95_s']:>8.2f} {metrics['requests_per_s']:>8.2f} {metrics.get('mean_batch_size', 1.0):>6.1f}"
+        )
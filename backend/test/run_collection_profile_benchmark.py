@@ -0,0 +1,165 @@
+import argparse
+import logging
+import time
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, CollectionStatus, HnswConfigDiff
+from config.service_config import settings
+from src.vector_database.qdrant_client import COLLECTION_PROFILES, build_collection_config, get_dense_search_params
+from src.vector_database.utils import upsert_qdrant_points
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def build_synthetic_vectors(num_vectors: int, dense_vector_size: int, num_clusters: int = 64, seed: int = 42) -> np.ndarray:
+    """
+    Generate L2-normalised clustered vectors that resemble sentence embeddings
+
+    Args:
+        num_vectors: Number of vectors to generate
+        dense_vector_size: Vector dimension
+        num_clusters: Number of topic clusters (default: 64)
+        seed: Random seed (default: 42)
+
+    Returns:
+        np.ndarray: Array of shape (num_vectors, dense_vector_size)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(num_clusters, dense_vector_size))
+    assignments = rng.integers(0, num_clusters, size=num_vectors)
+    vectors = centroids[assignments] + 0.6 * rng.normal(size=(num_vectors, dense_vector_size))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def estimate_resident_bytes(profile_name: str, num_vectors: int, dense_vector_size: int, hnsw_m: int) -> int:
+    """
+    Estimate the RAM held by dense vectors and the HNSW graph for a profile
+
+    This is a formula, not a measurement: original vectors stored on disk are
+    only counted when no quantized copy is kept in RAM, page cache usage, payloads
+    and the sparse index are not included.
+
+    Args:
+        profile_name: Profile key in COLLECTION_PROFILES
+        num_vectors: Number of stored vectors
+        dense_vector_size: Vector dimension
+        hnsw_m: HNSW 'm' parameter
+
+    Returns:
+        int: Estimated resident bytes
+    """
+    profile = COLLECTION_PROFILES[profile_name]
+    if profile["quantization"] == "scalar":
+        vector_bytes = num_vectors * dense_vector_size
+    elif profile["quantization"] == "binary":
+        vector_bytes = num_vectors * dense_vector_size // 8
+    elif profile["on_disk_vectors"]:
+        vector_bytes = 0
+    else:
+        vector_bytes = num_vectors * dense_vector_size * 4
+    graph_bytes = num_vectors * hnsw_m * 2 * 4
+    return vector_bytes + graph_bytes
+
+def wait_for_indexing(qdrant_client: QdrantClient, collection_name: str, timeout_s: float = 300.0):
+    """Block until the collection optimizer has finished building the index"""
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        if qdrant_client.get_collection(collection_name).status == CollectionStatus.GREEN:
+            return
+        time.sleep(0.5)
+    logger.warning(f"Collection '{collection_name}' still indexing after {timeout_s}s")
+
+def run_profile(qdrant_client: QdrantClient, profile_name: str, vectors: np.ndarray, queries: np.ndarray, ground_truth: np.ndarray, top_k: int, hnsw_m: int) -> dict:
+    """
+    Load the synthetic vectors into a collection with the given profile and measure search quality
+
+    Args:
+        qdrant_client: Qdrant client
+        profile_name: Profile key in COLLECTION_PROFILES
+        vectors: Stored vectors
+        queries: Query vectors
+        ground_truth: Exact top-k neighbour IDs per query
+        top_k: Number of neighbours to retrieve
+        hnsw_m: HNSW 'm' parameter of the collection
+
+    Returns:
+        dict: recall@k, p50/p95 latency (ms) and estimated resident MB
+    """
+    collection_name = f"profile_benchmark_{profile_name}"
+    dense_vector_size = vectors.shape[1]
+
+    if qdrant_client.collection_exists(collection_name):
+        qdrant_client.delete_collection(collection_name)
+    collection_config = build_collection_config(dense_vector_size, profile_name)
+    collection_config["hnsw_config"] = HnswConfigDiff(m=hnsw_m, ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT)
+    qdrant_client.create_collection(collection_name=collection_name, **collection_config)
+
+    upsert_qdrant_points(
+        qdrant_client,
+        collection_name,
+        (PointStruct(id=i, vector={"dense_embedding": vector.tolist()}, payload={"type": "txt"}) for i, vector in enumerate(vectors)),
+        wait=True,
+    )
+    wait_for_indexing(qdrant_client, collection_name)
+
+    search_params = get_dense_search_params(profile_name)
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, ground_truth):
+        start_time = time.perf_counter()
+        response = qdrant_client.query_points(
+            collection_name=collection_name,
+            query=query.tolist(),
+            using="dense_embedding",
+            search_params=search_params,
+            limit=top_k,
+        )
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        hits += len({point.id for point in response.points} & set(expected.tolist()))
+
+    qdrant_client.delete_collection(collection_name)
+    return {
+        "recall": hits / (len(queries) * top_k),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "est_resident_mb": estimate_resident_bytes(profile_name, len(vectors), dense_vector_size, hnsw_m) / (1024 * 1024),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Qdrant collection profiles on synthetic data")
+    parser.add_argument("--url", default="http://localhost:6333", help="Qdrant server URL (quantization and on-disk storage need a server)")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, prefer_grpc=True)
+
+    stored_vectors = build_synthetic_vectors(args.vectors, args.dim)
+    query_vectors = build_synthetic_vectors(args.queries, args.dim, seed=7)
+
+    # Exact neighbours by brute-force cosine similarity
+    similarities = query_vectors @ stored_vectors.T
+    exact_neighbours = np.argsort(-similarities, axis=1)[:, :args.top_k]
+
+    results = {}
+    for profile in COLLECTION_PROFILES:
+        logger.info(f"Benchmarking profile '{profile}'...")
+        results[profile] = run_profile(client, profile, stored_vectors, query_vectors, exact_neighbours, args.top_k, args.hnsw_m)
+
+    logger.info("=" * 80)
+    logger.info(f"COLLECTION PROFILE BENCHMARK ({args.vectors} x {args.dim}d vectors, {args.queries} queries, hnsw m={args.hnsw_m})")
+    logger.info("=" * 80)
+    logger.info(f"{'profile':<15} {'recall@' + str(args.top_k):>10} {'p50 ms':>10} {'p95 ms':>10} {'est. RAM MB':>12}")
+    for profile, metrics in results.items():
+        logger.info(
+            f"{profile:<15} {metrics['recall']:>10.3f} {metrics['p50_ms']:>10.2f} "
+            f"{metrics['p95_ms']:>10.2f} {metrics['est_resident_mb']:>12.1f}"
+        )
+    logger.info("est. RAM MB is computed from the vector count, dimension and hnsw m, not measured by Qdrant")
@@ -0,0 +1,110 @@
+import argparse
+import logging
+import time
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+from config.service_config import settings
+from src.vector_database.qdrant_client import get_or_create_collection, resolve_collection_name, build_tenant_filter, get_collection_registry
+from src.vector_database.utils import upsert_qdrant_points
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def build_video_points(video_id: str, chunks_per_video: int, dense_vector_size: int, rng: np.random.Generator) -> list[PointStruct]:
+    """Generate the points of one synthetic video"""
+    vectors = rng.normal(size=(chunks_per_video, dense_vector_size)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        PointStruct(
+            id=int(rng.integers(0, 2**63 - 1)),
+            vector={"dense_embedding": vector.tolist()},
+            payload={"type": "txt", "sequence_index": i + 1, "video_id": video_id, "session_id": "benchmark"},
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+def run_mode(qdrant_client: QdrantClient, storage_mode: str, num_videos: int, chunks_per_video: int, num_queries: int, dense_vector_size: int) -> dict:
+    """
+    Index synthetic videos with the given storage mode and time tenant-scoped queries
+
+    Args:
+        qdrant_client: Qdrant client
+        storage_mode: 'per_video' or 'multi_tenant'
+        num_videos: Number of videos to index
+        chunks_per_video: Points per video
+        num_queries: Number of scoped queries to time
+        dense_vector_size: Vector dimension
+
+    Returns:
+        dict: Index time, physical collection count and query latency percentiles
+    """
+    settings.QDRANT_STORAGE_MODE = storage_mode
+    rng = np.random.default_rng(42)
+    video_ids = [f"bench_video_{i:05d}" for i in range(num_videos)]
+
+    start_time = time.perf_counter()
+    for video_id in video_ids:
+        collection_name = resolve_collection_name(video_id)
+        get_or_create_collection(qdrant_client, collection_name, dense_vector_size)
+        upsert_qdrant_points(qdrant_client, collection_name, build_video_points(video_id, chunks_per_video, dense_vector_size, rng), wait=False)
+    index_seconds = time.perf_counter() - start_time
+
+    physical_collections = {resolve_collection_name(video_id) for video_id in video_ids}
+
+    latencies = []
+    for _ in range(num_queries):
+        video_id = video_ids[int(rng.integers(0, num_videos))]
+        query = rng.normal(size=dense_vector_size).astype(np.float32)
+        start_time = time.perf_counter()
+        qdrant_client.query_points(
+            collection_name=resolve_collection_name(video_id),
+            query=query.tolist(),
+            using="dense_embedding",
+            query_filter=build_tenant_filter(video_id),
+            limit=10,
+        )
+        latencies.append((time.perf_counter() - start_time) * 1000)
+
+    for collection_name in physical_collections:
+        qdrant_client.delete_collection(collection_name)
+        get_collection_registry(qdrant_client).invalidate(collection_name)
+
+    return {
+        "index_seconds": index_seconds,
+        "collections": len(physical_collections),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-video and multi-tenant Qdrant storage")
+    parser.add_argument("--url", default="http://localhost:6333", help="Qdrant server URL")
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--chunks-per-video", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--modes", nargs="+", default=["multi_tenant", "per_video"], choices=["multi_tenant", "per_video"])
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, prefer_grpc=True)
+
+    results = {}
+    for mode in args.modes:
+        logger.info(f"Benchmarking storage mode '{mode}' with {args.videos} videos...")
+        results[mode] = run_mode(client, mode, args.videos, args.chunks_per_video, args.queries, args.dim)
+
+    logger.info("=" * 80)
+    logger.info(f"MULTI-TENANT BENCHMARK ({args.videos} videos x {args.chunks_per_video} chunks)")
+    logger.info("=" * 80)
+    logger.info(f"{'mode':<15} {'collections':>12} {'index s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for mode, metrics in results.items():
+        logger.info(
+            f"{mode:<15} {metrics['collections']:>12} {metrics['index_seconds']:>10.1f} "
+            f"{metrics['p50_ms']:>10.2f} {metrics['p95_ms']:>10.2f}"
+        )
@@ -0,0 +1,100 @@
+import argparse
+import logging
+import time
+import numpy as np
+from transformers import AutoTokenizer
+from config.service_config import settings
+from src.llm.embedding_model import load_embedding_model
+from src.vector_database.qdrant_client import get_qdrant_client
+from src.vector_database.reranker import CrossEncoderReranker
+from src.vector_database.retriever import query_rag_points, expand_neighbor_context, pack_doc_context, count_tokens
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERIES = [
+    "What decisions were made in the meeting?",
+    "Who is responsible for the next release?",
+    "What problems were reported with the deployment?",
+    "Summarize the discussion about the budget",
+    "What are the action items for next week?",
+]
+
+def run_benchmark(collection_name: str, queries: list[str], baseline_top_k: int, rerank_top_k: int, token_budget: int) -> dict:
+    """
+    Compare the context sent to the generator with and without reranking
+
+    Args:
+        collection_name: Video collection to query
+        queries: Questions to run
+        baseline_top_k: Hits kept without reranking
+        rerank_top_k: Hits kept after reranking
+        token_budget: Context token budget given to pack_doc_context()
+
+    Returns:
+        dict: Rerank latency percentiles (cold and cached) and mean context tokens per query
+    """
+    qdrant_client = get_qdrant_client()
+    dense_embedding_model, dense_embedding_tokenizer = load_embedding_model(settings.BGE_EMBEDDING_MODEL_NAME)
+    generator_tokenizer = AutoTokenizer.from_pretrained(settings.QWEN_VL_MODEL_NAME)
+    reranker = CrossEncoderReranker.from_settings()
+    # Warm up so the first query does not pay model initialisation
+    reranker.score_pairs("warm up", ["warm up"])
+
+    cold_ms, cached_ms, baseline_tokens, rerank_tokens = [], [], [], []
+    for user_query in queries:
+        retrieved_points = query_rag_points(user_query, dense_embedding_model, dense_embedding_tokenizer, qdrant_client, collection_name)
+        if not retrieved_points or not retrieved_points.points:
+            logger.warning(f"No hits for '{user_query}', skipping")
+            continue
+        candidates = retrieved_points.points
+
+        baseline = expand_neighbor_context(qdrant_client, collection_name, candidates[:baseline_top_k])
+        baseline_tokens.append(count_tokens(generator_tokenizer, pack_doc_context(baseline, generator_tokenizer, token_budget)))
+
+        start_time = time.perf_counter()
+        hits = reranker.rerank(user_query, candidates, top_k=rerank_top_k)
+        cold_ms.append((time.perf_counter() - start_time) * 1000)
+
+        start_time = time.perf_counter()
+        reranker.rerank(user_query, candidates, top_k=rerank_top_k)
+        cached_ms.append((time.perf_counter() - start_time) * 1000)
+
+        reranked = expand_neighbor_context(qdrant_client, collection_name, hits)
+        rerank_tokens.append(count_tokens(generator_tokenizer, pack_doc_context(reranked, generator_tokenizer, token_budget)))
+
+    return {
+        "queries": len(cold_ms),
+        "rerank_p50_ms": float(np.percentile(cold_ms, 50)),
+        "rerank_p95_ms": float(np.percentile(cold_ms, 95)),
+        "cached_p50_ms": float(np.percentile(cached_ms, 50)),
+        "baseline_tokens": float(np.mean(baseline_tokens)),
+        "rerank_tokens": float(np.mean(rerank_tokens)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cross-encoder rerank cost against saved prefill tokens")
+    parser.add_argument("--collection", required=True, help="Video collection to query")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--baseline-top-k", type=int, default=settings.RAG_TOP_K)
+    parser.add_argument("--rerank-top-k", type=int, default=settings.RERANK_TOP_K)
+    parser.add_argument("--token-budget", type=int, default=settings.RAG_CONTEXT_TOKEN_BUDGET)
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.0, help="Measured generator prefill cost, to convert saved tokens to ms")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.collection, args.queries, args.baseline_top_k, args.rerank_top_k, args.token_budget)
+    saved_tokens = results["baseline_tokens"] - results["rerank_tokens"]
+
+    logger.info("=" * 80)
+    logger.info(f"RERANK BENCHMARK ({results['queries']} queries, top_k {args.baseline_top_k} -> {args.rerank_top_k})")
+    logger.info("=" * 80)
+    logger.info(f"Rerank latency      p50 {results['rerank_p50_ms']:.1f}ms  p95 {results['rerank_p95_ms']:.1f}ms  cached p50 {results['cached_p50_ms']:.2f}ms")
+    logger.info(f"Context tokens      baseline {results['baseline_tokens']:.0f}  reranked {results['rerank_tokens']:.0f}  saved {saved_tokens:.0f}")
+    if args.prefill_ms_per_token:
+        saved_ms = saved_tokens * args.prefill_ms_per_token
+        logger.info(f"Prefill saved       {saved_ms:.1f}ms per query (net {saved_ms - results['rerank_p50_ms']:.1f}ms after p50 rerank cost)")
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import logging
+import time
+import numpy as np
+from langchain_core.messages import HumanMessage
+from config.service_config import settings
+from src.llm.embedding_model import load_embedding_model
+from src.llm.chat_model import build_hf_chat_model
+from web.agent.intent_router import IntentRouter
+from web.agent.supervisor_agent import WorkflowSupervisor
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Held-out requests (not among the router exemplars) with their expected workflow
+LABELLED_QUERIES = [
+    ("Please process this video file: data/team_sync.mp4", "frame_processing_workflow"),
+    ("Extract the frames from data/demo.mp4", "frame_processing_workflow"),
+    ("Can you pull the audio out of data/keynote.mp4?", "frame_processing_workflow"),
+    ("Transcribe data/interview.mp3", "audio_processing_workflow"),
+    ("Please process this audio file: data/podcast.mp3", "audio_processing_workflow"),
+    ("Create a report from the video", "report_workflow"),
+    ("Export everything we discussed as a PDF", "report_workflow"),
+    ("Could I get a shareable report of this meeting?", "report_workflow"),
+    ("Summarize the recording for me", "summary_workflow"),
+    ("What's this video about in a nutshell?", "summary_workflow"),
+    ("Give me a quick recap of the meeting", "summary_workflow"),
+    ("What were the main takeaways?", "summary_workflow"),
+    ("What did the speaker say about hiring?", "rag_workflow"),
+    ("Which slide showed the revenue numbers?", "rag_workflow"),
+    ("Did anyone mention the launch date?", "rag_workflow"),
+    ("Who asked the question about security in the video?", "rag_workflow"),
+    ("What happened after the demo?", "rag_workflow"),
+    ("How does gradient descent work?", "general_question_workflow"),
+    ("What is the tallest mountain in Europe?", "general_question_workflow"),
+    ("Explain the difference between TCP and UDP", "general_question_workflow"),
+    ("Suggest a name for my cat", "general_question_workflow"),
+    ("How do I write a SQL join?", "general_question_workflow"),
+    # Mention a media file, a report or a PDF without asking to ingest or generate one;
+    # the rules tier must leave these to the other tiers
+    ("How do I make a PDF from a Word document?", "general_question_workflow"),
+    ("Did the speaker create the sales report on time?", "rag_workflow"),
+    ("In the video, what did they say about how to build the quarterly report?", "rag_workflow"),
+    ("What happens in demo.mp4 at minute 3?", "rag_workflow"),
+    ("Which song.mp3 did they play during the break?", "rag_workflow"),
+]
+
+def summarize_tier(latencies_ms: list[float], correct: list[bool], total: int) -> dict:
+    """Coverage, accuracy and latency percentiles of one tier"""
+    return {
+        "decided": len(correct),
+        "coverage": len(correct) / total if total else 0.0,
+        "accuracy": float(np.mean(correct)) if correct else 0.0,
+        "p50_ms": float(np.percentile(latencies_ms, 50)) if latencies_ms else 0.0,
+        "p95_ms": float(np.percentile(latencies_ms, 95)) if latencies_ms else 0.0,
+    }
+
+async def evaluate(router: IntentRouter, dense_embedding_model, dense_embedding_tokenizer, supervisor=None, llm_only: bool = False) -> dict:
+    """
+    Route every labelled query through the tiers and score each tier
+
+    Args:
+        router: Intent router under evaluation
+        dense_embedding_model: Loaded dense embedding model
+        dense_embedding_tokenizer: Tokenizer of the dense embedding model
+        supervisor: WorkflowSupervisor used for the LLM tier (None leaves low-confidence queries unrouted)
+        llm_only: Also route every query with the LLM alone, as a baseline
+
+    Returns:
+        dict: Per-tier metrics, the end-to-end tiered accuracy and the count of unrouted queries
+    """
+    # Embed the exemplars before timing
+    router.route_by_embedding("warm up", dense_embedding_tokenizer, dense_embedding_model)
+
+    tiers = {tier: {"latencies_ms": [], "correct": []} for tier in ("rules", "embedding", "llm", "llm_only")}
+    tiered_correct, unrouted = [], 0
+    for user_query, expected in LABELLED_QUERIES:
+        start_time = time.perf_counter()
+        decision = router.route_by_rules(user_query)
+        tier = "rules"
+        if not decision.next:
+            decision = router.route_by_embedding(user_query, dense_embedding_tokenizer, dense_embedding_model)
+            tier = "embedding"
+        goto = decision.next
+        if not goto and supervisor:
+            goto = await supervisor.route_with_llm({"messages": [HumanMessage(content=user_query)]})
+            tier = "llm"
+        if not goto:
+            unrouted += 1
+            logger.info(f"[unrouted] {user_query!r} (best score {decision.confidence:.3f})")
+            continue
+        # Latency includes the tiers tried before the deciding one
+        tiers[tier]["latencies_ms"].append((time.perf_counter() - start_time) * 1000)
+        tiers[tier]["correct"].append(goto == expected)
+        tiered_correct.append(goto == expected)
+        if goto != expected:
+            logger.info(f"[{tier}] {user_query!r} -> {goto} (expected {expected})")
+
+        if llm_only and supervisor:
+            start_time = time.perf_counter()
+            goto = await supervisor.route_with_llm({"messages": [HumanMessage(content=user_query)]})
+            tiers["llm_only"]["latencies_ms"].append((time.perf_counter() - start_time) * 1000)
+            tiers["llm_only"]["correct"].append(goto == expected)
+
+    return {
+        "tiers": {tier: summarize_tier(values["latencies_ms"], values["correct"], len(LABELLED_QUERIES)) for tier, values in tiers.items()},
+        "tiered_accuracy": sum(tiered_correct) / len(LABELLED_QUERIES),
+        "unrouted": unrouted,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the accuracy and latency of each intent-routing tier")
+    parser.add_argument("--similarity-threshold", type=float, default=settings.INTENT_ROUTER_SIMILARITY_THRESHOLD)
+    parser.add_argument("--margin", type=float, default=settings.INTENT_ROUTER_MARGIN)
+    parser.add_argument("--with-llm", action="store_true", help="Route low-confidence queries with the LLM supervisor")
+    parser.add_argument("--llm-only", action="store_true", help="Also route every query with the LLM alone (implies --with-llm)")
+    args = parser.parse_args()
+
+    dense_embedding_model, dense_embedding_tokenizer = load_embedding_model(settings.BGE_EMBEDDING_MODEL_NAME)
+    router = IntentRouter(similarity_threshold=args.similarity_threshold, margin=args.margin)
+    supervisor = WorkflowSupervisor(build_hf_chat_model(deterministic=True)) if args.with_llm or args.llm_only else None
+
+    results = asyncio.run(evaluate(router, dense_embedding_model, dense_embedding_tokenizer, supervisor, llm_only=args.llm_only))
+
+    logger.info("=" * 80)
+    logger.info(f"ROUTER EVALUATION ({len(LABELLED_QUERIES)} queries, threshold {args.similarity_threshold}, margin {args.margin})")
+    logger.info("=" * 80)
+    logger.info(f"{'tier':<10} {'decided':>8} {'coverage':>9} {'accuracy':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for tier, metrics in results["tiers"].items():
+        if not metrics["decided"]:
+            continue
+        logger.info(
+            f"{tier:<10} {metrics['decided']:>8} {metrics['coverage']:>9.0%} {metrics['accuracy']:>9.0%} "
+            f"{metrics['p50_ms']:>9.1f} {metrics['p95_ms']:>9.1f}"
+        )
+    logger.info(f"Tiered accuracy {results['tiered_accuracy']:.0%} ({results['unrouted']} unrouted)")
@@ -0,0 +1,106 @@
+import argparse
+import gc
+import logging
+import time
+import numpy as np
+import torch
+from langchain_core.messages import HumanMessage, SystemMessage
+from config.service_config import settings
+from src.llm.chat_model import load_qwen_vl_model, build_hf_chat_model
+from src.llm.qwen_chat_adapter import QwenVLChatModel, ROLE_GENERATION_PARAMS
+from src.prompt_engineering.templates import AGENT_SUPERVISOR_PROMPT
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ROUTER_QUERIES = [
+    "Summarize the uploaded video",
+    "What did the speaker say about the budget?",
+    "Generate a PDF report of the meeting",
+    "What is the capital of France?",
+]
+
+def model_memory_gb(model) -> float:
+    """Weight memory of a loaded model in GB"""
+    return model.get_memory_footprint() / 1024**3
+
+def free_models() -> None:
+    """Release loaded models between modes"""
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+        torch.cuda.reset_peak_memory_stats()
+
+def time_router(chat_model, queries: list[str], repeats: int) -> list[float]:
+    """Time routing calls (the most frequent text role) in milliseconds"""
+    latencies = []
+    for _ in range(repeats):
+        for user_query in queries:
+            start_time = time.perf_counter()
+            chat_model.invoke([SystemMessage(content=AGENT_SUPERVISOR_PROMPT), HumanMessage(content=user_query)])
+            latencies.append((time.perf_counter() - start_time) * 1000)
+    return latencies
+
+def run_mode(single_model: bool, queries: list[str], repeats: int) -> dict:
+    """
+    Load the generation models of one deployment mode and time the router role
+
+    Args:
+        single_model: True to serve the router from the Qwen VL model, False to load the separate chat model
+        queries: Router questions to time
+        repeats: Passes over the questions
+
+    Returns:
+        dict: Load time, weight memory, peak GPU memory and router latency percentiles
+    """
+    free_models()
+    start_time = time.perf_counter()
+    processor, vision_model = load_qwen_vl_model(settings.QWEN_VL_MODEL_NAME, settings.QWEN_VL_USE_4BIT)
+    weights_gb = model_memory_gb(vision_model)
+
+    if single_model:
+        chat_model = QwenVLChatModel.for_role(processor, vision_model, "router")
+    else:
+        chat_model = build_hf_chat_model(deterministic=True)
+        weights_gb += model_memory_gb(chat_model.llm.pipeline.model)
+    load_seconds = time.perf_counter() - start_time
+
+    latencies = time_router(chat_model, queries, repeats)
+    peak_gpu_gb = torch.cuda.max_memory_allocated() / 1024**3 if torch.cuda.is_available() else 0.0
+
+    del chat_model, vision_model, processor
+    return {
+        "load_seconds": load_seconds,
+        "weights_gb": weights_gb,
+        "peak_gpu_gb": peak_gpu_gb,
+        "router_p50_ms": float(np.percentile(latencies, 50)),
+        "router_p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two-model and single-model deployments (memory, load time, router latency)")
+    parser.add_argument("--modes", nargs="+", default=["dual", "single"], choices=["dual", "single"])
+    parser.add_argument("--queries", nargs="+", default=ROUTER_QUERIES)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        logger.info(f"Loading models for '{mode}' mode...")
+        results[mode] = run_mode(mode == "single", args.queries, args.repeats)
+
+    logger.info("=" * 80)
+    logger.info(f"SINGLE-MODEL REPORT ({settings.QWEN_VL_MODEL_NAME} alone vs. with {settings.QWEN_CODER_MODEL_NAME})")
+    logger.info(f"Router generation params in single-model mode: {ROLE_GENERATION_PARAMS['router']}")
+    logger.info("=" * 80)
+    logger.info(f"{'mode':<8} {'load s':>8} {'weights GB':>11} {'peak GPU GB':>12} {'router p50 ms':>14} {'router p95 ms':>14}")
+    for mode, metrics in results.items():
+        logger.info(
+            f"{mode:<8} {metrics['load_seconds']:>8.1f} {metrics['weights_gb']:>11.2f} {metrics['peak_gpu_gb']:>12.2f} "
+            f"{metrics['router_p50_ms']:>14.1f} {metrics['router_p95_ms']:>14.1f}"
+        )
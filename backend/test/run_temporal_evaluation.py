@@ -0,0 +1,84 @@
+import logging
+from config.service_config import settings
+from src.vector_database.temporal import TemporalRange, parse_temporal_reference
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+EDGE = settings.TEMPORAL_EDGE_WINDOW_S
+POINT = settings.TEMPORAL_POINT_WINDOW_S
+
+# Questions with the time range they should be filtered to (None = plain semantic retrieval)
+LABELLED_QUERIES = [
+    ("What happens at 12:30?", TemporalRange(750.0 - POINT, 750.0 + POINT)),
+    ("What is on screen at the 10 minute mark?", TemporalRange(600.0 - POINT, 600.0 + POINT)),
+    ("What did they say around the 5 minute mark?", TemporalRange(300.0 - POINT, 300.0 + POINT)),
+    ("What happens in demo.mp4 at minute 3?", TemporalRange(180.0 - POINT, 180.0 + POINT)),
+    ("Summarize minute 7 of the meeting", TemporalRange(420.0 - POINT, 420.0 + POINT)),
+    ("What happens after minute 10?", TemporalRange(600.0, None)),
+    ("What was discussed before 2:00?", TemporalRange(0.0, 120.0)),
+    ("What was discussed between 5:00 and 7:30?", TemporalRange(300.0, 450.0)),
+    ("What did they cover between minute 5 and 10?", TemporalRange(300.0, 600.0)),
+    ("What was shown between 20 and 40 seconds?", TemporalRange(20.0, 40.0)),
+    ("What did they talk about in the first 2 minutes?", TemporalRange(0.0, 120.0)),
+    ("What happened in the last 30 seconds?", TemporalRange(30.0, 0.0, from_end=True)),
+    ("What did they say at the beginning?", TemporalRange(0.0, EDGE)),
+    ("How does the video end?", None),
+    ("What was said near the end of the meeting?", TemporalRange(EDGE, 0.0, from_end=True)),
+    # Numbers and durations that are not positions in the video
+    ("What was said about the 10 second rule?", None),
+    ("Did they recommend a 5 minute break every hour?", None),
+    ("What did the speaker say about the 30 s timeout?", None),
+    ("Is the 2 m cable mentioned?", None),
+    ("How many people attended, about 40?", None),
+    ("Did they finish by 5 pm?", None),
+    ("What is the plan for the next 3 months?", None),
+    ("Which model scored near 90 percent?", None),
+    ("What are the 3 main takeaways?", None),
+    ("Did anyone mention the 24 hour support line?", None),
+    # Start and end of something other than the video
+    ("What was decided at the start of the project?", None),
+    ("What will be delivered by the end of the quarter?", None),
+    ("What happens at the end of the sprint?", None),
+    ("Who joined near the beginning of the year?", None),
+    ("What was shown at the very start of the recording?", TemporalRange(0.0, EDGE)),
+]
+
+def evaluate() -> dict:
+    """
+    Parse every labelled question and compare with the expected range
+
+    Returns:
+        dict: Accuracy, false positives (filtered when it should not be) and misses
+    """
+    correct, false_positives, misses = 0, [], []
+    for user_query, expected in LABELLED_QUERIES:
+        parsed = parse_temporal_reference(user_query)
+        if parsed == expected:
+            correct += 1
+        elif expected is None:
+            false_positives.append((user_query, parsed))
+        else:
+            misses.append((user_query, expected, parsed))
+    return {
+        "accuracy": correct / len(LABELLED_QUERIES),
+        "false_positives": false_positives,
+        "misses": misses,
+    }
+
+
+if __name__ == "__main__":
+    results = evaluate()
+
+    logger.info("=" * 80)
+    logger.info(f"TEMPORAL PARSER EVALUATION ({len(LABELLED_QUERIES)} questions)")
+    logger.info("=" * 80)
+    logger.info(f"accuracy: {results['accuracy']:.3f}")
+    for user_query, parsed in results["false_positives"]:
+        logger.info(f"false positive: '{user_query}' -> {parsed}")
+    for user_query, expected, parsed in results["misses"]:
+        logger.info(f"miss: '{user_query}' expected {expected}, got {parsed}")
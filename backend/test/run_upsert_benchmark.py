@@ -0,0 +1,126 @@
+import argparse
+import logging
+import random
+import time
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, VectorParams, Distance, SparseVectorParams, SparseIndexParams, SparseVector
+from src.vector_database.utils import upsert_qdrant_points
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def build_synthetic_points(num_points: int, dense_vector_size: int = 384, sparse_terms: int = 32):
+    """
+    Generate hybrid points shaped like the ones produced by index_chunks_to_qdrant
+
+    Args:
+        num_points: Number of points to generate
+        dense_vector_size: Dense vector dimension (default: 384)
+        sparse_terms: Non-zero entries per sparse vector (default: 32)
+
+    Yields:
+        PointStruct: Synthetic point with dense, sparse vectors and payload
+    """
+    rng = random.Random(42)
+    for i in range(num_points):
+        yield PointStruct(
+            id=i,
+            vector={
+                "dense_embedding": [rng.random() for _ in range(dense_vector_size)],
+                "sparse_embedding": SparseVector(
+                    indices=sorted(rng.sample(range(50_000), sparse_terms)),
+                    values=[rng.random() for _ in range(sparse_terms)],
+                ),
+            },
+            payload={
+                "text": f"Synthetic transcript chunk {i} " * 20,
+                "summary": f"Summary of chunk {i}",
+                "topics": ["benchmark", "synthetic"],
+                "type": "txt",
+                "sequence_index": i + 1,
+            },
+        )
+
+def reset_collection(qdrant_client: QdrantClient, collection_name: str, dense_vector_size: int):
+    """Recreate the benchmark collection with the same schema as get_or_create_collection"""
+    if qdrant_client.collection_exists(collection_name):
+        qdrant_client.delete_collection(collection_name)
+    qdrant_client.create_collection(
+        collection_name=collection_name,
+        vectors_config={"dense_embedding": VectorParams(size=dense_vector_size, distance=Distance.COSINE)},
+        sparse_vectors_config={"sparse_embedding": SparseVectorParams(index=SparseIndexParams(on_disk=False))},
+    )
+
+def run_benchmark(qdrant_client: QdrantClient, num_points: int, batch_size: int, parallel: int, dense_vector_size: int = 384) -> dict:
+    """
+    Compare the single blocking upsert against the batched bulk loader
+
+    Args:
+        qdrant_client: Qdrant client (server, local path or in-memory)
+        num_points: Number of synthetic points per run
+        batch_size: Batch size for the bulk loader
+        parallel: Worker count for the parallel run
+        dense_vector_size: Dense vector dimension
+
+    Returns:
+        dict: Points per second for each strategy
+    """
+    collection_name = "upsert_benchmark"
+    results = {}
+
+    # Build points up front so that only upload time is measured
+    points = list(build_synthetic_points(num_points, dense_vector_size))
+
+    # Baseline: one request with every point and wait=True
+    reset_collection(qdrant_client, collection_name, dense_vector_size)
+    start_time = time.perf_counter()
+    qdrant_client.upsert(collection_name=collection_name, points=points, wait=True)
+    elapsed = time.perf_counter() - start_time
+    results["single_blocking_upsert"] = num_points / elapsed
+
+    strategies = [
+        ("batched_read_your_writes", dict(parallel=1, wait=True)),
+        ("batched_fire_and_forget", dict(parallel=1, wait=False)),
+        (f"upload_points_parallel_{parallel}", dict(parallel=parallel, wait=True)),
+    ]
+    for name, kwargs in strategies:
+        reset_collection(qdrant_client, collection_name, dense_vector_size)
+        results[name] = upsert_qdrant_points(
+            qdrant_client,
+            collection_name,
+            iter(points),
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    qdrant_client.delete_collection(collection_name)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant bulk upsert strategies")
+    parser.add_argument("--url", default=None, help="Qdrant server URL (default: in-memory local mode)")
+    parser.add_argument("--path", default=None, help="Qdrant local storage path (used when --url is not set)")
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--parallel", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.url:
+        client = QdrantClient(url=args.url, prefer_grpc=True)
+    elif args.path:
+        client = QdrantClient(path=args.path)
+    else:
+        client = QdrantClient(location=":memory:")
+
+    benchmark_results = run_benchmark(client, args.points, args.batch_size, args.parallel)
+
+    logger.info("=" * 80)
+    logger.info(f"UPSERT BENCHMARK ({args.points} points, batch_size={args.batch_size})")
+    logger.info("=" * 80)
+    for strategy, points_per_second in benchmark_results.items():
+        logger.info(f"{strategy:<35} {points_per_second:>10.1f} points/s")
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
-from langchain_core.messages import AIMessage
+from typing import Callable, Optional
+from langchain_core.messages import AIMessage, AIMessageChunk
 from langgraph.graph import MessagesState, StateGraph, START, END
 from web.agent.supervisor_agent import WorkflowSupervisor
 from web.agent.general_question_agent import GeneralQuestionAgent
@@ -9,11 +10,13 @@ from web.agent.frame_extraction_agent import ExtractVideoFramesAgent
 from web.agent.summary_agent import SummaryAgent
 from web.agent.rag_agent import RAGAgent
 from web.agent.report_agent import ReportAgent
+from web.agent.video_ingestion import VideoWorkflowState
 from web.mcp_tools.audio_extractor import chunk_transcript_text, summarize_transcript_chunks
 from web.mcp_tools.video_frames_extractor import summarize_frame_groups
 from src.llm.model_loader import model_manager
-from src.vector_database.qdrant_client import get_qdrant_client
-from src.vector_database.utils import index_chunks_to_qdrant
+from src.llm.executor import inference_executor
+from src.prompt_engineering.schemas import VideoIngestionJob
+from src.vector_database.utils import aindex_chunks_to_qdrant
 
 logger = logging.getLogger(__name__)
 
@@ -79,27 +82,25 @@ async def invoke_summary_agent(session_id: str = "default", user_query: str = "P
         
         logger.info(f"Using collection: '{collection_name}'")
         
-        if not model_manager.is_loaded:
-            raise RuntimeError("Models not loaded. Ensure server started correctly.")
-        
-        model = model_manager.get_qwen_chat_model()
-        qdrant_client = get_qdrant_client()
-        
-        # Initialize SummaryAgent with the specific collection name
-        summary_agent = SummaryAgent(model, qdrant_client, collection_name=collection_name)
-        logger.info(f"SummaryAgent initialized for collection: '{collection_name}'")
-        
-        # Build summary workflow
-        summary_agent_graph = StateGraph(MessagesState)
-        summary_agent_graph.add_node("summary_node", summary_agent.summary_node)
-        summary_agent_graph.add_edge(START, "summary_node")
-        summary_agent_graph.add_edge("summary_node", END)
-        summary_agent_workflow = summary_agent_graph.compile()
-        
-        # Invoke the summary workflow
-        result = await summary_agent_workflow.ainvoke({
-            "messages": [{"role": "user", "content": user_query}]
-        })
+        qdrant_client = await model_manager.aget_async_qdrant_client()
+        with model_manager.lease("chat"):
+            model = await model_manager.aget_qwen_chat_model("summary")
+            
+            # Initialize SummaryAgent with the specific collection name
+            summary_agent = SummaryAgent(model, qdrant_client, collection_name=collection_name)
+            logger.info(f"SummaryAgent initialized for collection: '{collection_name}'")
+            
+            # Build summary workflow
+            summary_agent_graph = StateGraph(MessagesState)
+            summary_agent_graph.add_node("summary_node", summary_agent.summary_node)
+            summary_agent_graph.add_edge(START, "summary_node")
+            summary_agent_graph.add_edge("summary_node", END)
+            summary_agent_workflow = summary_agent_graph.compile()
+            
+            # Invoke the summary workflow
+            result = await summary_agent_workflow.ainvoke({
+                "messages": [{"role": "user", "content": user_query}]
+            })
         
         logger.info("Summary agent invocation completed")
         return result
@@ -126,6 +127,21 @@ def create_summary_workflow_node(session_id: str):
     
     return summary_workflow_node
 
+def create_general_question_workflow_node():
+    """
+    Create a general question workflow node function.
+    
+    Returns:
+        An async function that can be used as a workflow node
+    """
+    async def general_question_workflow_node(state: MessagesState):
+        """Node function for general question workflow"""
+        with model_manager.lease("chat"):
+            general_question_agent = GeneralQuestionAgent(await model_manager.aget_qwen_chat_model("general"))
+            return await general_question_agent.general_question_node(state)
+    
+    return general_question_workflow_node
+
 def create_rag_workflow_node(session_id: str):
     """
     Create a RAG workflow node function for a specific session.
@@ -151,11 +167,12 @@ def create_rag_workflow_node(session_id: str):
         logger.info(f"RAG workflow using collection: '{collection_name}'")
         
         # Initialize RAG Agent with the specific collection name
-        qdrant_client = get_qdrant_client()
+        qdrant_client = await model_manager.aget_async_qdrant_client()
         rag_agent = RAGAgent(qdrant_client, collection_name=collection_name)
         
-        # Invoke RAG agent
-        result = rag_agent.rag_node(state)
+        # Invoke RAG agent; it loads the models it uses on first use
+        with model_manager.lease("embedding", "reranker", "qwen_vl"):
+            result = await rag_agent.rag_node(state)
         return result
     
     return rag_workflow_node
@@ -194,44 +211,42 @@ def create_report_workflow_node(session_id: str):
         # Step 1: Generate summary using SummaryAgent
         logger.info("Step 1: Generating summary...")
         
-        if not model_manager.is_loaded:
-            raise RuntimeError("Models not loaded. Ensure server started correctly.")
-        
-        model = model_manager.get_qwen_chat_model()
-        qdrant_client = get_qdrant_client()
-        
-        summary_agent = SummaryAgent(model, qdrant_client, collection_name=collection_name)
-        
-        # Build and invoke summary workflow
-        summary_graph = StateGraph(MessagesState)
-        summary_graph.add_node("summary_node", summary_agent.summary_node)
-        summary_graph.add_edge(START, "summary_node")
-        summary_graph.add_edge("summary_node", END)
-        summary_workflow = summary_graph.compile()
-        
-        user_query = state['messages'][-1].content if state.get('messages') else "Please generate a report"
-        summary_result = await summary_workflow.ainvoke({
-            "messages": [{"role": "user", "content": user_query}]
-        })
-        
-        logger.info("Summary generation complete")
-        
-        # Step 2: Convert summary to PDF report using ReportAgent
-        logger.info("Step 2: Converting summary to PDF report...")
-        
-        report_agent = ReportAgent(llm=model, collection_name=collection_name)
-        
-        # Build and invoke report workflow with summary result
-        report_graph = StateGraph(MessagesState)
-        report_graph.add_node("report_node", report_agent.report_node)
-        report_graph.add_edge(START, "report_node")
-        report_graph.add_edge("report_node", END)
-        report_workflow = report_graph.compile()
-        
-        # Pass the summary result to report agent
-        report_result = await report_workflow.ainvoke({
-            "messages": summary_result["messages"]
-        })
+        qdrant_client = await model_manager.aget_async_qdrant_client()
+        with model_manager.lease("chat"):
+            model = await model_manager.aget_qwen_chat_model("summary")
+            
+            summary_agent = SummaryAgent(model, qdrant_client, collection_name=collection_name)
+            
+            # Build and invoke summary workflow
+            summary_graph = StateGraph(MessagesState)
+            summary_graph.add_node("summary_node", summary_agent.summary_node)
+            summary_graph.add_edge(START, "summary_node")
+            summary_graph.add_edge("summary_node", END)
+            summary_workflow = summary_graph.compile()
+            
+            user_query = state['messages'][-1].content if state.get('messages') else "Please generate a report"
+            summary_result = await summary_workflow.ainvoke({
+                "messages": [{"role": "user", "content": user_query}]
+            })
+            
+            logger.info("Summary generation complete")
+            
+            # Step 2: Convert summary to PDF report using ReportAgent
+            logger.info("Step 2: Converting summary to PDF report...")
+            
+            report_agent = ReportAgent(llm=await model_manager.aget_qwen_chat_model("report"), collection_name=collection_name)
+            
+            # Build and invoke report workflow with summary result
+            report_graph = StateGraph(MessagesState)
+            report_graph.add_node("report_node", report_agent.report_node)
+            report_graph.add_edge(START, "report_node")
+            report_graph.add_edge("report_node", END)
+            report_workflow = report_graph.compile()
+            
+            # Pass the summary result to report agent
+            report_result = await report_workflow.ainvoke({
+                "messages": summary_result["messages"]
+            })
         
         logger.info("Report generation complete")
         logger.info("=" * 80)
@@ -240,7 +255,50 @@ def create_report_workflow_node(session_id: str):
     
     return report_workflow_node
 
-async def build_agent_workflow(user_request: str, session_id: str = "default"):
+# Workflows whose generated text is the answer shown to the user
+# (router and argument-extraction output is not streamed)
+STREAMED_WORKFLOWS = {"general_question_workflow", "summary_workflow", "rag_workflow", "report_workflow"}
+
+async def stream_workflow_events(app, workflow_input: dict, on_event: Callable[[str, dict], None]) -> dict:
+    """
+    Run a compiled workflow while forwarding its progress to a callback.
+    
+    Events passed to on_event(event, data):
+        route:     {"next": workflow, "tier": routing tier} once the supervisor has decided
+        retrieval: {"chunks": n, "cached": bool, "workflow": ...} once RAG context is ready
+        token:     {"text": fragment, "workflow": ...} for every generated answer fragment
+    
+    Chat-model tokens come from LangGraph's message stream (ChatHuggingFace pipeline
+    and the single-model Qwen adapter both stream through it); the RAG agent, which
+    calls the Qwen model directly, writes its tokens to the custom stream.
+    
+    Args:
+        app: Compiled main workflow graph.
+        workflow_input: Initial workflow state.
+        on_event: Callback receiving (event name, event data).
+        
+    Returns:
+        dict: Final workflow state, as returned by ainvoke().
+    """
+    result = None
+    async for namespace, mode, chunk in app.astream(workflow_input, stream_mode=["values", "messages", "custom"], subgraphs=True):
+        workflow = namespace[0].split(":")[0] if namespace else None
+        if mode == "values":
+            if not namespace:
+                result = chunk
+        elif mode == "messages":
+            message, _ = chunk
+            if isinstance(message, AIMessageChunk) and isinstance(message.content, str) and message.content and workflow in STREAMED_WORKFLOWS:
+                on_event("token", {"text": message.content, "workflow": workflow})
+        else:
+            data = dict(chunk)
+            event = data.pop("event")
+            if workflow:
+                data["workflow"] = workflow
+            on_event(event, data)
+    return result
+
+async def build_agent_workflow(user_request: str, session_id: str = "default", on_event: Optional[Callable[[str, dict], None]] = None, ingestion_job: Optional[VideoIngestionJob] = None):
     """
     Main async function to build and run the workflow.
     
@@ -250,6 +308,10 @@ async def build_agent_workflow(user_request: str, session_id: str = "default"):
     Args:
         user_request: The user's natural language request.
         session_id: Session identifier to track collection names.
+        on_event: Optional callback receiving routing, retrieval and token events
+                  while the workflow runs (see stream_workflow_events).
+        ingestion_job: Optional structured video ingestion job; when given the request is
+                       routed and processed without any LLM parsing.
         
     Returns:
         The compiled workflow application.
@@ -259,41 +321,36 @@ async def build_agent_workflow(user_request: str, session_id: str = "default"):
     logger.info(f"Session ID: '{session_id}'")
     
     try:      
-        if not model_manager.is_loaded:
-            raise RuntimeError("Models not loaded. Ensure server started correctly.")
-        
-        model = model_manager.get_qwen_chat_model()
-        qdrant_client = get_qdrant_client()
+        qdrant_client = await model_manager.aget_async_qdrant_client()
         logger.debug("Core components initialized")
         
-        qwen_vision_processor, qwen_vision_chat_model = model_manager.get_qwen_vision_model()
-        dense_embedding_model, dense_embedding_tokenizer = model_manager.get_embedding_model()
-
-        supervisor = WorkflowSupervisor(model)
-        general_question_agent = GeneralQuestionAgent(model)
-        extract_audio_from_video_agent = ExtractAudioFromVideoAgent(model)
-        extract_video_frames_agent = ExtractVideoFramesAgent(model)
+        # Each node resolves and leases the models it uses when it runs, so a request
+        # never waits for models its workflow does not need
+        supervisor = WorkflowSupervisor()
+        extract_audio_from_video_agent = ExtractAudioFromVideoAgent()
+        extract_video_frames_agent = ExtractVideoFramesAgent()
         # Note: SummaryAgent will be created dynamically based on session's collection
         logger.info("All agents initialized successfully")
 
         # Build general question workflow (subgraph)
         logger.debug("Building general question workflow...")
+        general_question_workflow_node = create_general_question_workflow_node()
         general_agent_graph = StateGraph(MessagesState)
-        general_agent_graph.add_node("general_question_workflow", general_question_agent.general_question_node)
+        general_agent_graph.add_node("general_question_workflow", general_question_workflow_node)
         general_agent_graph.add_edge(START, "general_question_workflow")
         general_agent_graph.add_edge("general_question_workflow", END)
         general_agent_workflow = general_agent_graph.compile()
 
         # Build video frame processing workflow (subgraph)
         logger.debug("Building frame processing workflow...")
-        frame_processing_agent_graph = StateGraph(MessagesState)
+        frame_processing_agent_graph = StateGraph(VideoWorkflowState)
         frame_processing_agent_graph.add_node("extract_frames_from_video", extract_video_frames_agent.extract_frames_node)
         frame_processing_agent_graph.add_edge(START, "extract_frames_from_video")
         extract_frames_from_video_workflow = frame_processing_agent_graph.compile()
 
         # Build audio processing workflow (subgraph)
         logger.debug("Building audio processing workflow...")
-        audio_processing_agent_graph = StateGraph(MessagesState)
+        audio_processing_agent_graph = StateGraph(VideoWorkflowState)
         audio_processing_agent_graph.add_node("extract_audio_from_video", extract_audio_from_video_agent.extract_audio_node)
         audio_processing_agent_graph.add_node("transcript_audio_node", extract_audio_from_video_agent.transcribe_audio_node)
         audio_processing_agent_graph.add_edge(START, "extract_audio_from_video")
@@ -333,7 +390,7 @@ async def build_agent_workflow(user_request: str, session_id: str = "default"):
 
         # Build main graph
         logger.debug("Building main workflow graph...")
-        main_graph = StateGraph(MessagesState)
+        main_graph = StateGraph(VideoWorkflowState)
         main_graph.add_node("supervisor", supervisor.supervisor_node)
         main_graph.add_node("general_question_workflow", general_agent_workflow)
         main_graph.add_node("frame_processing_workflow", extract_frames_from_video_workflow)
@@ -349,7 +406,13 @@ async def build_agent_workflow(user_request: str, session_id: str = "default"):
         logger.info("Main workflow graph compiled successfully")
         
         logger.info("Invoking workflow with user request...")
-        result = await app.ainvoke({"messages": [{"role": "user", "content": user_request}]})
+        workflow_input = {"messages": [{"role": "user", "content": user_request}]}
+        if ingestion_job is not None:
+            workflow_input["ingestion_job"] = ingestion_job
+        if on_event is None:
+            result = await app.ainvoke(workflow_input)
+        else:
+            result = await stream_workflow_events(app, workflow_input, on_event)
 
         # Extract results from messages state
         logger.info("Extracting workflow results...")
@@ -380,69 +443,85 @@ async def build_agent_workflow(user_request: str, session_id: str = "default"):
                 if frame_group_folder_path and transcript_file_path:
                     break
         
-        # Process transcript chunks if available
-        collection_name = video_name
-        if video_name and transcript_file_path:
-            logger.info("="*80)
-            logger.info("PROCESSING TRANSCRIPT")
-            logger.info("="*80)
+        # Summarization and indexing hold Qwen VL and the embedding model; extraction did not
+        with model_manager.lease("qwen_vl", "embedding"):
+            # Process transcript chunks if available
+            collection_name = video_name
+            if video_name and transcript_file_path:
+                logger.info("="*80)
+                logger.info("PROCESSING TRANSCRIPT")
+                logger.info("="*80)
             
-            try:
-                transcript_chunks = chunk_transcript_text(transcript_file_path)
-                logger.info(f"Chunked transcript into {len(transcript_chunks)} chunks")
+                try:
+                    qwen_vision_processor, qwen_vision_chat_model = await model_manager.aget_qwen_vision_model()
+                    dense_embedding_model, dense_embedding_tokenizer = await model_manager.aget_embedding_model()
                 
-                transcript_summary_chunks = summarize_transcript_chunks(
-                    transcript_chunks, 
-                    qwen_vision_processor, 
-                    qwen_vision_chat_model
-                )
-                logger.info(f"Summarized {len(transcript_summary_chunks)} transcript chunks")
+                    transcript_chunks = chunk_transcript_text(transcript_file_path)
+                    logger.info(f"Chunked transcript into {len(transcript_chunks)} chunks")
                 
-                index_chunks_to_qdrant(
-                    qdrant_client=qdrant_client,
-                    collection_name=collection_name,
-                    summary_chunks=transcript_summary_chunks,
-                    dense_tokenizer=dense_embedding_tokenizer,
-                    dense_embedding_model=dense_embedding_model, 
-                    store_type="txt"
-                )
-                logger.info(f"Successfully indexed transcript chunks to Qdrant collection: '{collection_name}'")
+                    transcript_summary_chunks = await inference_executor.run(
+                        qwen_vision_chat_model,
+                        summarize_transcript_chunks,
+                        transcript_chunks, 
+                        qwen_vision_processor, 
+                        qwen_vision_chat_model
+                    )
+                    logger.info(f"Summarized {len(transcript_summary_chunks)} transcript chunks")
+                
+                    await aindex_chunks_to_qdrant(
+                        async_qdrant_client=qdrant_client,
+                        collection_name=collection_name,
+                        summary_chunks=transcript_summary_chunks,
+                        dense_tokenizer=dense_embedding_tokenizer,
+                        dense_embedding_model=dense_embedding_model, 
+                        store_type="txt",
+                        # Frame indexing below waits on the same collection and acts as the barrier
+                        wait=not frame_group_folder_path,
+                        session_id=session_id
+                    )
+                    logger.info(f"Successfully indexed transcript chunks to Qdrant collection: '{collection_name}'")
                 
-                # Store the collection name for this session
-                set_collection_name_for_session(session_id, collection_name)
+                    # Store the collection name for this session
+                    set_collection_name_for_session(session_id, collection_name)
                 
-            except Exception as transcript_error:
-                logger.error(f"Failed to process transcript: {transcript_error}", exc_info=True)
-        
-        # Process frame groups if available
-        if frame_group_folder_path:
-            logger.info("="*80)
-            logger.info("PROCESSING FRAME GROUPS")
-            logger.info("="*80)
+                except Exception as transcript_error:
+                    logger.error(f"Failed to process transcript: {transcript_error}", exc_info=True)
+        
+            # Process frame groups if available
+            if frame_group_folder_path:
+                logger.info("="*80)
+                logger.info("PROCESSING FRAME GROUPS")
+                logger.info("="*80)
             
-            try:
-                frame_summary_chunks = summarize_frame_groups(
-                    frame_group_folder_path,
-                    qwen_vision_processor,
-                    qwen_vision_chat_model
-                )
-                logger.info(f"Summarized {len(frame_summary_chunks)} frame groups")
+                try:
+                    qwen_vision_processor, qwen_vision_chat_model = await model_manager.aget_qwen_vision_model()
+                    dense_embedding_model, dense_embedding_tokenizer = await model_manager.aget_embedding_model()
                 
-                # Index frame summaries to Qdrant (use same collection as transcript)
-                if video_name:
-                    index_chunks_to_qdrant(
-                        qdrant_client=qdrant_client,
-                        collection_name=video_name,
-                        summary_chunks=frame_summary_chunks,
-                        dense_tokenizer=dense_embedding_tokenizer,
-                        dense_embedding_model=dense_embedding_model,
-                        store_type="img"
+                    frame_summary_chunks = await inference_executor.run(
+                        qwen_vision_chat_model,
+                        summarize_frame_groups,
+                        frame_group_folder_path,
+                        qwen_vision_processor,
+                        qwen_vision_chat_model
                     )
-                    logger.info(f"Successfully indexed frame summaries to Qdrant collection: '{video_name}'")
-                else:
-                    logger.warning("No video name available - skipping frame indexing to Qdrant")
-            except Exception as frame_error:
-                logger.error(f"Failed to process frame groups: {frame_error}", exc_info=True)
+                    logger.info(f"Summarized {len(frame_summary_chunks)} frame groups")
+                
+                    # Index frame summaries to Qdrant (use same collection as transcript)
+                    if video_name:
+                        await aindex_chunks_to_qdrant(
+                            async_qdrant_client=qdrant_client,
+                            collection_name=video_name,
+                            summary_chunks=frame_summary_chunks,
+                            dense_tokenizer=dense_embedding_tokenizer,
+                            dense_embedding_model=dense_embedding_model,
+                            store_type="img",
+                            session_id=session_id
+                        )
+                        logger.info(f"Successfully indexed frame summaries to Qdrant collection: '{video_name}'")
+                    else:
+                        logger.warning("No video name available - skipping frame indexing to Qdrant")
+                except Exception as frame_error:
+                    logger.error(f"Failed to process frame groups: {frame_error}", exc_info=True)
 
         logger.info(f"Workflow result: {result}")
         logger.info("Workflow completed successfully")
@@ -473,14 +552,15 @@ async def process_uploaded_video(file_path: str, session_id: str = "default"):
         else:
             relative_path = file_path
         
-        # Construct the user request message
+        # Construct the user request message; the structured job spares the workflow any LLM parsing
         user_request = f"Please process this video file: {relative_path}"
+        ingestion_job = VideoIngestionJob(video_file=relative_path)
         
         logger.info(f"Processing video: {relative_path}")
         logger.info(f"Session ID: {session_id}")
         
         # Execute the workflow
-        result = await build_agent_workflow(user_request, session_id=session_id)
+        result = await build_agent_workflow(user_request, session_id=session_id, ingestion_job=ingestion_job)
         
         return {
             "success": True,
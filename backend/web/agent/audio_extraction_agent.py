@@ -2,11 +2,11 @@ import os
 import asyncio
 import logging
 from config.service_config import settings
-from src.prompt_engineering.templates import ARGUMENT_EXTRACTION_PROMPT, argument_parser
-from langchain_core.messages import AIMessage, HumanMessage
-from langgraph.graph import MessagesState, END
+from src.prompt_engineering.templates import argument_parser
+from web.agent.video_ingestion import VideoWorkflowState, resolve_ingestion_job
+from langchain_core.messages import AIMessage
+from langgraph.graph import END
 from langgraph.types import Command
-from langgraph.prebuilt import create_react_agent
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
 logger = logging.getLogger(__name__)
@@ -19,28 +19,27 @@ class ExtractAudioFromVideoAgent:
     1. Audio Extraction: Extracts audio from video files via MCP server
     2. Audio Transcription: Transcribes the extracted audio to text via MCP server
     
-    The agent parses user requests to extract structured parameters (video file path)
+    The agent resolves the video ingestion job (structured job, the job already resolved
+    by the frame workflow, a path in the request, or LLM extraction as a last resort)
     and coordinates with MCP servers to perform the audio extraction and transcription.
     
     Attributes:
-        llm: The language model instance for parameter extraction.
+        llm: The language model instance for parameter extraction (None: resolved on first use).
         AUDIO_EXTRACTION_SERVER_NAME: Identifier for the audio extraction MCP server.
         AUDIO_TRANSCRIPTION_SERVER_NAME: Identifier for the audio transcription MCP server.
         AUDIO_EXTRACTION_TOOL_NAME: Name of the audio extraction MCP tool.
         AUDIO_TRANSCRIPTION_TOOL_NAME: Name of the audio transcription MCP tool.
         MCP_SERVER_URL: Base URL for MCP server connections.
         parser: Pydantic parser for extracting structured parameters.
-        prompt: System prompt for parameter extraction.
-        agent: The configured ReAct agent for parameter extraction.
     """
     
-    def __init__(self, llm):
+    def __init__(self, llm=None):
         """
         Initialize the ExtractAudioFromVideoAgent.
         
         Args:
-            llm: The language model instance to use for parameter extraction.
-            mcp_server_url: Base URL for MCP server connections.
+            llm: The language model instance to use for parameter extraction; the model
+                 manager's is loaded on first use when not given.
         """
         self.llm = llm
 
@@ -54,11 +53,6 @@ class ExtractAudioFromVideoAgent:
 
         self.MCP_SERVER_URL = settings.AUDIO_MCP_URL
         self.parser = argument_parser
-        self.agent = create_react_agent(
-            self.llm,
-            tools=[],
-            prompt=ARGUMENT_EXTRACTION_PROMPT
-        )
         logger.info(f"ExtractAudioFromVideoAgent initialized with MCP server URL: {self.MCP_SERVER_URL}")
 
     async def run_audio_extraction_server(self, video_file: str, output_folder: str):
@@ -120,7 +114,7 @@ class ExtractAudioFromVideoAgent:
             logger.error(f"Audio extraction MCP server operation failed: {str(e)}", exc_info=True)
             raise
 
-    async def run_transcription_server(self, audio_path: str, output_folder: str):
+    async def run_transcription_server(self, audio_path: str, output_folder: str, chunk_length_s: int = 5):
         """
         Execute audio transcription via MCP server.
 
@@ -130,6 +124,7 @@ class ExtractAudioFromVideoAgent:
         Args:
             audio_path: Path to the input audio file.
             output_folder: Path to the folder where transcription output will be saved.
+            chunk_length_s: Length in seconds of each transcript chunk.
 
         Returns:
             str: The absolute path to the transcribed text file, or None if transcription failed.
@@ -161,7 +156,8 @@ class ExtractAudioFromVideoAgent:
                     self.AUDIO_TRANSCRIPTION_TOOL_NAME,
                     {
                         "audio_path": audio_path,
-                        "output_folder": output_folder
+                        "output_folder": output_folder,
+                        "chunk_length_s": chunk_length_s
                     },
                 )
                 logger.debug(f"MCP tool execution completed - result type: {type(result)}")
@@ -179,12 +175,12 @@ class ExtractAudioFromVideoAgent:
             logger.error(f"Audio transcription MCP server operation failed: {str(e)}", exc_info=True)
             raise
 
-    def extract_audio_node(self, state: MessagesState):
+    def extract_audio_node(self, state: VideoWorkflowState):
         """
         Process audio extraction request by parsing parameters and invoking the MCP tool.
         
         This node:
-        1. Invokes LLM to extract video file path from user request
+        1. Resolves the ingestion job (the LLM is invoked only for free text without a path)
         2. Validates the video file exists
         3. Creates output directory structure
         4. Calls MCP server to perform audio extraction
@@ -202,69 +198,15 @@ class ExtractAudioFromVideoAgent:
         logger.info("="*80)
         
         try:
-            # Extract user request from first message
-            logger.debug("Extracting original user request from message history...")
-            first_message = state["messages"][0]
-            
-            # Handle different message formats
-            if isinstance(first_message, dict):
-                # Message is a dict like {"role": "user", "content": "..."}
-                message_content = first_message.get("content", "")
-                logger.debug(f"Extracted content from dict message: '{message_content}'")
-            elif isinstance(first_message, AIMessage):
-                # AIMessage with potentially structured content
-                if isinstance(first_message.content, list) and len(first_message.content) > 0:
-                    first_item = first_message.content[0]
-                    if isinstance(first_item, dict):
-                        message_content = first_item.get("text", str(first_item))
-                    else:
-                        message_content = str(first_item)
-                else:
-                    message_content = str(first_message.content)
-                logger.debug(f"Extracted content from AIMessage: '{message_content}'")
-            elif hasattr(first_message, 'content'):
-                # HumanMessage or other LangChain message type
-                message_content = first_message.content
-                logger.debug(f"Extracted content from message object: '{message_content}'")
-            else:
-                # Fallback: convert to string
-                message_content = str(first_message)
-                logger.warning(f"Unknown message type, converted to string: '{message_content}'")
-            
-            logger.info(f"User request: '{message_content}'")
-            logger.info("-"*80)
-            
-            # Invoke agent to extract parameters
-            logger.debug("Invoking parameter extraction agent...")
-            response = self.agent.invoke({"messages": [HumanMessage(content=message_content)]})
-
-            last_msg = response.get("messages", [])[-1] if response.get("messages") else None
-
-            if not last_msg or not isinstance(last_msg, AIMessage):
-                logger.warning("Extract audio agent did not return a valid AIMessage - aborting extraction")
-                error_message = "Failed to parse extraction parameters from your request."
-                state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
-
-            response_content = last_msg.content if hasattr(last_msg, 'content') else 'No response generated'
-            logger.info(f"Agent Extracted Parameters: {response_content}")
-            logger.info("-"*80)
-
-            # Parse video file path
+            # Resolve the ingestion job (shared with the frame workflow)
             try:
-                video_file = self.parser.parse(last_msg.content).video_file
-                logger.info(f"Parsed video file path: '{video_file}'")
-            except Exception as parse_error:
-                logger.error(f"Failed to parse video file path: {parse_error}", exc_info=True)
-                error_message = "Could not extract video file path from your request. Please specify the file path clearly."
-                state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
-            
-            if not video_file:
-                logger.error("Video file path is empty")
-                error_message = "No video file path was provided. Please specify a valid file path."
-                state["messages"].append(AIMessage(content=error_message))
+                job = resolve_ingestion_job(state, self.llm)
+            except ValueError as resolve_error:
+                state["messages"].append(AIMessage(content=str(resolve_error)))
                 return Command(update={"messages": state["messages"]}, goto=END)
+            video_file = job.video_file
+            logger.info(f"Ingestion job: {job}")
+            logger.info("-"*80)
 
             logger.debug(f"Validating video file exists at: '{video_file}'")
             if not os.path.exists(video_file):
@@ -318,7 +260,7 @@ class ExtractAudioFromVideoAgent:
             state["messages"].append(AIMessage(content=[extraction_result]))
             logger.debug(f"Routing to transcription node with result: {extraction_result}")
             
-            return Command(update={"messages": state["messages"]}, goto="transcript_audio_node")
+            return Command(update={"messages": state["messages"], "ingestion_job": job}, goto="transcript_audio_node")
             
         except Exception as e:
             logger.error(f"Extract audio node encountered unexpected error: {str(e)}", exc_info=True)
@@ -326,7 +268,7 @@ class ExtractAudioFromVideoAgent:
             state["messages"].append(AIMessage(content=error_message))
             return Command(update={"messages": state["messages"]}, goto=END)
 
-    def transcribe_audio_node(self, state: MessagesState):
+    def transcribe_audio_node(self, state: VideoWorkflowState):
         """
         Process audio transcription request by parsing parameters and invoking the MCP tool.
 
@@ -380,8 +322,10 @@ class ExtractAudioFromVideoAgent:
             # Execute transcription via MCP server
             logger.info("Initiating audio transcription via MCP server...")
             try:
+                job = state.get("ingestion_job")
+                chunk_length_s = job.transcript_chunk_seconds if job else 5
                 transcription_path = asyncio.run(
-                    self.run_transcription_server(audio_file_path, transcript_output_folder)
+                    self.run_transcription_server(audio_file_path, transcript_output_folder, chunk_length_s)
                 )
             except Exception as mcp_error:
                 logger.error(f"MCP server transcription failed: {mcp_error}", exc_info=True)
@@ -2,12 +2,12 @@ import asyncio
 import logging
 import os
 from langchain_core.messages import AIMessage
-from langgraph.graph import MessagesState, END
+from langgraph.graph import END
 from langgraph.types import Command
-from langgraph.prebuilt import create_react_agent
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from config.service_config import settings
-from src.prompt_engineering.templates import ARGUMENT_EXTRACTION_PROMPT, argument_parser
+from src.prompt_engineering.templates import argument_parser
+from web.agent.video_ingestion import VideoWorkflowState, resolve_ingestion_job
 from web.mcp_tools.video_frames_extractor import get_frame_groups
 from typing import Literal
 
@@ -20,46 +20,42 @@ class ExtractVideoFramesAgent:
     This agent orchestrates frame extraction workflow:
     1. Frame Extraction: Extracts frames from video files via MCP server
     
-    The agent parses user requests to extract structured parameters (video file path)
-    and coordinates with MCP servers to perform the frame extraction.
+    The agent resolves the video ingestion job (structured job, path in the request,
+    or LLM extraction as a last resort) and coordinates with MCP servers to perform
+    the frame extraction.
     
     Attributes:
-        llm: The language model instance for parameter extraction.
+        llm: The language model instance for parameter extraction (None: resolved on first use).
         VIDEO_FRAME_EXTRACTION_SERVER_NAME: Identifier for the frame extraction MCP server.
         VIDEO_FRAME_EXTRACTION_TOOL_NAME: Name of the frame extraction MCP tool.
         MCP_SERVER_URL: Base URL for MCP server connections.
         parser: Pydantic parser for extracting structured parameters.
-        prompt: System prompt for parameter extraction.
-        agent: The configured ReAct agent for parameter extraction.
     """
     
-    def __init__(self, llm):
+    def __init__(self, llm=None):
         """
         Initialize the ExtractVideoFramesAgent.
         
         Args:
-            llm: The language model instance to use for parameter extraction.
-            mcp_server_url: Base URL for MCP server connections.
+            llm: The language model instance to use for parameter extraction; the model
+                 manager's is loaded on first use when not given.
         """
         self.llm = llm
         self.VIDEO_FRAME_EXTRACTION_SERVER_NAME = "mcp_video_frame_extraction"
         self.VIDEO_FRAME_EXTRACTION_TOOL_NAME = "extract_video_frames"
         self.MCP_SERVER_URL = settings.VIDEO_FRAME_MCP_URL
         self.parser = argument_parser
-        self.agent = create_react_agent(
-            self.llm,
-            tools=[],
-            prompt=ARGUMENT_EXTRACTION_PROMPT
-        )
         logger.info(f"ExtractVideoFramesAgent initialized with MCP server URL: {self.MCP_SERVER_URL}")
 
-    async def run_frame_extraction_server(self, video_file: str, frames_output_folder: str):
+    async def run_frame_extraction_server(self, video_file: str, frames_output_folder: str, frame_rate: float = 0.25, group_seconds: int = 5):
         """
         Execute frame extraction via MCP server.
         
         Args:
             video_file: Path to the input video file.
             frames_output_folder: Path to the folder where frame outputs will be saved.
+            frame_rate: Frames to extract per second.
+            group_seconds: Duration in seconds of each frame group.
             
         Returns:
             str: Information about the extracted frames, or None if extraction failed.
@@ -92,6 +88,8 @@ class ExtractVideoFramesAgent:
                     {
                         "video_file": video_file,
                         "output_folder": frames_output_folder,
+                        "frame_rate": frame_rate,
+                        "group_seconds": group_seconds,
                     },
                 )
                 logger.debug(f"MCP tool execution completed - result type: {type(result)}")
@@ -109,58 +107,38 @@ class ExtractVideoFramesAgent:
             logger.error(f"Frame extraction MCP server operation failed: {str(e)}", exc_info=True)
             raise
 
-    def extract_frames_node(self, state: MessagesState):
+    def extract_frames_node(self, state: VideoWorkflowState):
         """
-        Process frame extraction request by parsing parameters and invoking the MCP tool.
+        Process frame extraction request by resolving the ingestion job and invoking the MCP tool.
         
         This node:
-        1. Invokes LLM to extract video file path from user request
+        1. Resolves the ingestion job (the LLM is invoked only for free text without a path)
         2. Validates the video file exists
         3. Creates output directory structure
         4. Calls MCP server to perform frame extraction
         5. Groups extracted frames and terminates workflow
         
         Args:
-            state: The current messages state containing the user's extraction request.
+            state: The current workflow state containing the user's request or ingestion job.
             
         Returns:
-            Command: Updated state with extraction results and routing to END.
+            Command: Updated state with extraction results and the resolved job (reused by
+                     the audio workflow), routing to END.
         """
         logger.info("="*80)
         logger.info("EXTRACT VIDEO FRAME AGENT - Processing Request")
         logger.info("="*80)
         
         try:
-            # Invoke agent to extract parameters
-            logger.debug("Invoking parameter extraction agent...")
-            response = self.agent.invoke(state)
-            last_msg = response.get("messages", [])[-1] if response.get("messages") else None
-
-            if not last_msg or not isinstance(last_msg, AIMessage):
-                logger.warning("Extract audio agent did not return a valid AIMessage - aborting extraction")
-                error_message = "Failed to parse extraction parameters from your request."
-                state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
-
-            response_content = last_msg.content if hasattr(last_msg, 'content') else 'No response generated'
-            logger.info(f"Agent Extracted Parameters: {response_content}")
-            logger.info("-"*80)
-
-            # Parse video file path
+            # Resolve the ingestion job
             try:
-                video_file = self.parser.parse(last_msg.content).video_file
-                logger.info(f"Parsed video file path: '{video_file}'")
-            except Exception as parse_error:
-                logger.error(f"Failed to parse video file path: {parse_error}", exc_info=True)
-                error_message = "Could not extract video file path from your request. Please specify the file path clearly."
-                state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
-            
-            if not video_file:
-                logger.error("Video file path is empty")
-                error_message = "No video file path was provided. Please specify a valid file path."
-                state["messages"].append(AIMessage(content=error_message))
+                job = resolve_ingestion_job(state, self.llm)
+            except ValueError as resolve_error:
+                state["messages"].append(AIMessage(content=str(resolve_error)))
                 return Command(update={"messages": state["messages"]}, goto=END)
+            video_file = job.video_file
+            logger.info(f"Ingestion job: {job}")
+            logger.info("-"*80)
             
             # Validate video file exists 
             logger.debug(f"Validating video file exists at: '{video_file}'")
@@ -168,7 +146,7 @@ class ExtractVideoFramesAgent:
                 logger.error(f"Video file not found: '{video_file}'")
                 error_message = f"The specified video file does not exist: {video_file}"
                 state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
+                return Command(update={"messages": state["messages"], "ingestion_job": job}, goto=END)
             logger.info(f"Video file validated successfully: '{video_file}'")
             
             # Create output directory structure
@@ -183,17 +161,17 @@ class ExtractVideoFramesAgent:
                 logger.error(f"Failed to create output directory: {dir_error}", exc_info=True)
                 error_message = f"Failed to create output directory: {frame_output_folder}"
                 state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
+                return Command(update={"messages": state["messages"], "ingestion_job": job}, goto=END)
             
             # Execute frame extraction via MCP server
             logger.info("Initiating frame extraction via MCP server...")
             try:
-                asyncio.run(self.run_frame_extraction_server(video_file, frame_output_folder))
+                asyncio.run(self.run_frame_extraction_server(video_file, frame_output_folder, job.frame_rate, job.frame_group_seconds))
             except Exception as mcp_error:
                 logger.error(f"MCP server frame extraction failed: {mcp_error}", exc_info=True)
                 error_message = f"Frame extraction failed due to server error. Please try again."
                 state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
+                return Command(update={"messages": state["messages"], "ingestion_job": job}, goto=END)
             
             logger.info(f"Frame extraction completed successfully - output folder: '{frame_output_folder}'")
 
@@ -204,12 +182,12 @@ class ExtractVideoFramesAgent:
                 logger.error(f"Failed to group frames: {group_error}", exc_info=True)
                 error_message = "Frame extraction succeeded but grouping failed. Please check the output folder."
                 state["messages"].append(AIMessage(content=error_message))
-                return Command(update={"messages": state["messages"]}, goto=END)
+                return Command(update={"messages": state["messages"], "ingestion_job": job}, goto=END)
 
             state["messages"].append(AIMessage(content=[{"frame_group_folder_path": frame_group_folder_path}]))
             logger.info("="*80)
             
-            return Command(update={"messages": state["messages"]}, goto=END)
+            return Command(update={"messages": state["messages"], "ingestion_job": job}, goto=END)
             
         except Exception as e:
             logger.error(f"Extract audio node encountered unexpected error: {str(e)}", exc_info=True)
@@ -2,6 +2,7 @@ from langchain_core.messages import AIMessage
 from langgraph.graph import MessagesState, END
 from langgraph.types import Command
 from langgraph.prebuilt import create_react_agent
+from src.llm.executor import inference_executor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,7 +35,7 @@ class GeneralQuestionAgent:
         )
         logger.info("GeneralQuestionAgent initialized")
 
-    def general_question_node(self, state: MessagesState):
+    async def general_question_node(self, state: MessagesState):
         """
         Process a general question and generate a response.
         
@@ -58,7 +59,7 @@ class GeneralQuestionAgent:
             
             # Invoke agent to generate response
             logger.debug("Invoking general question agent...")
-            response = self.agent.invoke(state)
+            response = await inference_executor.run(self.llm, self.agent.invoke, state)
             last_msg = response.get("messages", [])[-1] if response.get("messages") else None
 
             if not last_msg:
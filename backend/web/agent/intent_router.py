@@ -0,0 +1,227 @@
+"""
+Intent Router
+Fast routing tiers tried before the LLM supervisor: deterministic rules, then an
+embedding-similarity classifier over labelled intent exemplars
+"""
+import logging
+import re
+import threading
+from collections import defaultdict
+from typing import NamedTuple, Optional
+import numpy as np
+from config.service_config import settings
+from src.llm.executor import inference_executor
+from src.vector_database.utils import build_dense_embedding
+from web.agent.video_ingestion import media_path_pattern
+
+logger = logging.getLogger(__name__)
+
+# Labelled requests per workflow; the embedding tier matches user queries against them
+INTENT_EXEMPLARS: dict[str, list[str]] = {
+    "general_question_workflow": [
+        "Can you explain how transformers work in simple terms?",
+        "What is the difference between machine learning and deep learning?",
+        "How does a vector database store embeddings?",
+        "Write a short poem about the ocean",
+        "What is the capital of Australia?",
+        "Give me tips for improving my public speaking",
+        "How do I reverse a list in Python?",
+        "What does retrieval-augmented generation mean?",
+    ],
+    "summary_workflow": [
+        "Give me a summary of the video",
+        "Summarize the video",
+        "What is the video about?",
+        "Can you provide an overview of the video?",
+        "Briefly summarize what was covered in the recording",
+        "Give me the key takeaways of the video",
+        "TL;DR of the video please",
+    ],
+    "rag_workflow": [
+        "What did they talk about in the video?",
+        "What happened at the beginning of the video?",
+        "Who is the speaker in the video?",
+        "What did the presenter say about the budget?",
+        "Explain the main points discussed in the meeting",
+        "What decisions were made in the meeting?",
+        "Which tools were shown on screen?",
+        "When did they mention the deadline?",
+    ],
+    "report_workflow": [
+        "Generate a report of the video",
+        "Create a PDF report",
+        "Export the video analysis as a report",
+        "Make a PDF document summarizing the video",
+        "I need a written report about this recording",
+        "Produce a report I can share with my team",
+    ],
+}
+
+# Start of an explicit command: "please", "can you", "could you please" ...
+_COMMAND_START = r"^\s*(?:please[\s,]+)?(?:(?:can|could|would|will)\s+you\s+(?:please\s+)?)?"
+_INGEST_VERBS = r"(?:process|ingest|index|analy[sz]e|extract|transcribe|pull|upload|import|load|add)"
+_VIDEO_PATH = media_path_pattern()
+_AUDIO_PATH = media_path_pattern(audio=True)
+
+# Deterministic rules: (pattern, workflow), first match wins. They only match explicit
+# commands; questions that merely mention a file or a report fall through to the
+# embedding and LLM tiers ("What happens in demo.mp4 at minute 3?")
+ROUTING_RULES: list[tuple[re.Pattern, str]] = [
+    # Ingest verb followed by a path, or a bare path (also covers "extract the audio from video.mp4")
+    (re.compile(rf"{_COMMAND_START}{_INGEST_VERBS}\b.*?{_VIDEO_PATH}|^\s*{_VIDEO_PATH}\s*$", re.IGNORECASE), "frame_processing_workflow"),
+    (re.compile(rf"{_COMMAND_START}{_INGEST_VERBS}\b.*?{_AUDIO_PATH}|^\s*{_AUDIO_PATH}\s*$", re.IGNORECASE), "audio_processing_workflow"),
+    # "Generate a report", "Create the PDF report", "Could you produce a detailed report ..."
+    (re.compile(rf"{_COMMAND_START}(?:generate|create|export|make|build|produce)\s+(?:me\s+)?(?:(?:a|an|the)\s+)?(?:(?:full|short|brief|detailed|written|pdf)\s+)*report\b", re.IGNORECASE), "report_workflow"),
+    (re.compile(r"^\s*(please\s+)?(summari[sz]e|give me a summary|provide a summary)\b.*\b(video|recording|meeting)\b", re.IGNORECASE), "summary_workflow"),
+]
+
+class RouteDecision(NamedTuple):
+    """Outcome of one routing tier"""
+    next: Optional[str]   # workflow node, or None when the tier is not confident
+    tier: str             # 'rules' | 'embedding' | 'llm'
+    confidence: float
+
+class IntentRouter:
+    """
+    Tiered intent router in front of the LLM supervisor.
+
+    Tier 1 matches deterministic rules (explicit ingestion and report commands).
+    Tier 2 embeds the query with the loaded dense embedding model and scores each
+    workflow by its most similar exemplar; it decides when the best score clears
+    the similarity threshold and leads the runner-up workflow by the margin.
+    Queries neither tier is confident about go to the LLM supervisor.
+
+    Attributes:
+        similarity_threshold: Minimum cosine similarity to the best exemplar
+        margin: Minimum lead of the best workflow over the runner-up
+    """
+
+    def __init__(self, similarity_threshold: float = 0.75, margin: float = 0.05, exemplars: dict[str, list[str]] = INTENT_EXEMPLARS):
+        """
+        Initialize the router.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity to the best exemplar
+            margin: Minimum lead of the best workflow over the runner-up
+            exemplars: Labelled requests per workflow
+        """
+        self.similarity_threshold = similarity_threshold
+        self.margin = margin
+        self.exemplars = exemplars
+        # id(embedding model) -> (exemplar embedding matrix, workflow label per row)
+        self._exemplar_embeddings: dict[int, tuple[np.ndarray, list[str]]] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._decisions: dict[str, int] = defaultdict(int)
+        self._latency_ms: dict[str, float] = defaultdict(float)
+
+    def route_by_rules(self, user_query: str) -> RouteDecision:
+        """
+        Tier 1: match the deterministic routing rules.
+
+        Args:
+            user_query: User request
+
+        Returns:
+            RouteDecision: Matched workflow with confidence 1.0, or next=None
+        """
+        for pattern, workflow in ROUTING_RULES:
+            if pattern.search(user_query):
+                return RouteDecision(workflow, "rules", 1.0)
+        return RouteDecision(None, "rules", 0.0)
+
+    def _get_exemplar_embeddings(self, dense_embedding_tokenizer, dense_embedding_model) -> tuple[np.ndarray, list[str]]:
+        """Embed the exemplars once per embedding model"""
+        with self._lock:
+            cached = self._exemplar_embeddings.get(id(dense_embedding_model))
+            if cached is None:
+                labels = [workflow for workflow, texts in self.exemplars.items() for _ in texts]
+                texts = [text for workflow_texts in self.exemplars.values() for text in workflow_texts]
+                matrix = np.array([
+                    build_dense_embedding(dense_embedding_tokenizer, dense_embedding_model, text) for text in texts
+                ], dtype=np.float32)
+                cached = (matrix, labels)
+                self._exemplar_embeddings[id(dense_embedding_model)] = cached
+                logger.info(f"Embedded {len(texts)} intent exemplars for {len(self.exemplars)} workflows")
+            return cached
+
+    def route_by_embedding(self, user_query: str, dense_embedding_tokenizer, dense_embedding_model) -> RouteDecision:
+        """
+        Tier 2: classify the query by similarity to the intent exemplars.
+
+        Args:
+            user_query: User request
+            dense_embedding_tokenizer: Tokenizer of the dense embedding model
+            dense_embedding_model: Loaded dense embedding model (e.g., BGE)
+
+        Returns:
+            RouteDecision: Best workflow and its similarity; next=None below the threshold or margin
+        """
+        matrix, labels = self._get_exemplar_embeddings(dense_embedding_tokenizer, dense_embedding_model)
+        query_embedding = np.asarray(build_dense_embedding(dense_embedding_tokenizer, dense_embedding_model, user_query), dtype=np.float32)
+        similarities = matrix @ query_embedding
+
+        scores: dict[str, float] = {}
+        for label, similarity in zip(labels, similarities):
+            scores[label] = max(scores.get(label, -1.0), float(similarity))
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_workflow, best_score = ranked[0]
+        runner_up_score = ranked[1][1] if len(ranked) > 1 else -1.0
+
+        logger.debug(f"Intent scores: {ranked}")
+        if best_score >= self.similarity_threshold and best_score - runner_up_score >= self.margin:
+            return RouteDecision(best_workflow, "embedding", best_score)
+        return RouteDecision(None, "embedding", best_score)
+
+    async def aroute(self, user_query: str, dense_embedding_tokenizer=None, dense_embedding_model=None) -> RouteDecision:
+        """
+        Run the fast tiers in order.
+
+        Args:
+            user_query: User request
+            dense_embedding_tokenizer: Tokenizer of the dense embedding model
+            dense_embedding_model: Loaded dense embedding model; the embedding tier is skipped without it
+
+        Returns:
+            RouteDecision: First confident decision, or next=None when the LLM should decide
+        """
+        decision = self.route_by_rules(user_query)
+        if decision.next or dense_embedding_model is None:
+            return decision
+        return await inference_executor.run(
+            dense_embedding_model, self.route_by_embedding, user_query, dense_embedding_tokenizer, dense_embedding_model
+        )
+
+    def record(self, tier: str, latency_ms: float) -> None:
+        """
+        Count a routing decision made by a tier.
+
+        Args:
+            tier: Tier that decided ('job', 'rules', 'embedding' or 'llm')
+            latency_ms: Time spent routing, including the tiers tried before
+        """
+        with self._lock:
+            self._decisions[tier] += 1
+            self._latency_ms[tier] += latency_ms
+
+    def get_metrics(self) -> dict:
+        """
+        Get routing metrics.
+
+        Returns:
+            dict: Decisions and mean routing latency per tier
+        """
+        with self._lock:
+            return {
+                tier: {
+                    "decisions": count,
+                    "mean_latency_ms": self._latency_ms[tier] / count,
+                }
+                for tier, count in self._decisions.items()
+            }
+
+intent_router = IntentRouter(
+    similarity_threshold=settings.INTENT_ROUTER_SIMILARITY_THRESHOLD,
+    margin=settings.INTENT_ROUTER_MARGIN,
+)
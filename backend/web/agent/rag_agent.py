@@ -1,8 +1,15 @@
 from langchain_core.messages import AIMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import MessagesState, END
 from langgraph.types import Command
-from src.vector_database.retriever import query_rag_points, build_doc_context, generate_rag_response
+from src.vector_database.retriever import aquery_rag_points, aexpand_neighbor_context, pack_doc_context, agenerate_rag_response
+from config.service_config import settings
+from src.vector_database.temporal import parse_temporal_reference, aget_time_window_points
+from src.vector_database.answer_cache import answer_cache
+from src.vector_database.retrieval_cache import retrieval_cache
+from src.vector_database.utils import abuild_dense_embedding
 from src.llm.model_loader import model_manager
+from src.llm.inference import CallbackTextStreamer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +22,7 @@ class RAGAgent:
     and generates responses based on the retrieved information.
     
     Attributes:
-        qdrant_client: Qdrant client for vector search
+        qdrant_client: Async Qdrant client for vector search
         collection_name: Name of the collection to query
     """
     
@@ -24,14 +31,14 @@ class RAGAgent:
         Initialize the RAGAgent.
         
         Args:
-            qdrant_client: The Qdrant client instance
+            qdrant_client: The async Qdrant client instance
             collection_name: The name of the collection to query in Qdrant
         """
         self.qdrant_client = qdrant_client
         self.collection_name = collection_name
         logger.info(f"RAGAgent initialized for collection: '{collection_name}'")
 
-    def rag_node(self, state: MessagesState):
+    async def rag_node(self, state: MessagesState):
         """
         Process a user query using RAG (Retrieval-Augmented Generation).
         
@@ -46,62 +53,111 @@ class RAGAgent:
         logger.info("="*80)
         
         try:
+            # Progress events for streaming clients (a no-op unless the workflow is streamed)
+            write_event = get_stream_writer()
+            
             # Extract user message
             user_message = state['messages'][-1].content if state.get('messages') else 'N/A'
             logger.info(f"User Query: {user_message}")
             
             # Get embedding model
             try:
-                dense_embedding_model, dense_embedding_tokenizer = model_manager.get_embedding_model()
+                dense_embedding_model, dense_embedding_tokenizer = await model_manager.aget_embedding_model()
             except Exception as e:
                 logger.error(f"Failed to get embedding model: {str(e)}")
                 error_msg = "I'm having trouble loading the AI models. Please try again later."
                 state["messages"].append(AIMessage(content=error_msg))
                 return Command(update={"messages": state["messages"]}, goto=END)
             
+            # Time-anchored questions are answered from the chunks of that time window
+            temporal_range = parse_temporal_reference(user_message)
+            
+            # Reuse the answer of a near-duplicate question (not for time-anchored ones,
+            # where "minute 10" and "minute 12" embed almost identically)
+            question_embedding = None
+            collection_version = retrieval_cache.get_version(self.collection_name)
+            if settings.ANSWER_CACHE_ENABLED and not temporal_range:
+                try:
+                    question_embedding = await abuild_dense_embedding(
+                        dense_embedding_tokenizer, dense_embedding_model, user_message
+                    )
+                    cached = answer_cache.lookup(self.collection_name, question_embedding)
+                    if cached:
+                        write_event({"event": "retrieval", "chunks": 0, "cached": True})
+                        state["messages"].append(AIMessage(content=cached.answer))
+                        return Command(update={"messages": state["messages"]}, goto=END)
+                except Exception as e:
+                    logger.warning(f"Semantic answer cache lookup failed: {str(e)}")
+            
             # Query vector database
             logger.info(f"Querying vector database in collection '{self.collection_name}'...")
             try:
-                retrieved_points = query_rag_points(
-                    user_message,
-                    dense_embedding_model,
-                    dense_embedding_tokenizer,
-                    self.qdrant_client,
-                    self.collection_name
-                )
+                retrieved_points = None
+                
+                if temporal_range:
+                    retrieved_points = await aget_time_window_points(self.qdrant_client, self.collection_name, temporal_range)
+                    if not retrieved_points:
+                        logger.info("No chunks in the referenced time window, falling back to hybrid search")
+                
+                if not retrieved_points:
+                    retrieved_points = await aquery_rag_points(
+                        user_message,
+                        dense_embedding_model,
+                        dense_embedding_tokenizer,
+                        self.qdrant_client,
+                        self.collection_name,
+                        dense_vector=question_embedding
+                    )
+                    hits = retrieved_points.points[:settings.RAG_TOP_K]
+                    # Rerank the fused candidates so fewer chunks reach the generator
+                    reranker = await model_manager.aget_reranker()
+                    if reranker:
+                        hits = await reranker.arerank(user_message, retrieved_points.points, top_k=settings.RERANK_TOP_K)
+                    # Add the chunks around each hit instead of raising the search limit
+                    retrieved_points = await aexpand_neighbor_context(
+                        self.qdrant_client,
+                        self.collection_name,
+                        hits
+                    )
             except Exception as e:
                 logger.error(f"Failed to query vector database: {str(e)}", exc_info=True)
                 error_msg = "I'm having trouble accessing the knowledge base. Please try again later."
                 state["messages"].append(AIMessage(content=error_msg))
                 return Command(update={"messages": state["messages"]}, goto=END)
             
-            # Build document context
+            # Get vision model for response generation
             try:
-                doc_context = build_doc_context(retrieved_points)
-                logger.info(f"Document context built ({len(doc_context)} characters)")
+                qwen_vision_processor, qwen_vision_chat_model = await model_manager.aget_qwen_vision_model()
             except Exception as e:
-                logger.error(f"Failed to build document context: {str(e)}", exc_info=True)
-                error_msg = "An error occurred while processing the retrieved information."
+                logger.error(f"Failed to get vision model: {str(e)}")
+                error_msg = "I'm having trouble loading the response generation model."
                 state["messages"].append(AIMessage(content=error_msg))
                 return Command(update={"messages": state["messages"]}, goto=END)
             
-            # Get vision model for response generation
+            # Pack document context into the generator's token budget
             try:
-                qwen_vision_processor, qwen_vision_chat_model = model_manager.get_qwen_vision_model()
+                doc_context = pack_doc_context(retrieved_points, qwen_vision_processor.tokenizer)
+                logger.info(f"Document context built ({len(doc_context)} characters)")
+                write_event({"event": "retrieval", "chunks": len(getattr(retrieved_points, "points", retrieved_points)), "cached": False})
             except Exception as e:
-                logger.error(f"Failed to get vision model: {str(e)}")
-                error_msg = "I'm having trouble loading the response generation model."
+                logger.error(f"Failed to build document context: {str(e)}", exc_info=True)
+                error_msg = "An error occurred while processing the retrieved information."
                 state["messages"].append(AIMessage(content=error_msg))
                 return Command(update={"messages": state["messages"]}, goto=END)
             
             # Generate RAG response
             logger.info("Generating RAG response...")
             try:
-                response = generate_rag_response(
+                streamer = CallbackTextStreamer(
+                    qwen_vision_processor.tokenizer,
+                    lambda text: write_event({"event": "token", "text": text})
+                )
+                response = await agenerate_rag_response(
                     doc_context,
                     user_message,
                     qwen_vision_processor,
-                    qwen_vision_chat_model
+                    qwen_vision_chat_model,
+                    streamer
                 )
             except Exception as e:
                 logger.error(f"Failed to generate RAG response: {str(e)}", exc_info=True)
@@ -113,6 +169,8 @@ class RAGAgent:
             if not response or not response.strip():
                 logger.warning("Generated response is empty")
                 response = "I'm sorry, I couldn't generate a meaningful response based on the available information."
+            elif question_embedding is not None:
+                answer_cache.store(self.collection_name, user_message, question_embedding, response, collection_version)
             
             logger.info(f"RAG response generated: {response[:100]}...")
             
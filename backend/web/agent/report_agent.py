@@ -8,6 +8,7 @@ from langgraph.prebuilt import create_react_agent
 from markdown_pdf import MarkdownPdf, Section
 from config.service_config import settings
 from src.prompt_engineering.templates import REPORT_GENERATION_PROMPT
+from src.llm.executor import inference_executor
 
 logger = logging.getLogger(__name__)
 
@@ -176,7 +177,7 @@ class ReportAgent:
             logger.info("Invoking LLM agent to generate markdown report...")
             
             # Invoke the agent to generate markdown
-            result = self.agent.invoke({
+            result = inference_executor.call(self.llm, self.agent.invoke, {
                 "messages": [HumanMessage(content=user_request)]
             })
             
@@ -3,7 +3,8 @@ from langgraph.graph import MessagesState, END
 from langgraph.types import Command
 from langgraph.prebuilt import create_react_agent
 from src.prompt_engineering.templates import SUMMARY_PROMPT
-from src.vector_database.retriever import get_summary_chunks
+from src.vector_database.retriever import aget_summary_chunks
+from src.llm.executor import inference_executor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ class SummaryAgent:
 
         Args:
             llm: The language model instance to use for generating responses.
-            qdrant_client: The Qdrant client for retrieving summary chunks.
+            qdrant_client: The async Qdrant client for retrieving summary chunks.
             collection_name: The name of the collection to query in Qdrant.
         """
         self.llm = llm
@@ -39,7 +40,7 @@ class SummaryAgent:
         )
         logger.info("SummaryAgent initialized")
 
-    def summary_node(self, state: MessagesState):
+    async def summary_node(self, state: MessagesState):
         """
         Process a user query and generate a summary response.
 
@@ -61,7 +62,7 @@ class SummaryAgent:
             # Retrieve summary chunks
             logger.info("Retrieving summary chunks...")
             filter_type = "txt"
-            summary_chunks = get_summary_chunks(self.qdrant_client, self.collection_name, filter_type)
+            summary_chunks = await aget_summary_chunks(self.qdrant_client, self.collection_name, filter_type)
 
             # Validate summary chunks
             if not summary_chunks:
@@ -72,7 +73,9 @@ class SummaryAgent:
             # Invoke agent to generate response
             try:
                 logger.info("Invoking summarization agent...")
-                response = self.agent.invoke({"messages": [HumanMessage(content=summary_chunks)]})
+                response = await inference_executor.run(
+                    self.llm, self.agent.invoke, {"messages": [HumanMessage(content=summary_chunks)]}
+                )
             except Exception as e:
                 logger.error(f"Error during agent invocation: {str(e)}", exc_info=True)
                 state["messages"].append(AIMessage(content="An error occurred while generating the summary."))
@@ -1,13 +1,24 @@
 from langchain_core.messages import AIMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import MessagesState, END
 from langgraph.types import Command
 from langgraph.prebuilt import create_react_agent
 from src.prompt_engineering.templates import AGENT_SUPERVISOR_PROMPT, supervisor_output_parser
+from src.prompt_engineering.schemas import AgentSupervisorRouter
+from src.llm.chat_model import constrain_chat_model
+from src.llm.executor import inference_executor
+from src.llm.model_loader import model_manager
+from web.agent.intent_router import intent_router, RouteDecision
+from web.agent.video_ingestion import VideoWorkflowState
+from config.service_config import settings
 from typing import Literal
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+WORKFLOW_NODES = ["general_question_workflow", "frame_processing_workflow", "audio_processing_workflow", "summary_workflow", "rag_workflow", "report_workflow"]
+
 class WorkflowSupervisor:
     """
     Routing supervisor agent that analyzes user requests and routes them to appropriate workflows.
@@ -15,38 +26,46 @@ class WorkflowSupervisor:
     This agent acts as a central dispatcher, determining whether a request should be handled by
     the general question workflow, frame processing workflow, or if the conversation should end.
     
+    Models a tier needs are resolved from the model manager when that tier runs, so a
+    request decided by the rules never waits for a lazy model.
+    
     Attributes:
-        llm: The language model instance for routing decisions.
+        llm: The language model instance for routing decisions (None: resolved on first use).
         supervisor_output_parser: Parser for structured routing output.
-        supervisor_prompt: System prompt template for routing logic.
-        agent: The configured ReAct agent for routing.
+        dense_embedding_model: Embedding model used by the fast routing tier (None: resolved on first use).
+        dense_embedding_tokenizer: Tokenizer of the embedding model.
     """
     
-    def __init__(self, llm):
+    def __init__(self, llm=None, dense_embedding_model=None, dense_embedding_tokenizer=None):
         """
         Initialize the WorkflowSupervisor.
         
         Args:
-            llm: The language model instance to use for routing decisions.
+            llm: The language model instance to use for routing decisions; the model
+                 manager's router model is loaded on first use when not given.
+            dense_embedding_model: Loaded dense embedding model for the exemplar-similarity
+                                   routing tier; the model manager's is loaded on first use
+                                   when not given.
+            dense_embedding_tokenizer: Tokenizer of the dense embedding model.
         """
         self.llm = llm 
+        self.dense_embedding_model = dense_embedding_model
+        self.dense_embedding_tokenizer = dense_embedding_tokenizer
         self.supervisor_output_parser = supervisor_output_parser
-        self.agent = create_react_agent(
-            model=llm,
-            tools=[], 
-            prompt=AGENT_SUPERVISOR_PROMPT
-        )
         logger.info("WorkflowSupervisor initialized")
 
-    def supervisor_node(self, state: MessagesState) -> Command[Literal["general_question_workflow", "frame_processing_workflow", "audio_processing_workflow", "summary_workflow", "rag_workflow", "report_workflow", "__end__"]]:
+    async def supervisor_node(self, state: VideoWorkflowState) -> Command[Literal["general_question_workflow", "frame_processing_workflow", "audio_processing_workflow", "summary_workflow", "rag_workflow", "report_workflow", "__end__"]]:
         """
         Process the current state and determine the next workflow to execute.
         
-        Analyzes the user's message, invokes the LLM-based routing agent, and returns
-        a routing decision to direct the conversation to the appropriate workflow node.
+        A structured video ingestion job goes straight to the frame processing workflow.
+        Otherwise tries the fast routing tiers first (deterministic rules, then similarity to
+        labelled intent exemplars) and invokes the LLM-based routing agent only when
+        neither is confident. Every decision is logged with the tier that made it.
         
         Args:
-            state: The current messages state containing user input and conversation history.
+            state: The current workflow state containing user input, conversation history
+                   and the ingestion job, if any.
             
         Returns:
             Command: Routing command specifying which workflow node to execute next.
@@ -67,24 +86,91 @@ class WorkflowSupervisor:
             user_query = state['messages'][0].content
             logger.info(f"User Query: '{user_query}'")
 
-            # Invoke routing agent
-            logger.debug("Invoking supervisor routing agent...")
-            response = self.agent.invoke(state)
-            logger.debug(f"Agent returned {len(response.get('messages', []))} response message(s)")
+            start_time = time.perf_counter()
+            decision = None
+            if state.get("ingestion_job"):
+                decision = RouteDecision("frame_processing_workflow", "job", 1.0)
+            elif settings.INTENT_ROUTER_ENABLED:
+                decision = intent_router.route_by_rules(user_query)
+                if not decision.next:
+                    decision = await self.route_with_embedding(user_query)
+                if not decision.next:
+                    logger.info(f"Fast routing not confident (best {decision.tier} score {decision.confidence:.3f}) - asking the LLM")
 
-            # Extract routing decision
-            last_message = response.get("messages", [])[-1] if response.get("messages") else None
-    
-            if not last_message or not isinstance(last_message, AIMessage):
-                logger.warning("Supervisor did not return a valid AIMessage - routing to END")
-                return Command(goto=END)
+            if decision and decision.next:
+                goto, tier, confidence = decision.next, decision.tier, decision.confidence
+            else:
+                goto, tier, confidence = await self.route_with_llm(state), "llm", None
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            intent_router.record(tier, latency_ms)
+
+            confidence_text = f", confidence={confidence:.3f}" if confidence is not None else ""
+            logger.info(f"Routing to '{goto}' (tier={tier}{confidence_text}, {latency_ms:.1f} ms)")
+            logger.info("="*80)
+            # Tell streaming clients which workflow will answer
+            get_stream_writer()({"event": "route", "next": goto, "tier": tier})
+            return Command(goto=goto)
+            
+        except Exception as e:
+            logger.error(f"Supervisor node encountered unexpected error: {str(e)}", exc_info=True)
+            logger.warning("Routing to END due to error")
+            return Command(goto=END)
+
+    async def route_with_embedding(self, user_query: str) -> RouteDecision:
+        """
+        Run the fast routing tiers with the embedding model, loading it if needed.
+        
+        Args:
+            user_query: User request
+            
+        Returns:
+            RouteDecision: First confident decision, or next=None when the LLM should decide
+        """
+        with model_manager.lease("embedding"):
+            if self.dense_embedding_model is None:
+                dense_embedding_model, dense_embedding_tokenizer = await model_manager.aget_embedding_model()
+            else:
+                dense_embedding_model, dense_embedding_tokenizer = self.dense_embedding_model, self.dense_embedding_tokenizer
+            return await intent_router.aroute(user_query, dense_embedding_tokenizer, dense_embedding_model)
+
+    async def route_with_llm(self, state: MessagesState) -> str:
+        """
+        Ask the LLM routing agent for the next workflow.
+        
+        Args:
+            state: The current messages state containing user input and conversation history.
             
-            try:
-                # Clean the response content before parsing
-                raw_content = last_message.content
-                logger.debug(f"Raw LLM response: {raw_content}")
-                
-                # Remove markdown code fences if present
+        Returns:
+            str: Workflow node name, or END if the response is missing or cannot be parsed.
+        """
+        # Invoke routing agent
+        logger.debug("Invoking supervisor routing agent...")
+        with model_manager.lease("chat"):
+            llm = self.llm or await model_manager.aget_qwen_chat_model("router")
+            # Decoding is constrained to the router schema, so the answer is always a parseable {"next": ...}
+            agent = create_react_agent(
+                model=constrain_chat_model(llm, AgentSupervisorRouter),
+                tools=[], 
+                prompt=AGENT_SUPERVISOR_PROMPT
+            )
+            response = await inference_executor.run(llm, agent.invoke, state)
+        logger.debug(f"Agent returned {len(response.get('messages', []))} response message(s)")
+
+        # Extract routing decision
+        last_message = response.get("messages", [])[-1] if response.get("messages") else None
+
+        if not last_message or not isinstance(last_message, AIMessage):
+            logger.warning("Supervisor did not return a valid AIMessage - routing to END")
+            return END
+        
+        try:
+            raw_content = last_message.content
+            logger.debug(f"Raw LLM response: {raw_content}")
+            if settings.CONSTRAINED_DECODING_ENABLED:
+                # Constrained decoding only produces schema-valid JSON
+                next_node = self.supervisor_output_parser.parse(raw_content).next
+            else:
+                # Unconstrained output: remove markdown code fences if present
                 cleaned_content = raw_content.strip()
                 if cleaned_content.startswith("```json"):
                     cleaned_content = cleaned_content[7:]  # Remove ```json
@@ -93,40 +179,30 @@ class WorkflowSupervisor:
                 if cleaned_content.endswith("```"):
                     cleaned_content = cleaned_content[:-3]  # Remove trailing ```
                 cleaned_content = cleaned_content.strip()
-                
+            
                 # Replace single quotes with double quotes for valid JSON
                 cleaned_content = cleaned_content.replace("'", '"')
-                
-                logger.debug(f"Cleaned content for parsing: {cleaned_content}")
-                
-                next_node = self.supervisor_output_parser.parse(cleaned_content).next
-            except Exception as parse_error:
-                logger.error(f"Failed to parse routing decision: {parse_error}")
-                logger.debug(f"Attempted to parse: {last_message.content}")
-                logger.warning("Defaulting to END due to parsing failure")
-                return Command(goto=END)
-            
-            if not next_node:
-                logger.warning("Supervisor response did not specify a next node - routing to END")
-                return Command(goto=END)
             
-            logger.info(f"Routing Decision: '{next_node}'")
-            
-            # Determine final routing target
-            if next_node.upper() == "FINISH" or next_node == "__end__":
-                goto = END
-                logger.info("Workflow terminated - routing to END")
-            elif next_node in ["general_question_workflow", "frame_processing_workflow", "audio_processing_workflow", "summary_workflow", "rag_workflow", "report_workflow"]:
-                goto = next_node
-                logger.info(f"Routing to workflow: '{goto}'")
-            else:
-                goto = "general_question_workflow"
-                logger.warning(f"Unknown routing target '{next_node}' - defaulting to 'general_question_workflow'")
-            
-            logger.info("="*80)
-            return Command(goto=goto)
+                logger.debug(f"Cleaned content for parsing: {cleaned_content}")
             
-        except Exception as e:
-            logger.error(f"Supervisor node encountered unexpected error: {str(e)}", exc_info=True)
-            logger.warning("Routing to END due to error")
-            return Command(goto=END)
\ No newline at end of file
+                next_node = self.supervisor_output_parser.parse(cleaned_content).next
+        except Exception as parse_error:
+            logger.error(f"Failed to parse routing decision: {parse_error}")
+            logger.debug(f"Attempted to parse: {last_message.content}")
+            logger.warning("Defaulting to END due to parsing failure")
+            return END
+        
+        if not next_node:
+            logger.warning("Supervisor response did not specify a next node - routing to END")
+            return END
+        
+        logger.info(f"LLM Routing Decision: '{next_node}'")
+        
+        # Determine final routing target
+        if next_node.upper() == "FINISH" or next_node == "__end__":
+            logger.info("Workflow terminated - routing to END")
+            return END
+        if next_node in WORKFLOW_NODES:
+            return next_node
+        logger.warning(f"Unknown routing target '{next_node}' - defaulting to 'general_question_workflow'")
+        return "general_question_workflow"
@@ -0,0 +1,146 @@
+"""
+Video Ingestion
+Workflow state and argument resolution shared by the frame and audio workflows, so
+a video request is parsed at most once however many branches consume it
+"""
+import logging
+import re
+from typing import Optional
+from config.service_config import settings
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import MessagesState
+from langgraph.prebuilt import create_react_agent
+from src.prompt_engineering.schemas import ExtractVideoFileSchema, VideoIngestionJob
+from src.prompt_engineering.templates import ARGUMENT_EXTRACTION_PROMPT, argument_parser
+from src.llm.chat_model import constrain_chat_model
+from src.llm.executor import inference_executor
+from src.llm.model_loader import model_manager
+
+logger = logging.getLogger(__name__)
+
+# Audio-only formats; every other allowed upload extension is a video container
+AUDIO_FILE_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac")
+
+def media_path_pattern(audio: bool = False) -> str:
+    """
+    Build the regex of a media file path with an extension the upload endpoint accepts.
+
+    Args:
+        audio: Match audio files instead of video files
+
+    Returns:
+        str: Pattern derived from settings.ALLOWED_FILE_EXTENSIONS (never matches if
+             no allowed extension is of the requested kind)
+    """
+    extensions = [
+        re.escape(extension.lower().lstrip("."))
+        for extension in settings.ALLOWED_FILE_EXTENSIONS
+        if (extension.lower() in AUDIO_FILE_EXTENSIONS) == audio
+    ]
+    if not extensions:
+        return r"(?!)"
+    return rf"[^\s'\"`]+\.(?:{'|'.join(extensions)})\b"
+
+# Video file path in a free-text request (same extensions as the intent router rule)
+VIDEO_PATH_PATTERN = re.compile(media_path_pattern(), re.IGNORECASE)
+
+class VideoWorkflowState(MessagesState):
+    """
+    Messages state carrying the resolved video ingestion job.
+
+    Attributes:
+        ingestion_job: Job resolved from the request; set by the caller for structured
+                       ingestion or by the first workflow that parses a free-text request
+    """
+    ingestion_job: Optional[VideoIngestionJob]
+
+def get_request_text(state: MessagesState) -> str:
+    """
+    Get the text of the original user request.
+
+    Args:
+        state: Workflow state whose first message is the user request
+
+    Returns:
+        str: Text content of the first message
+    """
+    first_message = state["messages"][0]
+
+    # Handle different message formats
+    if isinstance(first_message, dict):
+        # Message is a dict like {"role": "user", "content": "..."}
+        return first_message.get("content", "")
+    if isinstance(first_message, AIMessage):
+        # AIMessage with potentially structured content
+        if isinstance(first_message.content, list) and len(first_message.content) > 0:
+            first_item = first_message.content[0]
+            return first_item.get("text", str(first_item)) if isinstance(first_item, dict) else str(first_item)
+        return str(first_message.content)
+    if hasattr(first_message, "content"):
+        # HumanMessage or other LangChain message type
+        return first_message.content
+    logger.warning(f"Unknown message type, converted to string: '{first_message}'")
+    return str(first_message)
+
+def resolve_ingestion_job(state: VideoWorkflowState, llm=None) -> VideoIngestionJob:
+    """
+    Resolve the ingestion job of a request, calling the LLM only as a last resort.
+
+    Resolution order:
+    1. The job already in the state (structured ingestion, or resolved by another branch)
+    2. A single video file path found in the request text
+    3. The constrained argument-extraction agent
+
+    Runs in a worker thread (the extraction nodes are synchronous).
+
+    Args:
+        state: Current workflow state
+        llm: Chat model of the extraction agent; the model manager's argument-extraction
+             model is loaded only when the agent is needed
+
+    Returns:
+        VideoIngestionJob: The resolved job
+
+    Raises:
+        ValueError: If no video file path can be resolved; the message is user-facing
+    """
+    if state.get("ingestion_job"):
+        logger.info(f"Using ingestion job from state: {state['ingestion_job']}")
+        return state["ingestion_job"]
+
+    user_request = get_request_text(state)
+    logger.info(f"User request: '{user_request}'")
+
+    paths = set(VIDEO_PATH_PATTERN.findall(user_request))
+    if len(paths) == 1:
+        video_file = paths.pop()
+        logger.info(f"Resolved video file path from request text: '{video_file}'")
+        return VideoIngestionJob(video_file=video_file)
+
+    logger.debug("Invoking parameter extraction agent...")
+    with model_manager.lease("chat"):
+        llm = llm or model_manager.get_qwen_chat_model("argument_extraction")
+        extraction_agent = create_react_agent(
+            constrain_chat_model(llm, ExtractVideoFileSchema),
+            tools=[],
+            prompt=ARGUMENT_EXTRACTION_PROMPT
+        )
+        response = inference_executor.call(llm, extraction_agent.invoke, {"messages": [HumanMessage(content=user_request)]})
+    last_msg = response.get("messages", [])[-1] if response.get("messages") else None
+    if not last_msg or not isinstance(last_msg, AIMessage):
+        logger.warning("Extraction agent did not return a valid AIMessage")
+        raise ValueError("Failed to parse extraction parameters from your request.")
+    logger.info(f"Agent Extracted Parameters: {last_msg.content}")
+
+    try:
+        video_file = argument_parser.parse(last_msg.content).video_file
+    except Exception as parse_error:
+        logger.error(f"Failed to parse video file path: {parse_error}", exc_info=True)
+        raise ValueError("Could not extract video file path from your request. Please specify the file path clearly.") from parse_error
+
+    if not video_file:
+        logger.error("Video file path is empty")
+        raise ValueError("No video file path was provided. Please specify a valid file path.")
+
+    logger.info(f"Resolved video file path with the extraction agent: '{video_file}'")
+    return VideoIngestionJob(video_file=video_file)
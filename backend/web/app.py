@@ -4,11 +4,14 @@ Provides endpoints for chat, file upload, and session management with PostgreSQL
 """
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from sse_starlette.sse import EventSourceResponse
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Callable, List, Optional
 from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import json
 import sys
 import uvicorn
 import logging
@@ -26,6 +29,12 @@ from web.database import (
 )
 
 from src.llm.model_loader import model_manager
+from src.vector_database.retrieval_cache import retrieval_cache
+from src.vector_database.answer_cache import answer_cache
+from src.llm.inference import prefix_cache
+from src.llm.batching import inference_server
+from src.llm.executor import inference_executor, event_loop_monitor
+from web.agent.intent_router import intent_router
 from web.agent.agent_workflow_builder import process_uploaded_video
 
 # Add backend folder to py path
@@ -169,6 +178,98 @@ async def chat(request: ChatRequest, db: AsyncSession = Depends(get_database)):
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest, db: AsyncSession = Depends(get_database)):
+    """
+    Send a message to AI and receive the response as server-sent events
+    
+    Events, in order:
+        user_message: The stored user message (MessageModel)
+        route:        Workflow chosen by the supervisor ({"next": ..., "tier": ...})
+        retrieval:    RAG context is ready ({"chunks": n, "cached": bool})
+        token:        Generated answer fragment ({"text": ..., "workflow": ...})
+        done:         The stored AI response (ChatResponse)
+    
+    The AI response is stored only when the workflow completes; a client that
+    disconnects early cancels the request and nothing is stored for it.
+    
+    Args:
+        request: ChatRequest containing message and session_id
+        db: Database session dependency
+        
+    Returns:
+        EventSourceResponse streaming the events above
+        
+    Raises:
+        HTTPException: If message is empty or server error occurs
+    """
+    try:
+        logger.info(f"Received streaming chat request: {request.message[:50]}...")
+        
+        if not request.message.strip():
+            raise HTTPException(status_code=400, detail="Message cannot be empty")
+        
+        await get_or_create_session(db, request.session_id)
+        
+        user_message = await store_message(
+            db, request.session_id, "user", request.message
+        )
+        logger.info(f"Stored user message: {user_message.id}")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Chat stream endpoint error: {str(e)}\n{traceback.format_exc()}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    events = asyncio.Queue()
+    
+    async def run_workflow() -> str:
+        try:
+            return await generate_ai_response(
+                request.message, request.session_id, db,
+                on_event=lambda event, data: events.put_nowait((event, data))
+            )
+        except Exception as ai_error:
+            logger.error(f"AI generation failed: {ai_error}")
+            return "Sorry, I'm having trouble processing your request right now."
+        finally:
+            events.put_nowait(None)
+    
+    async def event_stream():
+        yield {"event": "user_message", "data": message_to_model(user_message).model_dump_json()}
+        
+        workflow_task = asyncio.create_task(run_workflow())
+        try:
+            while (item := await events.get()) is not None:
+                event, data = item
+                yield {"event": event, "data": json.dumps(data)}
+            
+            ai_response_text = await workflow_task
+            ai_message = await store_message(
+                db, request.session_id, "ai", ai_response_text
+            )
+            logger.info(f"Stored AI message: {ai_message.id}")
+            
+            yield {"event": "done", "data": ChatResponse(
+                success=True,
+                user_message=message_to_model(user_message),
+                ai_response=message_to_model(ai_message),
+                session_id=request.session_id
+            ).model_dump_json()}
+            
+        except asyncio.CancelledError:
+            logger.info(f"Client disconnected from chat stream of session '{request.session_id}' - response not stored")
+            workflow_task.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}\n{traceback.format_exc()}")
+            await db.rollback()
+            yield {"event": "error", "data": json.dumps({"detail": f"Internal server error: {str(e)}"})}
+    
+    return EventSourceResponse(event_stream())
+
 @app.get("/api/chat/{session_id}", response_model=ChatHistoryResponse)
 async def get_chat_history(session_id: str, db: AsyncSession = Depends(get_database)):
     """
@@ -521,6 +622,43 @@ async def health_check():
     )
 
 
+@app.get("/api/models/status")
+async def get_models_status():
+    """Lifecycle state and load time of each model"""
+    return model_manager.get_status()
+
+
+@app.get("/api/admin/models")
+async def get_models_residency():
+    """Memory residency of each model: footprint, placement, priority and eviction counts"""
+    return model_manager.get_residency_status()
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for the vector database connections and retrieval stages"""
+    try:
+        metrics = {
+            "timestamp": datetime.now().isoformat(),
+            "retrieval_cache": retrieval_cache.get_metrics(),
+            "answer_cache": answer_cache.get_metrics(),
+            "prefix_cache": prefix_cache.get_metrics(),
+            "inference_server": inference_server.get_metrics(),
+            "inference_executor": inference_executor.get_metrics(),
+            "event_loop": event_loop_monitor.get_metrics(),
+            "intent_router": intent_router.get_metrics(),
+        }
+        if model_manager.qdrant_pool is not None:
+            metrics["qdrant_pool"] = model_manager.qdrant_pool.get_metrics()
+        if model_manager.reranker is not None:
+            metrics["reranker"] = model_manager.reranker.get_metrics()
+        metrics["models"] = model_manager.get_status()
+        return metrics
+    except Exception as e:
+        logger.error(f"Failed to collect metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Helper Functions
 async def process_uploaded_video_with_progress(
     file_path: str, 
@@ -694,7 +832,7 @@ def message_to_model(message: ChatMessage) -> MessageModel:
     )
 
 
-async def generate_ai_response(user_message: str, session_id: str = "default", db: AsyncSession = None) -> str:
+async def generate_ai_response(user_message: str, session_id: str = "default", db: AsyncSession = None, on_event: Optional[Callable[[str, dict], None]] = None) -> str:
     """
     Generate AI response using the agent workflow system.
     
@@ -709,6 +847,7 @@ async def generate_ai_response(user_message: str, session_id: str = "default", d
         user_message: User's input message
         session_id: Session identifier to determine collection name
         db: Database session (not used, but kept for compatibility)
+        on_event: Optional callback receiving routing, retrieval and token events while the workflow runs
         
     Returns:
         AI-generated response text
@@ -716,12 +855,7 @@ async def generate_ai_response(user_message: str, session_id: str = "default", d
     try:
         logger.info(f"Generating AI response for: {user_message[:50]}...")
         
-        # Step 1: Check if models are loaded
-        if not model_manager.is_loaded:
-            logger.info("Models not loaded, loading now...")
-            await model_manager.load_models()
-        
-        # Step 2: Invoke the agent workflow
+        # Invoke the agent workflow; its nodes load the models they use on first use
         logger.info(f"Invoking agent workflow for session '{session_id}'...")
         try:
             from web.agent.agent_workflow_builder import build_agent_workflow
@@ -729,7 +863,8 @@ async def generate_ai_response(user_message: str, session_id: str = "default", d
             # Build and invoke the workflow - this returns the result dictionary
             result = await build_agent_workflow(
                 user_request=user_message,
-                session_id=session_id
+                session_id=session_id,
+                on_event=on_event
             )
             
             logger.info(f"Agent workflow completed successfully")
@@ -759,6 +894,15 @@ async def generate_ai_response(user_message: str, session_id: str = "default", d
         logger.error(f"Error generating AI response: {str(e)}\n{traceback.format_exc()}")
         return f"Sorry, I encountered an error while processing your request: {str(e)}"
 
+def log_model_load_result(task: asyncio.Task):
+    """Log the outcome of the background model load, which no request awaits"""
+    if task.cancelled():
+        return
+    if task.exception():
+        logger.error(f"Background model loading failed; failed models are retried on first use: {task.exception()}")
+    else:
+        logger.info("🤖 AI models loaded and ready")
+
 # Application Lifecycle Events
 @app.on_event("startup")
 async def startup_event():
@@ -769,11 +913,24 @@ async def startup_event():
         
         await create_tables()
 
-        # Load global models
+        # Load global models; with background loading, endpoints that need no model
+        # answer right away and model-backed ones wait for the models they use
         logger.info("Loading AI models...")
         from src.llm.model_loader import model_manager
-        await model_manager.load_models()
-        logger.info("🤖 AI models loaded and ready")
+        await model_manager.aconnect_qdrant()
+        if settings.MODEL_LOAD_IN_BACKGROUND:
+            app.state.model_load_task = asyncio.create_task(model_manager.load_models())
+            app.state.model_load_task.add_done_callback(log_model_load_result)
+            logger.info("🤖 AI models loading in the background (GET /api/models/status)")
+        else:
+            await model_manager.load_models()
+            logger.info("🤖 AI models loaded and ready")
+
+        # Keep the pooled Qdrant connections healthy in the background
+        app.state.qdrant_health_task = asyncio.create_task(model_manager.get_qdrant_pool().run_health_checks())
+        
+        # Sample the event-loop lag so blocking calls on the loop show up in /api/metrics
+        app.state.event_loop_monitor_task = asyncio.create_task(event_loop_monitor.run())
         
         logger.info(f"🚀 {settings.API_TITLE} Starting...")
         logger.info(f"🗄️  PostgreSQL database initialized")
@@ -789,6 +946,9 @@ async def startup_event():
         logger.info(f"   • DELETE /api/chat/{{session_id}} - Clear session")
         logger.info(f"   • GET /api/sessions - List all sessions")
         logger.info(f"   • GET /api/health - Health check")
+        logger.info(f"   • GET /api/metrics - Runtime metrics")
+        logger.info(f"   • GET /api/models/status - Model loading status")
+        logger.info(f"   • GET /api/admin/models - Model memory residency")
         logger.info(f"💾 Data stored in: {settings.DATA_FOLDER}")
     except Exception as e:
         logger.error(f"Failed to initialize: {e}")
@@ -796,10 +956,28 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info(f"🛑 {settings.API_TITLE} Shutting Down...")
     
+    # Stop health checks and close pooled Qdrant connections
+    health_task = getattr(app.state, "qdrant_health_task", None)
+    if health_task:
+        health_task.cancel()
+    monitor_task = getattr(app.state, "event_loop_monitor_task", None)
+    if monitor_task:
+        monitor_task.cancel()
+    model_load_task = getattr(app.state, "model_load_task", None)
+    if model_load_task:
+        model_load_task.cancel()
+    if model_manager.qdrant_pool is not None:
+        await model_manager.qdrant_pool.aclose()
+        logger.info(" Qdrant connections closed")
+    
+    # Stop the batching worker (fails requests still in flight)
+    inference_server.stop()
+    
     # Close all database connections properly
     from web.database import engine
     await engine.dispose()
@@ -2,6 +2,7 @@
 Audio Extraction and Transcription Utilities
 Extracts audio from video files and transcribes using Whisper model with text transcript chunking
 """
+import asyncio
 import logging
 import os
 import librosa
@@ -12,6 +13,8 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from moviepy import VideoFileClip
 from config.service_config import settings
 from src.llm.inference import generate_qwen_response
+from src.llm.model_lifecycle import ModelRegistry, weight_loading_kwargs
+from src.llm.model_residency import ModelResidencyManager
 from src.prompt_engineering.templates import TRANSCRIPT_TEXT_SUMMARIZER_PROMPT, transcript_summary_parser
 from mcp.server.fastmcp import FastMCP
 
@@ -101,8 +104,7 @@ def load_transcription_pipeline(model_name: str):
             transcribe_model = AutoModelForSpeechSeq2Seq.from_pretrained(
                 model_name,
                 torch_dtype=torch_dtype,
-                low_cpu_mem_usage=True,
-                use_safetensors=True
+                **weight_loading_kwargs()
             )
             logger.info("Transcription model loaded successfully")
         except Exception as e:
@@ -112,7 +114,7 @@ def load_transcription_pipeline(model_name: str):
         # Load processor
         logger.info("Loading audio processor...")
         try:
-            processor = AutoProcessor.from_pretrained(model_name)
+            processor = AutoProcessor.from_pretrained(model_name, cache_dir=settings.HF_CACHE_DIR)
             logger.info("Audio processor loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load audio processor: {e}")
@@ -141,6 +143,20 @@ def load_transcription_pipeline(model_name: str):
         logger.error(f"Failed to initialize transcription pipeline '{model_name}': {e}")
         raise
 
+# Whisper runs in this MCP server process, outside the API process's model memory budget
+# and /api/admin/models; it is loaded on first use and unloaded once idle for
+# MODEL_EVICTION_MIN_IDLE_S, so it is only held while transcriptions keep coming
+whisper_models = ModelRegistry(residency=ModelResidencyManager(offload_to_cpu=False, min_idle_s=settings.MODEL_EVICTION_MIN_IDLE_S))
+whisper_models.register("whisper", lambda: load_transcription_pipeline(settings.AUDIO_MODEL_NAME), lazy=True)
+# Pending idle checks (the event loop only keeps weak references to tasks)
+_idle_unload_tasks: set[asyncio.Task] = set()
+
+async def unload_idle_whisper():
+    """Unload Whisper if no transcription used it for MODEL_EVICTION_MIN_IDLE_S"""
+    await asyncio.sleep(settings.MODEL_EVICTION_MIN_IDLE_S)
+    if await asyncio.to_thread(whisper_models.evict_idle):
+        logger.info("Unloaded idle Whisper model")
+
 @mcp.tool()
 async def transcribe_audio_whisper(audio_path: str, output_folder: str, chunk_length_s: int = 5, batch_size: int = 32) -> str:
     """
@@ -166,13 +182,20 @@ async def transcribe_audio_whisper(audio_path: str, output_folder: str, chunk_le
         transcription_path = os.path.join(output_folder, f"{audio_name}_transcript.yaml")
 
         logger.info("Starting transcription process...")
-        transcribe_pipeline = load_transcription_pipeline("distil-whisper/distil-small.en")
-        transcriptions = transcribe_pipeline(
-            audio,
-            chunk_length_s=chunk_length_s,
-            batch_size=batch_size,
-            return_timestamps=True
-        )
+        try:
+            with whisper_models.lease("whisper"):
+                transcribe_pipeline = await asyncio.to_thread(whisper_models.get, "whisper")
+                transcriptions = transcribe_pipeline(
+                    audio,
+                    chunk_length_s=chunk_length_s,
+                    batch_size=batch_size,
+                    return_timestamps=True
+                )
+        finally:
+            # Checked once the model has been idle long enough; a newer call keeps it loaded
+            idle_unload_task = asyncio.create_task(unload_idle_whisper())
+            _idle_unload_tasks.add(idle_unload_task)
+            idle_unload_task.add_done_callback(_idle_unload_tasks.discard)
 
         logger.debug(f"Raw transcription result: {transcriptions}")
 
@@ -405,6 +428,8 @@ def summarize_transcript_chunks(chunks: list, processor, model) -> list:
             - 'summary': AI-generated summary of the segment
             - 'topics': List of extracted topic keywords
             - 'type': Always "txt" to indicate text-based content
+            - 'start': Start time in seconds
+            - 'end': End time in seconds
     """
     summary_chunks = []
 
@@ -448,7 +473,9 @@ def summarize_transcript_chunks(chunks: list, processor, model) -> list:
                 "text": text,
                 "summary": summary,
                 "topics": topics,
-                "type": "txt"
+                "type": "txt",
+                "start": start_s,
+                "end": end_s
             })
             
         except Exception as e:
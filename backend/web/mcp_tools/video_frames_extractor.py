@@ -208,6 +208,8 @@ def summarize_frames(processor, model, folder: str, max_edge: int = 768) -> List
             - summary: Overall summary of the time segment
             - topics: List of topics extracted from the segment
             - type: Always "img" to indicate image-based content
+            - start: Start time of the group in seconds
+            - end: End time of the group in seconds
     """
     start_s, end_s = extract_time_from_group_path(folder)
     paths = list_images(folder)
@@ -267,7 +269,9 @@ def summarize_frames(processor, model, folder: str, max_edge: int = 768) -> List
         "text": text,
         "summary": summary,
         "topics": topics,
-        "type": "img"
+        "type": "img",
+        "start": start_s,
+        "end": end_s
     })
 
     return summary_chunk